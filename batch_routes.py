@@ -0,0 +1,116 @@
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from csr_graph import as_csr
+from task2 import bfs_parents, create_city_transport_graph
+from task3 import create_weighted_city_graph, dijkstra_arrays
+
+# Граф, переданий у процес-обробник один раз при старті
+_worker_graph = None
+
+
+def _init_worker(csr, weighted):
+    global _worker_graph
+    _worker_graph = (csr, weighted)
+
+
+def _solve_group(csr, weighted, source, requests):
+    """
+    Один пошук від source для всіх його запитів
+
+    Returns:
+        Список (позиція, шлях у номерах вершин або None, довжина)
+    """
+    target_ids = [target for _, target in requests]
+
+    if weighted:
+        distances, previous = dijkstra_arrays(csr, source, target_ids)
+    else:
+        previous = bfs_parents(csr, source, target_ids)
+        previous[source] = -1
+
+    answers = []
+    for position, target in requests:
+        if target != source and previous[target] < 0:
+            answers.append((position, None, float('infinity')))
+            continue
+
+        path = [target]
+        while previous[path[-1]] >= 0:
+            path.append(previous[path[-1]])
+        path.reverse()
+
+        cost = distances[target] if weighted else len(path) - 1
+        answers.append((position, path, cost))
+
+    return answers
+
+
+def _worker_group(group):
+    csr, weighted = _worker_graph
+    return _solve_group(csr, weighted, *group)
+
+
+def batch_routes(graph, pairs, weight=None, workers=1):
+    """
+    Відповідає на багато запитів "звідки-куди" одним пошуком на кожне джерело
+
+    Пари групуються за початковою вершиною, і для кожної групи
+    виконується один пошук (BFS для пересадок, Дейкстра для хвилин),
+    що зупиняється, щойно досягнуто всі цілі групи.
+
+    Args:
+        graph: NetworkX граф або CSRGraph
+        pairs: список пар (start, goal)
+        weight: назва атрибута ваги; None - рахувати пересадки
+        workers: кількість процесів для груп (1 - послідовно)
+
+    Returns:
+        Список (path, cost) у порядку вхідних пар;
+        для недосяжних цілей - (None, infinity)
+    """
+    csr = as_csr(graph, weight=weight or 'weight')
+    weighted = weight is not None
+
+    groups = defaultdict(list)
+    for position, (start, goal) in enumerate(pairs):
+        groups[csr.node_id(start)].append((position, csr.node_id(goal)))
+    groups = list(groups.items())
+
+    if workers == 1 or len(groups) < 2:
+        answers = (_solve_group(csr, weighted, source, requests) for source, requests in groups)
+        return _collect(csr, answers, len(pairs))
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(csr, weighted)) as pool:
+        chunk_size = max(1, len(groups) // (workers * 4))
+        answers = pool.map(_worker_group, groups, chunksize=chunk_size)
+        return _collect(csr, answers, len(pairs))
+
+
+def _collect(csr, answers, count):
+    """Розкладає відповіді груп назад у порядок вхідних пар"""
+    results = [None] * count
+    for group_answers in answers:
+        for position, path, cost in group_answers:
+            if path is not None:
+                path = [csr.node_name(node_id) for node_id in path]
+            results[position] = (path, cost)
+    return results
+
+
+if __name__ == "__main__":
+    pairs = [
+        ("Центр", "Аеропорт"), ("Центр", "Школа"), ("Парк", "Промзона"),
+        ("Центр", "Стадіон"), ("Парк", "Вокзал")
+    ]
+
+    print("\n📦 ПАКЕТНІ ЗАПИТИ (пересадки):")
+    G = create_city_transport_graph()
+    for (start, goal), (path, hops) in zip(pairs, batch_routes(G, pairs)):
+        print(f"  {start} → {goal}: {' → '.join(path)} ({hops} пересадок)")
+
+    print("\n📦 ПАКЕТНІ ЗАПИТИ (хвилини):")
+    W, weighted_routes = create_weighted_city_graph()
+    for (start, goal), (path, minutes) in zip(pairs, batch_routes(W, pairs, weight='weight')):
+        print(f"  {start} → {goal}: {' → '.join(path)} ({minutes} хв)")
@@ -0,0 +1,386 @@
+import argparse
+import csv
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from itertools import islice
+
+import networkx as nx
+import numpy as np
+
+import distance_matrix as distance_matrix_module
+from centrality import brandes_centrality
+from generators import GENERATORS, generate_city, to_networkx
+from task2 import bfs_path, dfs_path_single, dfs_paths
+from task3 import dijkstra_manual
+
+# Поля одного виміру - і для JSON, і для CSV
+FIELDS = ["kind", "nodes", "edges", "algorithm", "implementation",
+          "best_seconds", "median_seconds", "peak_bytes", "repeat"]
+
+# Модулі ядра, які імпортують бібліотеки та сервіси, і бюджет їх холодного імпорту
+CORE_MODULES = ("csr_graph", "task1", "task2", "task3")
+IMPORT_BUDGET_MS = 100
+
+# Важкі залежності, які ядро не повинно тягнути під час імпорту
+HEAVY_MODULES = ("matplotlib", "networkx", "numpy")
+
+_IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+for name in sys.argv[1:]:
+    __import__(name)
+elapsed = time.perf_counter() - started
+heavy = [name for name in {heavy!r} if name in sys.modules]
+sys.stderr.write(json.dumps([elapsed, heavy]))
+"""
+
+
+def _node_at_depth(csr, start_id, depth):
+    """Вершина на відстані depth пересадок від start_id (або найдальша досяжна)"""
+    seen = {start_id}
+    frontier = [start_id]
+    for _ in range(depth):
+        following = []
+        for node in frontier:
+            for neighbor in csr.neighbors(node):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    following.append(neighbor)
+        if not following:
+            break
+        frontier = following
+    return frontier[0]
+
+
+def _networkx_dfs_path(graph, start, goal):
+    """Шлях у дереві DFS networkx - той самий обхід з множиною відвіданих, що й dfs_path_single"""
+    predecessors = nx.dfs_predecessors(graph, start)
+    if goal != start and goal not in predecessors:
+        return None
+    path = [goal]
+    while path[-1] != start:
+        path.append(predecessors[path[-1]])
+    return path[::-1]
+
+
+def _distance_metrics(graph):
+    """Метрики відстаней з analyze_graph: діаметр, радіус, середній шлях, близькість"""
+    # Кеш матриць зробив би повторні заміри безкоштовними
+    distance_matrix_module._CACHE.clear()
+    distances = distance_matrix_module.distance_matrix(graph)
+    return (distances.diameter(), distances.radius(),
+            distances.average_path_length(), distances.closeness())
+
+
+def _networkx_distance_metrics(graph):
+    return (nx.diameter(graph), nx.radius(graph),
+            nx.average_shortest_path_length(graph), nx.closeness_centrality(graph))
+
+
+# Алгоритм: (власна реалізація, еквівалент networkx, найбільший розмір за замовчуванням).
+# Обидві функції отримують словник із графом (csr, G), start, goal та параметрами.
+# dfs_path_single копіює шлях при кожному додаванні в стек (O(V · довжина шляху)),
+# а метрики відстаней тримають матрицю V × V, тому їхні розміри обмежено.
+# Перебір усіх простих шляхів експоненційний, тож dfs_paths шукає шляхи до
+# близької вершини (path_depth пересадок) довжиною не більше path_depth + 2.
+CASES = {
+    "bfs_path": (
+        lambda ctx: bfs_path(ctx["csr"], ctx["start"], ctx["goal"]),
+        lambda ctx: nx.shortest_path(ctx["G"], ctx["start"], ctx["goal"]),
+        None),
+    "dfs_path_single": (
+        lambda ctx: dfs_path_single(ctx["csr"], ctx["start"], ctx["goal"]),
+        lambda ctx: _networkx_dfs_path(ctx["G"], ctx["start"], ctx["goal"]),
+        20_000),
+    "dfs_paths": (
+        lambda ctx: sum(1 for _ in islice(dfs_paths(ctx["csr"], ctx["start"], ctx["near_goal"],
+                                                    cutoff=ctx["cutoff"]), ctx["path_limit"])),
+        lambda ctx: sum(1 for _ in islice(nx.all_simple_paths(ctx["G"], ctx["start"], ctx["near_goal"],
+                                                              cutoff=ctx["cutoff"]), ctx["path_limit"])),
+        None),
+    "dijkstra_manual": (
+        lambda ctx: dijkstra_manual(ctx["csr"], ctx["start"]),
+        lambda ctx: nx.single_source_dijkstra(ctx["G"], ctx["start"]),
+        None),
+    "distance_metrics": (
+        lambda ctx: _distance_metrics(ctx["G"]),
+        lambda ctx: _networkx_distance_metrics(ctx["G"]),
+        2_000),
+    "betweenness": (
+        lambda ctx: brandes_centrality(ctx["csr"], workers=1),
+        lambda ctx: nx.betweenness_centrality(ctx["G"]),
+        2_000),
+}
+
+
+def _measure(function, repeat):
+    """
+    Час виконання та пікова пам'ять однієї функції
+
+    Заміри часу йдуть без tracemalloc (він уповільнює виділення пам'яті
+    в рази), пікова пам'ять - в окремому запуску.
+
+    Returns:
+        (найкращий час, медіанний час, пікова пам'ять у байтах)
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return min(timings), statistics.median(timings), peak
+
+
+def run_benchmarks(kinds=tuple(GENERATORS), sizes=(100, 1_000, 10_000), algorithms=None,
+                   repeat=3, seed=42, networkx_max_nodes=100_000, path_limit=1_000,
+                   path_depth=4, max_nodes=None, progress=print):
+    """
+    Заміряє алгоритми та їхні аналоги з networkx на синтетичних містах
+
+    Args:
+        kinds: типи міст (див. generators.GENERATORS)
+        sizes: кількості вершин
+        algorithms: назви з CASES (за замовчуванням - усі)
+        repeat: кількість запусків для заміру часу
+        seed: зерно генераторів
+        networkx_max_nodes: найбільший граф, для якого будується nx.Graph
+            і заміряються алгоритми networkx
+        path_limit: скільки шляхів перебирати в dfs_paths
+        path_depth: відстань у пересадках до цілі dfs_paths
+        max_nodes: словник {алгоритм: найбільший розмір}, що замінює
+            обмеження з CASES
+        progress: функція для повідомлень про хід (None - мовчки)
+
+    Returns:
+        Список словників з полями FIELDS
+    """
+    algorithms = list(algorithms or CASES)
+    limits = {name: CASES[name][2] for name in algorithms}
+    limits.update(max_nodes or {})
+    results = []
+
+    for kind in kinds:
+        for size in sizes:
+            started = time.perf_counter()
+            csr, _ = generate_city(kind, size, seed=seed)
+            generated = time.perf_counter() - started
+
+            nodes, edges = len(csr), csr.number_of_edges() // 2
+            record = {"kind": kind, "nodes": nodes, "edges": edges}
+            results.append(dict(record, algorithm="generate", implementation="own",
+                                best_seconds=generated, median_seconds=generated,
+                                peak_bytes=None, repeat=1))
+
+            ctx = {"csr": csr, "start": csr.node_name(0), "goal": csr.node_name(nodes - 1),
+                   "near_goal": csr.node_name(_node_at_depth(csr, 0, path_depth)),
+                   "cutoff": path_depth + 2, "path_limit": path_limit}
+            if nodes <= networkx_max_nodes:
+                ctx["G"] = to_networkx(csr)
+
+            for name in algorithms:
+                own, reference, _ = CASES[name]
+                limit = limits[name]
+                if limit is not None and nodes > limit:
+                    continue
+
+                # distance_metrics працює з nx.Graph, тож без нього пропускаємо
+                if name == "distance_metrics" and "G" not in ctx:
+                    continue
+
+                implementations = [("own", own)]
+                if "G" in ctx:
+                    implementations.append(("networkx", reference))
+
+                for implementation, function in implementations:
+                    best, median, peak = _measure(lambda: function(ctx), repeat)
+                    results.append(dict(record, algorithm=name, implementation=implementation,
+                                        best_seconds=best, median_seconds=median,
+                                        peak_bytes=peak, repeat=repeat))
+                    if progress:
+                        progress(f"  {kind:>9} n={nodes:>7} {name:<16} {implementation:<8} "
+                                 f"{best * 1000:10.2f} мс  {peak / 2**20:8.2f} МБ")
+
+    return results
+
+
+def measure_import_time(modules=CORE_MODULES, repeat=5):
+    """
+    Холодний імпорт модулів у свіжому інтерпретаторі
+
+    Кожен запуск - окремий процес, тож кеш імпортів не допомагає; береться
+    найкращий час із repeat. Заразом перевіряється, що імпорт нічого не
+    друкує і не завантажує HEAVY_MODULES.
+
+    Args:
+        modules: назви модулів
+        repeat: кількість запусків
+
+    Returns:
+        (найкращий час у мс, завантажені важкі модулі, вивід під час імпорту)
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    probe = _IMPORT_PROBE.format(heavy=HEAVY_MODULES)
+    best, heavy, output = None, [], ""
+
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, "-c", probe, *modules], cwd=directory,
+                                   capture_output=True, text=True, check=True)
+        elapsed, heavy = json.loads(completed.stderr.strip().splitlines()[-1])
+        output = completed.stdout
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best * 1000, heavy, output
+
+
+def check_import_budget(budget_ms=IMPORT_BUDGET_MS, modules=CORE_MODULES, repeat=5):
+    """
+    Перевіряє бюджет холодного імпорту ядра
+
+    Returns:
+        Список порушень (порожній - бюджет дотримано)
+    """
+    elapsed, heavy, output = measure_import_time(modules, repeat)
+    print(f"\n📦 Імпорт {', '.join(modules)}: {elapsed:.1f} мс (бюджет {budget_ms} мс)")
+
+    problems = []
+    if elapsed > budget_ms:
+        problems.append(f"імпорт триває {elapsed:.1f} мс, бюджет - {budget_ms} мс")
+    if heavy:
+        problems.append(f"імпорт завантажує {', '.join(heavy)}")
+    if output:
+        problems.append(f"імпорт друкує: {output.strip()[:80]!r}")
+    return problems
+
+
+def _environment():
+    """Опис середовища для порівняння результатів між машинами"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)),
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {"timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": commit, "python": platform.python_version(),
+            "platform": platform.platform(), "networkx": nx.__version__,
+            "numpy": np.__version__}
+
+
+def write_results(results, path):
+    """
+    Записує результати у файл: .csv - таблиця, інакше JSON з описом середовища
+
+    Args:
+        results: список словників з run_benchmarks
+        path: шлях до файлу
+    """
+    if path.endswith(".csv"):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+        return
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"environment": _environment(), "results": results}, f,
+                  ensure_ascii=False, indent=2)
+
+
+def load_results(path):
+    """Читає результати, записані write_results (JSON або CSV)"""
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        for row in rows:
+            row["nodes"], row["edges"] = int(row["nodes"]), int(row["edges"])
+            row["best_seconds"] = float(row["best_seconds"])
+        return rows
+
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare_results(baseline, current, tolerance=0.25):
+    """
+    Знаходить регресії: заміри, що стали повільнішими більш ніж на tolerance
+
+    Args:
+        baseline: попередні результати
+        current: нові результати
+        tolerance: допустиме відносне сповільнення (0.25 - на 25%)
+
+    Returns:
+        Список (kind, nodes, algorithm, implementation, старий час, новий час)
+    """
+    def key(row):
+        return row["kind"], row["nodes"], row["algorithm"], row["implementation"]
+
+    previous = {key(row): row["best_seconds"] for row in baseline}
+    regressions = []
+    for row in current:
+        old = previous.get(key(row))
+        if old and row["best_seconds"] > old * (1 + tolerance):
+            regressions.append((*key(row), old, row["best_seconds"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Масштабування алгоритмів на синтетичних містах")
+    parser.add_argument("--kinds", nargs="+", default=list(GENERATORS), choices=list(GENERATORS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100, 1_000, 10_000])
+    parser.add_argument("--algorithms", nargs="+", choices=list(CASES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--networkx-max-nodes", type=int, default=100_000)
+    parser.add_argument("--output", default="benchmark_results.json",
+                        help="файл результатів (.json або .csv)")
+    parser.add_argument("--baseline", help="попередні результати для пошуку регресій")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--import-budget", type=float, nargs="?", const=IMPORT_BUDGET_MS,
+                        help="лише перевірити бюджет холодного імпорту ядра (мс)")
+    args = parser.parse_args(argv)
+
+    if args.import_budget is not None:
+        problems = check_import_budget(args.import_budget)
+        if not problems:
+            print("✅ Імпорт ядра вкладається в бюджет")
+        for problem in problems:
+            print(f"⚠️ {problem}")
+        return 1 if problems else 0
+
+    print("\n⏱️ ЗАМІРИ АЛГОРИТМІВ:")
+    results = run_benchmarks(args.kinds, args.sizes, args.algorithms, repeat=args.repeat,
+                             seed=args.seed, networkx_max_nodes=args.networkx_max_nodes)
+    write_results(results, args.output)
+    print(f"\n💾 Результати збережено: {args.output}")
+
+    if args.baseline:
+        regressions = compare_results(load_results(args.baseline), results, args.tolerance)
+        if not regressions:
+            print("✅ Регресій немає")
+        for kind, nodes, algorithm, implementation, old, new in regressions:
+            print(f"⚠️ {algorithm} ({implementation}) на {kind} n={nodes}: "
+                  f"{old * 1000:.2f} → {new * 1000:.2f} мс")
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
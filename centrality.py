@@ -0,0 +1,287 @@
+import heapq
+import math
+import os
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+import numpy as np
+
+from csr_graph import as_csr
+
+# Менші графи рахуються в поточному процесі - пул коштує дорожче
+_PARALLEL_MIN_NODES = 500
+
+# Граф, переданий у процес-обробник один раз при старті
+_worker_graph = None
+
+
+def _init_worker(csr, weighted, squares):
+    global _worker_graph
+    _worker_graph = (csr, weighted, squares)
+
+
+def _single_source(csr, source, weighted):
+    """
+    Один крок алгоритму Брандеса: найкоротші шляхи від source
+
+    Returns:
+        order: вершини в порядку неспадання відстані
+        predecessors: попередники на найкоротших шляхах
+        sigma: кількість найкоротших шляхів до кожної вершини
+        distances: відстані від source (-1 - недосяжна)
+    """
+    n = len(csr)
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    predecessors = [[] for _ in range(n)]
+    sigma = [0] * n
+    sigma[source] = 1
+    distances = [-1] * n
+    distances[source] = 0
+    order = []
+
+    if not weighted:
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            order.append(current)
+            next_distance = distances[current] + 1
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if distances[neighbor] < 0:
+                    distances[neighbor] = next_distance
+                    queue.append(neighbor)
+                if distances[neighbor] == next_distance:
+                    sigma[neighbor] += sigma[current]
+                    predecessors[neighbor].append(current)
+    else:
+        settled = bytearray(n)
+        heap = [(0, source)]
+        while heap:
+            distance, current = heapq.heappop(heap)
+            if settled[current]:
+                continue
+            settled[current] = 1
+            order.append(current)
+            for edge in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[edge]
+                new_distance = distance + weights[edge]
+                if distances[neighbor] < 0 or new_distance < distances[neighbor]:
+                    distances[neighbor] = new_distance
+                    sigma[neighbor] = sigma[current]
+                    predecessors[neighbor] = [current]
+                    heapq.heappush(heap, (new_distance, neighbor))
+                elif new_distance == distances[neighbor] and not settled[neighbor]:
+                    sigma[neighbor] += sigma[current]
+                    predecessors[neighbor].append(current)
+
+    return order, predecessors, sigma, distances
+
+
+def _accumulate_chunk(csr, weighted, sources, squares=False):
+    """
+    Часткові внески для групи джерел
+
+    Returns:
+        (delta, closeness, delta_squares): масив залежностей Брандеса,
+        просумований по джерелах групи, пари (джерело, сума відстаней,
+        досяжних) та сума квадратів залежностей (якщо squares=True)
+    """
+    n = len(csr)
+    betweenness = [0.0] * n
+    delta_squares = [0.0] * n if squares else None
+    closeness = []
+
+    for source in sources:
+        order, predecessors, sigma, distances = _single_source(csr, source, weighted)
+
+        delta = [0.0] * n
+        for node in reversed(order):
+            coefficient = (1 + delta[node]) / sigma[node]
+            for predecessor in predecessors[node]:
+                delta[predecessor] += sigma[predecessor] * coefficient
+            if node != source:
+                betweenness[node] += delta[node]
+                if squares:
+                    delta_squares[node] += delta[node] * delta[node]
+
+        closeness.append((source, sum(distances[node] for node in order), len(order) - 1))
+
+    return np.array(betweenness), closeness, (np.array(delta_squares) if squares else None)
+
+
+def _worker_chunk(sources):
+    csr, weighted, squares = _worker_graph
+    return _accumulate_chunk(csr, weighted, sources, squares)
+
+
+def _source_pool(csr, weighted, workers, squares=False):
+    """
+    Пул процесів, у які граф передається один раз при старті
+
+    Повертає контекстний менеджер: ProcessPoolExecutor або, для малих
+    графів і workers=1, порожній контекст з None - тоді джерела
+    рахуються в поточному процесі. Один пул обслуговує всі виклики
+    _run_sources (наприклад, усі партії адаптивної вибірки).
+    """
+    if workers == 1 or len(csr) < _PARALLEL_MIN_NODES:
+        return nullcontext(None)
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(csr, weighted, squares))
+
+
+def _run_sources(csr, weighted, sources, pool, workers, squares=False):
+    """Розбиває джерела на групи для пулу pool (None - без пулу) й сумує часткові результати"""
+    if pool is None:
+        return _accumulate_chunk(csr, weighted, sources, squares)
+
+    chunk_size = max(1, math.ceil(len(sources) / (workers * 4)))
+    chunks = [sources[i:i + chunk_size] for i in range(0, len(sources), chunk_size)]
+
+    betweenness = np.zeros(len(csr))
+    delta_squares = np.zeros(len(csr)) if squares else None
+    closeness = []
+    for partial, partial_closeness, partial_squares in pool.map(_worker_chunk, chunks):
+        betweenness += partial
+        closeness.extend(partial_closeness)
+        if squares:
+            delta_squares += partial_squares
+
+    return betweenness, closeness, delta_squares
+
+
+def _rescale(betweenness, n, normalized, directed, k=None):
+    """Нормування як у nx.betweenness_centrality (без кінцевих вершин)"""
+    if normalized:
+        scale = 1 / ((n - 1) * (n - 2)) if n > 2 else None
+    else:
+        scale = None if directed else 0.5
+    if scale is not None:
+        if k is not None:
+            scale = scale * n / k
+        betweenness *= scale
+    return betweenness
+
+
+def brandes_centrality(graph, weight=None, workers=None, normalized=True):
+    """
+    Центральність посередництва та близькості алгоритмом Брандеса
+
+    Джерела діляться на групи, кожна група рахується в окремому процесі
+    пулу, а часткові вектори залежностей сумуються. Для nx.DiGraph
+    близькість рахується за вихідними відстанями.
+
+    Args:
+        graph: NetworkX граф або CSRGraph
+        weight: назва атрибута ваги; None - рахувати переходи
+        workers: кількість процесів (None - всі ядра, 1 - послідовно)
+        normalized: нормувати посередництво, як networkx
+
+    Returns:
+        (betweenness, closeness): словники центральностей за вершинами
+    """
+    csr = as_csr(graph, weight=weight or 'weight')
+    directed = hasattr(graph, 'is_directed') and graph.is_directed()
+    n = len(csr)
+    workers = workers or os.cpu_count() or 1
+
+    with _source_pool(csr, weight is not None, workers) as pool:
+        betweenness, closeness_parts, _ = _run_sources(csr, weight is not None, list(range(n)),
+                                                       pool, workers)
+    betweenness = _rescale(betweenness, n, normalized, directed)
+
+    # Близькість з поправкою Вассермана-Фауста, як у nx.closeness_centrality
+    closeness = [0.0] * n
+    for source, total, reachable in closeness_parts:
+        if total > 0 and n > 1:
+            closeness[source] = (reachable / total) * (reachable / (n - 1))
+
+    # Порядок вершин як у вихідному графі
+    order = list(graph.nodes()) if hasattr(graph, 'adj') else csr.nodes
+    betweenness = betweenness.tolist()
+    return ({node: betweenness[csr.node_id(node)] for node in order},
+            {node: closeness[csr.node_id(node)] for node in order})
+
+
+def approximate_betweenness(graph, epsilon=0.05, confidence=0.95, weight=None,
+                            adaptive=False, batch_size=None, seed=None, workers=None):
+    """
+    Наближена нормована центральність посередництва за вибіркою джерел
+
+    Замість усіх V джерел алгоритм Брандеса запускається лише з
+    випадкових джерел, а суму масштабовано на V / k. Кількість джерел
+    обирається так, щоб з імовірністю confidence похибка кожної
+    вершини не перевищувала epsilon:
+    - рівномірно: k за нерівністю Гьофдінга, одразу вся вибірка;
+    - адаптивно: джерела додаються партіями, поки емпірична межа
+      Бернштейна (за дисперсією внесків) не стане меншою за epsilon.
+    Якщо потрібно не менше V джерел, результат точний.
+
+    Args:
+        graph: NetworkX граф або CSRGraph
+        epsilon: допустима абсолютна похибка нормованої центральності
+        confidence: імовірність, з якою гарантується похибка
+        weight: назва атрибута ваги; None - рахувати переходи
+        adaptive: зупинятися за емпіричною межею замість фіксованого k
+        batch_size: розмір партії джерел в адаптивному режимі
+        seed: зерно генератора випадкових чисел
+        workers: кількість процесів (один пул на весь запуск)
+
+    Returns:
+        (betweenness, samples): словник оцінок та кількість використаних джерел
+    """
+    csr = as_csr(graph, weight=weight or 'weight')
+    directed = hasattr(graph, 'is_directed') and graph.is_directed()
+    weighted = weight is not None
+    n = len(csr)
+    order = list(graph.nodes()) if hasattr(graph, 'adj') else csr.nodes
+    workers = workers or os.cpu_count() or 1
+
+    if n <= 2:
+        return {node: 0.0 for node in order}, n
+
+    # Внесок одного джерела в нормовану оцінку лежить у [0, V / (V - 1)]
+    value_range = n / (n - 1)
+    scale = n / ((n - 1) * (n - 2))
+    failure = 1 - confidence
+
+    limit = math.ceil(value_range ** 2 * math.log(2 * n / failure) / (2 * epsilon ** 2))
+    limit = min(n, limit)
+
+    shuffled = list(range(n))
+    random.Random(seed).shuffle(shuffled)
+
+    if not adaptive:
+        samples = limit
+        with _source_pool(csr, weighted, workers) as pool:
+            totals, _, _ = _run_sources(csr, weighted, shuffled[:samples], pool, workers)
+    else:
+        batch_size = batch_size or max(32, n // 100)
+        # Межа перевіряється після кожної партії - ділимо ймовірність помилки між ними
+        log_term = math.log(2 * n * math.ceil(limit / batch_size) / failure)
+
+        totals = np.zeros(n)
+        delta_squares = np.zeros(n)
+        samples = 0
+        # Процеси та копія графа в них створюються один раз на всі партії
+        with _source_pool(csr, weighted, workers, squares=True) as pool:
+            while samples < limit:
+                batch = shuffled[samples:min(limit, samples + batch_size)]
+                partial, _, partial_squares = _run_sources(csr, weighted, batch, pool, workers,
+                                                           squares=True)
+                totals += partial
+                delta_squares += partial_squares
+                samples += len(batch)
+
+                if samples > 1:
+                    mean = totals * scale / samples
+                    variance = np.maximum(delta_squares * scale ** 2 / samples - mean ** 2, 0)
+                    variance *= samples / (samples - 1)
+                    bound = (np.sqrt(2 * variance * log_term / samples)
+                             + 7 * value_range * log_term / (3 * (samples - 1)))
+                    if bound.max() <= epsilon:
+                        break
+
+    betweenness = _rescale(totals, n, True, directed, k=samples if samples < n else None)
+    betweenness = betweenness.tolist()
+    return {node: betweenness[csr.node_id(node)] for node in order}, samples
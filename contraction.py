@@ -0,0 +1,292 @@
+import heapq
+from array import array
+
+import networkx as nx
+
+from csr_graph import as_csr
+from search_stats import instrumented
+from task3 import create_weighted_city_graph
+
+
+class ContractionHierarchy:
+    """
+    Ієрархія стягувань (Contraction Hierarchies) для швидких точкових запитів
+
+    Вершини по черзі "стягуються" від найменш до найбільш важливих.
+    Коли вершину v прибирають, між її сусідами додаються ребра-скорочення
+    (shortcuts) там, де найкоротший шлях ішов через v. Для кожного
+    скорочення пам'ятаємо середню вершину, щоб потім розгорнути його
+    назад у шлях по реальних районах.
+
+    Запит - двонаправлений Дейкстра, що йде лише вгору за рангом
+    вершин, тому обробляє лише кілька десятків вершин навіть на
+    великих мережах.
+    """
+
+    def __init__(self, nodes, rank, offsets, targets, weights, middle):
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.rank = rank
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.middle = middle
+
+    @classmethod
+    def build(cls, graph, witness_limit=500):
+        """
+        Будує ієрархію для неорієнтованого зваженого графа
+
+        Args:
+            graph: NetworkX граф з вагами або CSRGraph
+            witness_limit: скільки вершин може обробити пошук свідка;
+                якщо ліміт вичерпано, скорочення додається про всяк випадок
+
+        Returns:
+            ContractionHierarchy
+        """
+        csr = as_csr(graph)
+        n = len(csr)
+        infinity = float('infinity')
+
+        # Поточний (ще не стягнутий) граф як список словників сусідів
+        adjacency = [{} for _ in range(n)]
+        for u in range(n):
+            for v, weight in csr.edges(u):
+                if v != u and weight < adjacency[u].get(v, infinity):
+                    adjacency[u][v] = weight
+
+        middle = {}
+        rank = array('i', [0]) * n
+        upward = [None] * n
+        contracted_neighbors = [0] * n
+
+        def witness_search(source, excluded, limit):
+            """Дейкстра від source в поточному графі в обхід excluded"""
+            distances = {source: 0}
+            heap = [(0, source)]
+            settled = 0
+            while heap and settled < witness_limit:
+                distance, current = heapq.heappop(heap)
+                if distance > distances[current]:
+                    continue
+                if distance > limit:
+                    break
+                settled += 1
+                for neighbor, weight in adjacency[current].items():
+                    if neighbor == excluded:
+                        continue
+                    new_distance = distance + weight
+                    if new_distance < distances.get(neighbor, infinity):
+                        distances[neighbor] = new_distance
+                        heapq.heappush(heap, (new_distance, neighbor))
+            return distances
+
+        def find_shortcuts(v):
+            """Скорочення, потрібні, щоб стягнути v"""
+            neighbors = list(adjacency[v].items())
+            shortcuts = []
+            for i, (u, weight_uv) in enumerate(neighbors[:-1]):
+                rest = neighbors[i + 1:]
+                limit = weight_uv + max(weight for _, weight in rest)
+                distances = witness_search(u, v, limit)
+                for w, weight_vw in rest:
+                    via = weight_uv + weight_vw
+                    if distances.get(w, infinity) > via:
+                        shortcuts.append((u, w, via))
+            return shortcuts
+
+        def priority(v, shortcuts):
+            # Різниця ребер плюс кількість уже стягнутих сусідів
+            return len(shortcuts) - len(adjacency[v]) + contracted_neighbors[v]
+
+        heap = [(priority(v, find_shortcuts(v)), v) for v in range(n)]
+        heapq.heapify(heap)
+
+        order = 0
+        while heap:
+            _, v = heapq.heappop(heap)
+            shortcuts = find_shortcuts(v)
+
+            # Ліниве оновлення: важливість могла зрости після попередніх стягувань
+            current_priority = priority(v, shortcuts)
+            if heap and current_priority > heap[0][0]:
+                heapq.heappush(heap, (current_priority, v))
+                continue
+
+            rank[v] = order
+            order += 1
+
+            # Усі сусіди, що лишилися, мають вищий ранг - це ребра вгору
+            upward[v] = sorted(adjacency[v].items())
+            for u in adjacency[v]:
+                del adjacency[u][v]
+                contracted_neighbors[u] += 1
+            adjacency[v] = {}
+
+            for u, w, weight in shortcuts:
+                if weight < adjacency[u].get(w, infinity):
+                    adjacency[u][w] = weight
+                    adjacency[w][u] = weight
+                    middle[(u, w) if u < w else (w, u)] = v
+
+        offsets = array('q', [0])
+        targets = array('i')
+        weights = []
+        for v in range(n):
+            for u, weight in upward[v]:
+                targets.append(u)
+                weights.append(weight)
+            offsets.append(len(targets))
+        weights = array('d' if any(isinstance(w, float) for w in weights) else 'q', weights)
+
+        return cls(csr.nodes, rank, offsets, targets, weights, middle)
+
+    def _upward_search(self, other_distances, best, meeting, distances, heap, stats=None):
+        """Один крок пошуку вгору: обробляє вершину з вершини купи"""
+        distance, current = heapq.heappop(heap)
+        if stats is not None:
+            stats.pops += 1
+        if distance > distances[current][0]:
+            return best, meeting
+        if stats is not None:
+            stats.expanded(self.offsets[current + 1] - self.offsets[current])
+
+        if current in other_distances:
+            total = distance + other_distances[current][0]
+            if total < best:
+                best, meeting = total, current
+
+        for edge in range(self.offsets[current], self.offsets[current + 1]):
+            neighbor = self.targets[edge]
+            new_distance = distance + self.weights[edge]
+            if neighbor not in distances or new_distance < distances[neighbor][0]:
+                distances[neighbor] = (new_distance, current)
+                heapq.heappush(heap, (new_distance, neighbor))
+                if stats is not None:
+                    stats.relaxed(len(heap))
+
+        return best, meeting
+
+    @instrumented("ch_route")
+    def route(self, start, goal, *, stats=None):
+        """
+        Найкоротший маршрут через ієрархію
+
+        Args:
+            start: початкова вершина
+            goal: цільова вершина
+            stats: SearchStats для лічильників пошуку (None - без них)
+
+        Returns:
+            (path, minutes): найкоротший шлях та його довжина,
+            або (None, infinity), якщо шляху не існує
+        """
+        infinity = float('infinity')
+        start_id, goal_id = self.index[start], self.index[goal]
+
+        # Для кожної вершини - (відстань, попередник) у своєму напрямку
+        forward = {start_id: (0, -1)}
+        backward = {goal_id: (0, -1)}
+        forward_heap = [(0, start_id)]
+        backward_heap = [(0, goal_id)]
+        best, meeting = infinity, -1
+        if stats is not None:
+            stats.lap("prepare")
+            stats.pushed(1)
+            stats.pushed(1)
+
+        while forward_heap or backward_heap:
+            forward_min = forward_heap[0][0] if forward_heap else infinity
+            backward_min = backward_heap[0][0] if backward_heap else infinity
+
+            # Обидва напрямки вже не можуть покращити відповідь
+            if min(forward_min, backward_min) >= best:
+                break
+
+            if forward_min <= backward_min:
+                best, meeting = self._upward_search(backward, best, meeting, forward, forward_heap, stats)
+            else:
+                best, meeting = self._upward_search(forward, best, meeting, backward, backward_heap, stats)
+
+        if stats is not None:
+            stats.lap("search")
+        if meeting == -1:
+            return None, infinity
+
+        # Шлях у ієрархії: start → ... → meeting → ... → goal
+        up_path = []
+        node_id = meeting
+        while node_id != -1:
+            up_path.append(node_id)
+            node_id = forward[node_id][1]
+        up_path.reverse()
+        node_id = backward[meeting][1]
+        while node_id != -1:
+            up_path.append(node_id)
+            node_id = backward[node_id][1]
+
+        path = [start_id]
+        for a, b in zip(up_path, up_path[1:]):
+            self._unpack(a, b, path)
+
+        return [self.nodes[node_id] for node_id in path], best
+
+    def _unpack(self, a, b, path):
+        """Розгортає ребро a-b (можливо, скорочення) у реальні ребра, дописуючи вершини після a"""
+        stack = [(a, b)]
+        while stack:
+            x, y = stack.pop()
+            via = self.middle.get((x, y) if x < y else (y, x))
+            if via is None:
+                path.append(y)
+            else:
+                stack.append((via, y))
+                stack.append((x, via))
+
+    def number_of_shortcuts(self):
+        return len(self.middle)
+
+
+def compare_hierarchy_with_networkx(graph, hierarchy, start):
+    """Порівнює відстані через ієрархію з NetworkX (як compare_with_networkx у task3)"""
+    print(f"\n🔍 ПОРІВНЯННЯ ІЄРАРХІЇ З NETWORKX (від {start}):")
+    print("-" * 40)
+
+    nx_distances = nx.single_source_dijkstra_path_length(graph, start, weight='weight')
+
+    print(f"{'Вершина':<20} {'Ієрархія':<15} {'NetworkX':<15} {'Статус':<10}")
+    print("-" * 60)
+
+    all_correct = True
+    for node in sorted(graph.nodes()):
+        _, ch_distance = hierarchy.route(start, node)
+        ch_dist = ch_distance if ch_distance != float('infinity') else "∞"
+        nx_dist = nx_distances.get(node, "∞")
+
+        if ch_distance == nx_distances.get(node, float('infinity')):
+            status = "✅"
+        else:
+            status = "❌"
+            all_correct = False
+
+        print(f"{node:<20} {str(ch_dist):<15} {str(nx_dist):<15} {status:<10}")
+
+    if all_correct:
+        print(f"\n🎉 Ієрархія дає точні відстані!")
+    else:
+        print(f"\n⚠️ Знайдені розбіжності в ієрархії")
+
+    return all_correct
+
+
+if __name__ == "__main__":
+    G, weighted_routes = create_weighted_city_graph()
+
+    hierarchy = ContractionHierarchy.build(G)
+    print(f"\n🏗️ Ієрархію побудовано: {hierarchy.number_of_shortcuts()} скорочень")
+
+    compare_hierarchy_with_networkx(G, hierarchy, "Центр")
+
+    route, minutes = hierarchy.route("Парк", "Промзона")
+    print(f"\n🎯 Парк → Промзона: {' → '.join(route)} ({minutes} хв)")
@@ -0,0 +1,215 @@
+import hashlib
+import weakref
+from array import array
+from collections.abc import Sequence
+
+# Скомпільовані CSR для графів з лічильником версій (route_cache.VersionedGraph):
+# граф -> {атрибут ваги: (версія, CSRGraph)}
+_COMPILED = weakref.WeakKeyDictionary()
+
+
+class CSRGraph:
+    """
+    Компактне подання графа у форматі CSR (Compressed Sparse Row)
+
+    Вершини нумеруються цілими числами 0..V-1, сусіди вершини u лежать
+    у targets[offsets[u]:offsets[u + 1]], а ваги відповідних ребер -
+    у weights з тими ж індексами. Неорієнтоване ребро зберігається
+    двічі (по одному разу для кожного кінця).
+
+    Номери вершин призначаються у відсортованому порядку назв, а сусіди
+    кожної вершини впорядковані за номером, тож обхід сусідів одразу
+    детермінований і не потребує сортування під час пошуку.
+
+    nodes може бути будь-якою послідовністю (наприклад, ліниві назви
+    зі знімка graph_io), а словник index будується при першому пошуку
+    вершини за назвою.
+    """
+
+    def __init__(self, nodes, offsets, targets, weights):
+        self.nodes = nodes if isinstance(nodes, Sequence) else list(nodes)
+        self._index = None
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self._scratch = None
+
+    def __getstate__(self):
+        # Робочі масиви пошуку не передаються в інші процеси
+        state = dict(self.__dict__)
+        state["_scratch"] = None
+        return state
+
+    @classmethod
+    def from_networkx(cls, graph, weight='weight', default_weight=1):
+        """
+        Компілює NetworkX граф у CSR
+
+        Args:
+            graph: NetworkX граф (Graph або DiGraph)
+            weight: назва атрибута ваги ребра
+            default_weight: вага для ребер без атрибута
+
+        Returns:
+            CSRGraph з тими самими вершинами та ребрами
+        """
+        try:
+            nodes = sorted(graph.nodes())
+        except TypeError:
+            # Вершини різних типів не порівнюються - зберігаємо порядок графа
+            nodes = list(graph.nodes())
+        index = {node: i for i, node in enumerate(nodes)}
+
+        offsets = array('q', [0])
+        targets = array('i')
+        edge_weights = []
+
+        for node in nodes:
+            adjacency = sorted((index[neighbor], attributes.get(weight, default_weight))
+                               for neighbor, attributes in graph.adj[node].items())
+            for target, edge_weight in adjacency:
+                targets.append(target)
+                edge_weights.append(edge_weight)
+            offsets.append(len(targets))
+
+        # Цілі ваги (хвилини) лишаються цілими, щоб відстані не ставали float
+        integral = all(isinstance(w, int) for w in edge_weights)
+        weights = array('q' if integral else 'd', edge_weights)
+
+        return cls(nodes, offsets, targets, weights)
+
+    @property
+    def index(self):
+        """Словник {назва: номер вершини}"""
+        if self._index is None:
+            self._index = {node: i for i, node in enumerate(self.nodes)}
+        return self._index
+
+    def number_of_nodes(self):
+        return len(self.nodes)
+
+    def number_of_edges(self):
+        """Кількість записів у масиві суміжності (для неорієнтованого графа - 2E)"""
+        return len(self.targets)
+
+    def node_id(self, node):
+        """Номер вершини за назвою"""
+        return self.index[node]
+
+    def node_name(self, node_id):
+        """Назва вершини за номером"""
+        return self.nodes[node_id]
+
+    def neighbors(self, node_id):
+        """Номери сусідів вершини у порядку зростання"""
+        return self.targets[self.offsets[node_id]:self.offsets[node_id + 1]]
+
+    def edges(self, node_id):
+        """Пари (сусід, вага) для всіх ребер вершини"""
+        start, end = self.offsets[node_id], self.offsets[node_id + 1]
+        return zip(self.targets[start:end], self.weights[start:end])
+
+    def scratch(self):
+        """
+        Робочі масиви для точкового пошуку (див. SearchScratch)
+
+        Один набір масивів живе разом із графом і використовується
+        повторно; якщо він ще зайнятий (вкладений пошук), видається
+        тимчасовий. Після пошуку треба викликати release().
+        """
+        scratch = self._scratch
+        if scratch is None:
+            scratch = self._scratch = SearchScratch(len(self))
+        elif scratch.in_use:
+            scratch = SearchScratch(len(self))
+        scratch.in_use = True
+        return scratch
+
+    def __contains__(self, node):
+        return node in self.index
+
+    def __len__(self):
+        return len(self.nodes)
+
+
+class SearchScratch:
+    """
+    Масиви відстаней, попередників і позначок для пошуків на одному CSR
+
+    По два набори - для прямого (0) і зворотного (1) напрямків. Масиви
+    виділяються один раз на граф, а після пошуку скидаються лише
+    елементи зі списків touched, тож точковий запит не платить O(V) за
+    ініціалізацію і не тримає словників за номерами вершин.
+
+    Пошук записує номер вершини в touched[side], коли вперше змінює
+    її distances[side]; позначки settled ставляться лише таким вершинам.
+    """
+
+    def __init__(self, size):
+        infinity = float('infinity')
+        self.distances = ([infinity] * size, [infinity] * size)
+        self.previous = (array('i', [-1]) * size, array('i', [-1]) * size)
+        self.settled = (bytearray(size), bytearray(size))
+        self.touched = ([], [])
+        self.in_use = False
+
+    def release(self):
+        """Повертає зачеплені елементи до початкових значень"""
+        infinity = float('infinity')
+        for distances, previous, settled, touched in zip(self.distances, self.previous,
+                                                          self.settled, self.touched):
+            for node_id in touched:
+                distances[node_id] = infinity
+                previous[node_id] = -1
+                settled[node_id] = 0
+            touched.clear()
+        self.in_use = False
+
+
+def as_csr(graph, weight='weight'):
+    """
+    Повертає CSR-подання графа, компілюючи NetworkX граф за потреби
+
+    Граф з лічильником версій (route_cache.VersionedGraph збільшує його
+    при будь-якій зміні вершин, ребер чи атрибутів ребер) компілюється
+    один раз на версію: повторні пошуки отримують той самий CSR разом
+    з його робочими масивами. Звичайний nx.Graph компілюється при
+    кожному виклику - його правки неможливо помітити дешево, тож для
+    серії запитів передавайте VersionedGraph або готовий CSRGraph.
+    """
+    if isinstance(graph, CSRGraph):
+        return graph
+
+    version = getattr(graph, "version", None)
+    if version is None:
+        return CSRGraph.from_networkx(graph, weight=weight)
+
+    compiled = _COMPILED.setdefault(graph, {})
+    cached = compiled.get(weight)
+    if cached is None or cached[0] != version:
+        cached = compiled[weight] = (version, CSRGraph.from_networkx(graph, weight=weight))
+    return cached[1]
+
+
+def graph_fingerprint(graph, weight='weight'):
+    """
+    Відбиток версії графа: хеш вершин, ребер та ваг
+
+    Вершини хешуються разом із типом (repr і назва типу), тож графи
+    з вершинами 1 та '1' мають різні відбитки.
+
+    Args:
+        graph: NetworkX граф з вагами або CSRGraph
+        weight: назва атрибута ваги ребра; None - лише вершини й ребра
+            (зміна ваг відбиток не змінює)
+
+    Returns:
+        Рядок SHA-1, що змінюється при будь-якій зміні ребер чи ваг
+    """
+    csr = as_csr(graph, weight=weight)
+    digest = hashlib.sha1()
+    digest.update("\0".join(f"{type(node).__qualname__}:{node!r}" for node in csr.nodes).encode("utf-8"))
+    arrays = (csr.offsets, csr.targets) if weight is None else (csr.offsets, csr.targets, csr.weights)
+    for values in arrays:
+        digest.update(bytes(memoryview(values)))
+    return digest.hexdigest()
@@ -0,0 +1,210 @@
+from collections import OrderedDict
+
+import networkx as nx
+import numpy as np
+
+from csr_graph import as_csr, graph_fingerprint
+from task3 import dijkstra_arrays
+
+# Останні обчислені матриці за версією графа
+_CACHE = OrderedDict()
+_CACHE_SIZE = 8
+
+# Скільки рядків оновлювати за раз у Флойді-Уоршеллі
+_BLOCK_ROWS = 256
+
+# До такої кількості вершин щільні матричні алгоритми (O(n³)) швидші
+# за обходи з кожного джерела по CSR
+_DENSE_LIMIT = 256
+
+# Кількість джерел в одному бітовому BFS (біти uint64)
+_BFS_BATCH = 64
+
+
+class DistanceMatrix:
+    """
+    Матриця найкоротших відстаней між усіма парами вершин
+
+    Рядки та стовпці йдуть у порядку graph.nodes(), недосяжні пари
+    мають відстань inf. Діаметр, середня довжина шляху, ексцентриситет
+    та близькість рахуються з однієї матриці без повторних обходів.
+    """
+
+    def __init__(self, nodes, matrix):
+        self.nodes = list(nodes)
+        self.matrix = matrix
+
+    def eccentricity(self):
+        """Ексцентриситет кожної вершини (найбільша відстань до інших)"""
+        return dict(zip(self.nodes, map(_as_number, self.matrix.max(axis=1).tolist())))
+
+    def diameter(self):
+        return _as_number(self.matrix.max().item())
+
+    def radius(self):
+        return _as_number(self.matrix.max(axis=1).min().item())
+
+    def average_path_length(self):
+        """Середня довжина найкоротшого шляху по всіх впорядкованих парах"""
+        n = len(self.nodes)
+        if n < 2:
+            return 0
+        return self.matrix.sum().item() / (n * (n - 1))
+
+    def closeness(self):
+        """
+        Центральність близькості, як у nx.closeness_centrality
+
+        Для незв'язного графа використовується та сама поправка
+        Вассермана-Фауста на кількість досяжних вершин.
+        """
+        n = len(self.nodes)
+        finite = np.isfinite(self.matrix)
+        reachable = finite.sum(axis=0) - 1
+        totals = np.where(finite, self.matrix, 0).sum(axis=0)
+
+        closeness = np.zeros(n)
+        mask = (totals > 0) & (n > 1)
+        closeness[mask] = (reachable[mask] / totals[mask]) * (reachable[mask] / (n - 1))
+        return dict(zip(self.nodes, closeness.tolist()))
+
+
+def _as_number(value):
+    """Цілі відстані (переходи, хвилини) повертаємо як int"""
+    return int(value) if value.is_integer() else value
+
+
+def _bfs_levels(adjacency):
+    """Відстані в переходах для всіх джерел одночасно, рівень за рівнем"""
+    n = len(adjacency)
+    distances = np.full((n, n), np.inf)
+    np.fill_diagonal(distances, 0)
+
+    reached = np.eye(n, dtype=bool)
+    frontier = np.eye(n, dtype=np.float32)
+    level = 0
+
+    while frontier.any():
+        level += 1
+        # Вершини, суміжні з фронтом кожного джерела, які ще не досягнуто
+        frontier = ((frontier @ adjacency) > 0) & ~reached
+        reached |= frontier
+        distances[frontier] = level
+        frontier = frontier.astype(np.float32)
+
+    return distances
+
+
+def _bfs_rows(csr):
+    """
+    Відстані в переходах з усіх джерел: BFS по CSR на бітових масках
+
+    Кожна вершина тримає маску uint64 - які з 64 джерел пакета вже
+    дійшли до неї. Наступний рівень - OR масок сусідів
+    (np.bitwise_or.reduceat по CSR), тож один прохід по ребрах веде
+    64 пошуки одночасно: робота O(n / 64 · D · E) замість O(D · n³)
+    щільного множення матриць (D - діаметр).
+    """
+    n = len(csr)
+    offsets = np.asarray(csr.offsets, dtype=np.int64)
+    targets = np.asarray(csr.targets, dtype=np.intp)
+    has_edges = offsets[1:] > offsets[:-1]
+    starts = offsets[:-1][has_edges]
+    distances = np.full((n, n), np.inf)
+
+    for first in range(0, n, _BFS_BATCH):
+        batch = np.arange(first, min(first + _BFS_BATCH, n))
+        reached = np.zeros(n, dtype=np.uint64)
+        reached[batch] = np.left_shift(np.uint64(1), np.arange(len(batch), dtype=np.uint64))
+        distances[batch, batch] = 0
+        frontier = reached.copy()
+        level = 0
+
+        while len(targets) and frontier.any():
+            level += 1
+            gathered = np.zeros(n, dtype=np.uint64)
+            gathered[has_edges] = np.bitwise_or.reduceat(frontier[targets], starts)
+            frontier = gathered & ~reached
+            reached |= frontier
+
+            # Біти нових вершин - пари (джерело, вершина) цього рівня
+            nodes = np.flatnonzero(frontier)
+            bits = np.unpackbits(frontier[nodes].astype('<u8').view(np.uint8).reshape(-1, 8),
+                                 axis=1, bitorder='little')
+            rows, columns = np.nonzero(bits)
+            distances[first + columns, nodes[rows]] = level
+
+    return distances
+
+
+def _dijkstra_rows(csr):
+    """Зважені відстані з усіх джерел: Дейкстра по CSR з кожної вершини"""
+    n = len(csr)
+    distances = np.empty((n, n))
+    for source in range(n):
+        distances[source] = dijkstra_arrays(csr, source)[0]
+    return distances
+
+
+def _floyd_warshall(weights):
+    """Блочний Флойд-Уоршелл: для кожної проміжної вершини рядки оновлюються блоками"""
+    distances = weights.copy()
+    n = len(distances)
+
+    for k in range(n):
+        row_k = distances[k]
+        for start in range(0, n, _BLOCK_ROWS):
+            block = distances[start:start + _BLOCK_ROWS]
+            np.minimum(block, block[:, k, None] + row_k, out=block)
+
+    return distances
+
+
+def distance_matrix(graph, weight=None):
+    """
+    Повертає (кешовану) матрицю відстаней між усіма парами вершин
+
+    Малі графи (до _DENSE_LIMIT вершин) рахуються щільними матричними
+    алгоритмами, більші - обходами з кожного джерела по CSR: бітовий
+    BFS для переходів, Дейкстра для ваг.
+
+    Args:
+        graph: NetworkX граф
+        weight: назва атрибута ваги; None - рахувати переходи (BFS)
+
+    Returns:
+        DistanceMatrix для поточної версії графа
+    """
+    csr = as_csr(graph, weight=weight)
+    # Для BFS ваги не впливають на результат, тож не входять у ключ
+    key = (graph_fingerprint(csr, weight=weight), graph.is_directed(), weight)
+    if key in _CACHE:
+        _CACHE.move_to_end(key)
+        return _CACHE[key]
+
+    nodes = list(graph.nodes())
+    if len(nodes) <= _DENSE_LIMIT:
+        if weight is None:
+            adjacency = nx.to_numpy_array(graph, nodelist=nodes, weight=None, dtype=np.float32)
+            matrix = _bfs_levels(adjacency)
+        else:
+            weights = nx.to_numpy_array(graph, nodelist=nodes, weight=weight, nonedge=np.inf)
+            np.fill_diagonal(weights, 0)
+            matrix = _floyd_warshall(weights)
+    else:
+        if weight is None:
+            # BFS збирає маски з вхідних ребер: для орграфа - з оберненого
+            matrix = _bfs_rows(as_csr(graph.reverse(copy=False), weight=None)
+                               if graph.is_directed() else csr)
+        else:
+            matrix = _dijkstra_rows(csr)
+        # Рядки й стовпці - у порядку graph.nodes(), як у щільних алгоритмів
+        order = [csr.node_id(node) for node in nodes]
+        matrix = matrix[np.ix_(order, order)]
+
+    result = DistanceMatrix(nodes, matrix)
+    _CACHE[key] = result
+    if len(_CACHE) > _CACHE_SIZE:
+        _CACHE.popitem(last=False)
+
+    return result
@@ -0,0 +1,149 @@
+import heapq
+from collections import defaultdict
+
+from task3 import create_shortest_path_tree, create_weighted_city_graph, dijkstra_manual
+
+
+class DynamicShortestPaths:
+    """
+    Дерево найкоротших шляхів від одного джерела, що підтримується при зміні ваг
+
+    Після пакета змін ваг перераховується лише та частина дерева, якої
+    вони торкаються (у дусі алгоритму Рамалінгама-Репса):
+    - збільшення ваги ребра дерева робить недійсним піддерево під ним;
+      ці вершини отримують нові відстані від незачеплених сусідів;
+    - зменшення ваги будь-якого ребра запускає поширення покращень
+      від його кінців.
+    Обидва випадки обробляє одна купа, тож пакет із довільних змін
+    дає той самий результат, що й повний перерахунок dijkstra_manual.
+
+    distances та previous мають той самий формат, що й у dijkstra_manual.
+    """
+
+    def __init__(self, graph, source, weight='weight'):
+        self.graph = graph
+        self.source = source
+        self.weight = weight
+        self.distances, self.previous = dijkstra_manual(graph, source)
+
+        self.children = defaultdict(set)
+        for node, parent in self.previous.items():
+            if parent is not None:
+                self.children[parent].add(node)
+
+    def _subtree(self, root):
+        """Усі вершини піддерева найкоротших шляхів з коренем root"""
+        nodes = [root]
+        for node in nodes:
+            nodes.extend(self.children[node])
+        return nodes
+
+    def _set_parent(self, node, parent):
+        old_parent = self.previous[node]
+        if old_parent is not None:
+            self.children[old_parent].discard(node)
+        self.previous[node] = parent
+        if parent is not None:
+            self.children[parent].add(node)
+
+    def update(self, changes):
+        """
+        Застосовує пакет змін ваг і ремонтує дерево
+
+        Args:
+            changes: ітерабельна колекція (u, v, нова вага)
+
+        Returns:
+            Словник {вершина: (стара відстань, нова відстань)} для вершин,
+            у яких змінилася відстань або попередник
+        """
+        infinity = float('infinity')
+        weight = self.weight
+        distances, previous = self.distances, self.previous
+
+        increased_roots = []
+        decreased_edges = []
+        for u, v, new_weight in changes:
+            old_weight = self.graph[u][v][weight]
+            if new_weight == old_weight:
+                continue
+            self.graph[u][v][weight] = new_weight
+
+            if new_weight > old_weight:
+                # Зачіпає лише шляхи, що проходять цим ребром дерева
+                if previous[v] == u:
+                    increased_roots.append(v)
+                elif previous[u] == v:
+                    increased_roots.append(u)
+            else:
+                decreased_edges.append((u, v))
+
+        before = {}
+        heap = []
+
+        # Піддерева під подорожчалими ребрами втрачають відстані
+        affected = set()
+        for root in increased_roots:
+            if root not in affected:
+                affected.update(self._subtree(root))
+
+        for node in affected:
+            before[node] = (distances[node], previous[node])
+            distances[node] = infinity
+        for node in affected:
+            self._set_parent(node, None)
+
+        # Кандидати для зачеплених вершин - через незачеплених сусідів
+        for node in affected:
+            for neighbor, attributes in self.graph[node].items():
+                if neighbor not in affected and distances[neighbor] != infinity:
+                    heapq.heappush(heap, (distances[neighbor] + attributes[weight], node, neighbor))
+
+        # Подешевшалі ребра - покращення з обох кінців
+        for u, v in decreased_edges:
+            edge_weight = self.graph[u][v][weight]
+            for a, b in ((u, v), (v, u)):
+                if distances[a] + edge_weight < distances[b]:
+                    heapq.heappush(heap, (distances[a] + edge_weight, b, a))
+
+        # Дейкстра лише по зміненій частині
+        while heap:
+            distance, node, parent = heapq.heappop(heap)
+            if distance >= distances[node]:
+                continue
+
+            if node not in before:
+                before[node] = (distances[node], previous[node])
+            distances[node] = distance
+            self._set_parent(node, parent)
+
+            for neighbor, attributes in self.graph[node].items():
+                new_distance = distance + attributes[weight]
+                if new_distance < distances[neighbor]:
+                    heapq.heappush(heap, (new_distance, neighbor, node))
+
+        changed = {}
+        for node, (old_distance, old_parent) in before.items():
+            if old_distance != distances[node] or old_parent != previous[node]:
+                changed[node] = (old_distance, distances[node])
+
+        return changed
+
+    def shortest_path_tree(self):
+        """Поточне дерево найкоротших шляхів (як create_shortest_path_tree у task3)"""
+        return create_shortest_path_tree(self.graph, self.source, self.previous)
+
+
+if __name__ == "__main__":
+    G, weighted_routes = create_weighted_city_graph()
+    dynamic = DynamicShortestPaths(G, "Центр")
+
+    print("\n🚦 ОНОВЛЕННЯ ВАГ (дані про затори):")
+    updates = [("Центр", "Вокзал", 20), ("Ринок", "Торговий_центр", 3)]
+    for u, v, minutes in updates:
+        print(f"  {u} - {v}: {G[u][v]['weight']} → {minutes} хв")
+
+    changed = dynamic.update(updates)
+    print("\nЗмінені пункти призначення:")
+    for node, (old_distance, new_distance) in sorted(changed.items()):
+        print(f"  {node}: {old_distance} → {new_distance} хв")
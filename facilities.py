@@ -0,0 +1,188 @@
+import heapq
+from array import array
+
+from csr_graph import CSRGraph, as_csr
+from search_stats import instrumented
+from task3 import create_weighted_city_graph, reconstruct_path
+
+
+@instrumented("multi_source_dijkstra")
+def multi_source_dijkstra(csr, source_ids, *, stats=None):
+    """
+    Дейкстра від кількох джерел одночасно в номерах вершин CSR
+
+    Усі джерела кладуться в купу з відстанню 0, тож за один прохід
+    O(E log V) кожна вершина отримує відстань до найближчого джерела
+    та саме це джерело (мережева діаграма Вороного). При рівних
+    відстанях вершина дістається джерелу, що досягло її першим.
+
+    Args:
+        csr: CSRGraph
+        source_ids: номери вершин-джерел
+        stats: SearchStats для лічильників пошуку (None - без них)
+
+    Returns:
+        distances: список відстаней (infinity - жодне джерело не досягає)
+        previous: array('i') попередників на шляху від джерела (-1 - немає)
+        owners: array('i') з номером найближчого джерела (-1 - немає)
+    """
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    infinity = float('infinity')
+
+    distances = [infinity] * len(csr)
+    previous = array('i', [-1]) * len(csr)
+    owners = array('i', [-1]) * len(csr)
+    visited = bytearray(len(csr))
+
+    heap = []
+    for source in source_ids:
+        if owners[source] < 0:
+            distances[source] = 0
+            owners[source] = source
+            heap.append((0, source))
+            if stats is not None:
+                stats.pushed(len(heap))
+    # Усі джерела мають відстань 0, тож список уже є купою
+    if stats is not None:
+        stats.lap("prepare")
+
+    while heap:
+        current_distance, current = heapq.heappop(heap)
+        if stats is not None:
+            stats.pops += 1
+        if visited[current]:
+            continue
+        visited[current] = 1
+        if stats is not None:
+            stats.expanded(offsets[current + 1] - offsets[current])
+
+        owner = owners[current]
+        for edge in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[edge]
+            new_distance = current_distance + weights[edge]
+            if new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                previous[neighbor] = current
+                owners[neighbor] = owner
+                heapq.heappush(heap, (new_distance, neighbor))
+                if stats is not None:
+                    stats.relaxed(len(heap))
+
+    if stats is not None:
+        stats.lap("search")
+    return distances, previous, owners
+
+
+def select_facilities(graph, attribute, value=None):
+    """
+    Вершини-об'єкти за атрибутом вершини
+
+    Args:
+        graph: NetworkX граф
+        attribute: назва атрибута вершини (наприклад, 'kind')
+        value: потрібне значення атрибута; None - будь-яке істинне
+
+    Returns:
+        Список вершин у порядку графа
+    """
+    if isinstance(graph, CSRGraph):
+        raise ValueError("CSRGraph не зберігає атрибутів вершин - передайте NetworkX граф")
+
+    if value is None:
+        return [node for node, data in graph.nodes(data=attribute) if data]
+    return [node for node, data in graph.nodes(data=attribute) if data == value]
+
+
+def nearest_facility(graph, facilities=None, attribute=None, value=None, weight='weight', stats=None):
+    """
+    Найближчий об'єкт (лікарня, вокзал...) для кожного району за один прохід
+
+    Об'єкти задаються списком вершин або атрибутом вершин
+    (select_facilities). Граф вважається неорієнтованим: відстань від
+    об'єкта до району дорівнює відстані від району до об'єкта.
+
+    Args:
+        graph: NetworkX граф з вагами або CSRGraph
+        facilities: вершини-об'єкти
+        attribute, value: вибір об'єктів за атрибутом вершини, якщо
+            facilities не задано
+        weight: назва атрибута ваги ребра
+        stats: SearchStats для лічильників пошуку (None - без них)
+
+    Returns:
+        nearest: словник {вершина: найближчий об'єкт або None}
+        distances: словник відстаней до найближчого об'єкта
+        previous: словник попередніх вершин на шляху від об'єкта -
+            шлях відновлює reconstruct_path(previous, об'єкт, вершина)
+    """
+    if facilities is None:
+        if attribute is None:
+            raise ValueError("Задайте facilities або attribute")
+        facilities = select_facilities(graph, attribute, value)
+
+    csr = as_csr(graph, weight=weight)
+    names = csr.nodes
+    distances, previous, owners = multi_source_dijkstra(
+        csr, [csr.node_id(facility) for facility in facilities], stats=stats)
+
+    # Перекладаємо масиви у словники за назвами вершин
+    nearest = {node: (names[owner] if owner >= 0 else None) for node, owner in zip(names, owners)}
+    distances = dict(zip(names, distances))
+    previous = {node: (names[prev] if prev >= 0 else None) for node, prev in zip(names, previous)}
+
+    return nearest, distances, previous
+
+
+def facility_regions(nearest):
+    """
+    Розбиття районів за найближчим об'єктом
+
+    Returns:
+        Словник {об'єкт: список районів, для яких він найближчий}
+    """
+    regions = {}
+    for node, facility in nearest.items():
+        if facility is not None:
+            regions.setdefault(facility, []).append(node)
+    return regions
+
+
+if __name__ == "__main__":
+    import time
+
+    from generators import generate_city
+    from task3 import dijkstra_arrays
+
+    G, weighted_routes = create_weighted_city_graph()
+    for district in ("Лікарня", "Вокзал", "Аеропорт"):
+        G.nodes[district]["kind"] = "hospital" if district == "Лікарня" else "station"
+
+    nearest, distances, previous = nearest_facility(G, attribute="kind", value="station")
+
+    print("\n🏥 НАЙБЛИЖЧИЙ ВОКЗАЛ ДЛЯ КОЖНОГО РАЙОНУ:")
+    for district in sorted(distances, key=distances.get):
+        path = reconstruct_path(previous, nearest[district], district)
+        print(f"  {district:<16} → {nearest[district]:<9} {distances[district]:>3} хв  "
+              f"({' → '.join(reversed(path))})")
+
+    print("\n🗺️ ЗОНИ ОБСЛУГОВУВАННЯ:")
+    for facility, districts in facility_regions(nearest).items():
+        print(f"  {facility}: {', '.join(districts)}")
+
+    # Один прохід проти окремого алгоритму Дейкстри від кожного об'єкта
+    csr, _ = generate_city('grid', 100_000, seed=42)
+    sources = list(range(0, len(csr), len(csr) // 50))
+
+    started = time.perf_counter()
+    distances, previous, owners = multi_source_dijkstra(csr, sources)
+    single_pass = time.perf_counter() - started
+
+    started = time.perf_counter()
+    best = [float('infinity')] * len(csr)
+    for source in sources:
+        best = list(map(min, best, dijkstra_arrays(csr, source)[0]))
+    separate = time.perf_counter() - started
+
+    status = "✅" if best == distances else "❌"
+    print(f"\n⚡ {len(sources)} об'єктів, {len(csr)} вершин: один прохід {single_pass:.2f} с, "
+          f"окремі пошуки {separate:.2f} с {status}")
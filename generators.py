@@ -0,0 +1,314 @@
+import math
+
+import networkx as nx
+import numpy as np
+
+from graph_io import csr_from_edges
+
+# Швидкості руху (км/год): звичайні вулиці та магістралі
+_STREET_SPEED = (20.0, 40.0)
+_ARTERIAL_SPEED = (45.0, 70.0)
+
+
+def _travel_minutes(lengths, speeds):
+    """Час проїзду в цілих хвилинах (щонайменше 1), як ваги в create_weighted_city_graph"""
+    return np.maximum(1, np.rint(lengths / speeds * 60)).astype(np.int64)
+
+
+def _finish(node_count, sources, targets, minutes):
+    """
+    Збирає CSRGraph з масивів ребер; вершини названі числами 0..n-1
+
+    Масиви csr_from_edges уже є array.array: пошуки в task2/task3
+    індексують їх поелементно, а для array це значно швидше.
+    """
+    return csr_from_edges(list(range(node_count)), sources, targets, minutes)
+
+
+def grid_city(n, noise=0.15, block=0.4, seed=None):
+    """
+    Квартальна забудова: решітка вулиць зі зсунутими перехрестями
+
+    Приблизно noise горизонтальних вулиць прибирається (тупики,
+    парки), стільки ж діагоналей додається (проспекти навскіс). Нижній
+    ряд і всі вертикальні вулиці лишаються, тож граф зв'язний.
+    Кожна десята вулиця - магістраль з вищою швидкістю.
+
+    Args:
+        n: кількість перехресть
+        noise: частка змінених вулиць (0..1)
+        block: довжина кварталу в км
+        seed: зерно генератора випадкових чисел
+
+    Returns:
+        (csr, positions): CSRGraph з вагами в хвилинах та координати
+        вершин у км (масив n × 2)
+    """
+    rng = np.random.default_rng(seed)
+    width = max(1, math.ceil(math.sqrt(n)))
+    ids = np.arange(n)
+    rows, cols = ids // width, ids % width
+    positions = np.column_stack([cols, rows]).astype(np.float64) * block
+    positions += rng.uniform(-0.2, 0.2, size=(n, 2)) * block
+
+    # Горизонтальні вулиці: прибираємо частину, крім нижнього ряду
+    horizontal = ids[(cols < width - 1) & (ids + 1 < n)]
+    keep = (rows[horizontal] == 0) | (rng.random(len(horizontal)) >= noise)
+    horizontal = horizontal[keep]
+    vertical = ids[ids + width < n]
+    diagonal = ids[(cols < width - 1) & (ids + width + 1 < n)]
+    diagonal = diagonal[rng.random(len(diagonal)) < noise]
+
+    sources = np.concatenate([horizontal, vertical, diagonal])
+    targets = np.concatenate([horizontal + 1, vertical + width, diagonal + width + 1])
+
+    lengths = np.linalg.norm(positions[sources] - positions[targets], axis=1)
+    arterial = np.concatenate([rows[horizontal] % 10 == 0, cols[vertical] % 10 == 0,
+                               np.zeros(len(diagonal), dtype=bool)])
+    speeds = np.where(arterial, rng.uniform(*_ARTERIAL_SPEED, size=len(sources)),
+                      rng.uniform(*_STREET_SPEED, size=len(sources)))
+
+    return _finish(n, sources, targets, _travel_minutes(lengths, speeds)), positions
+
+
+def radial_city(n, spokes=None, noise=0.1, ring_spacing=0.8, seed=None):
+    """
+    Радіально-кільцеве місто: центр, кільцеві дороги та радіальні проспекти
+
+    Вершина 0 - центр, далі кільця по spokes вершин. Частка noise
+    кільцевих ділянок прибирається; радіальні проспекти лишаються
+    (і мають вищу швидкість), тож граф зв'язний.
+
+    Args:
+        n: кількість вершин
+        spokes: кількість радіальних проспектів (за замовчуванням ~√n)
+        noise: частка прибраних кільцевих ділянок (0..1)
+        ring_spacing: відстань між кільцями в км
+        seed: зерно генератора випадкових чисел
+
+    Returns:
+        (csr, positions): CSRGraph з вагами в хвилинах та координати вершин у км
+    """
+    rng = np.random.default_rng(seed)
+    spokes = spokes or max(6, int(math.sqrt(n)))
+    ids = np.arange(1, n)
+    rings = (ids - 1) // spokes + 1
+    slots = (ids - 1) % spokes
+
+    angles = 2 * math.pi * (slots + rng.uniform(-0.2, 0.2, size=len(ids))) / spokes
+    radii = rings * ring_spacing + rng.uniform(-0.1, 0.1, size=len(ids)) * ring_spacing
+    positions = np.zeros((n, 2))
+    positions[1:] = np.column_stack([radii * np.cos(angles), radii * np.sin(angles)])
+
+    # Радіальні ділянки: до тієї ж позиції на попередньому кільці або до центру
+    radial_targets = np.where(rings == 1, 0, ids - spokes)
+
+    # Кільцеві ділянки: до наступної позиції на тому ж кільці
+    ring_next = np.where(slots == spokes - 1, ids - spokes + 1, ids + 1)
+    ring_mask = (ring_next < n) & (ring_next != ids) & (rng.random(len(ids)) >= noise)
+
+    sources = np.concatenate([ids, ids[ring_mask]])
+    targets = np.concatenate([radial_targets, ring_next[ring_mask]])
+    lengths = np.linalg.norm(positions[sources] - positions[targets], axis=1)
+    speeds = np.concatenate([rng.uniform(*_ARTERIAL_SPEED, size=len(ids)),
+                             rng.uniform(*_STREET_SPEED, size=int(ring_mask.sum()))])
+
+    return _finish(n, sources, targets, _travel_minutes(lengths, speeds)), positions
+
+
+def _candidate_pairs(cells, order, cell_start, cell_end, offset, width, height, chunk):
+    """
+    Пари (i, j) точок з клітинки i та сусідньої клітинки за зсувом offset
+
+    Пари генеруються векторно порціями по chunk точок, щоб не тримати
+    в пам'яті всі кандидати одночасно.
+    """
+    dx, dy = offset
+    for begin in range(0, len(order), chunk):
+        points = order[begin:begin + chunk]
+        cx, cy = cells[points] % width + dx, cells[points] // width + dy
+        valid = (cx >= 0) & (cx < width) & (cy < height)
+        points = points[valid]
+        neighbor_cells = (cy * width + cx)[valid]
+
+        starts, ends = cell_start[neighbor_cells], cell_end[neighbor_cells]
+        counts = ends - starts
+        first = np.repeat(points, counts)
+        # Позиції всередині клітинки-сусіда: start + 0..count-1 для кожної точки
+        shifts = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        second = order[np.repeat(starts, counts) + shifts]
+        yield first, second
+
+
+def close_pairs(positions, radius, chunk=200_000):
+    """
+    Усі пари точок, ближчих одна до одної за radius
+
+    Точки розкладаються в сітку клітинок зі стороною radius, і
+    перевіряються лише пари з тієї самої або сусідньої клітинки, тож
+    робота - O(n · кількість сусідів), а не O(n²).
+
+    Args:
+        positions: масив координат n × 2
+        radius: найбільша відстань між точками пари
+        chunk: кількість точок в одній векторній порції
+
+    Yields:
+        (first, second): масиви номерів точок; кожна пара - рівно один раз
+    """
+    origin = positions.min(axis=0)
+    cell_xy = ((positions - origin) / radius).astype(np.int64)
+    width, height = cell_xy.max(axis=0) + 1
+    cells = cell_xy[:, 1] * width + cell_xy[:, 0]
+    order = np.argsort(cells, kind='stable')
+    counts = np.bincount(cells, minlength=width * height)
+    cell_end = np.cumsum(counts)
+    cell_start = cell_end - counts
+
+    # Власна клітинка та половина сусідніх - кожна пара перевіряється один раз
+    for offset in ((0, 0), (1, 0), (-1, 1), (0, 1), (1, 1)):
+        for first, second in _candidate_pairs(cells, order, cell_start, cell_end,
+                                              offset, width, height, chunk):
+            if offset == (0, 0):
+                mask = first < second
+                first, second = first[mask], second[mask]
+            close = np.linalg.norm(positions[first] - positions[second], axis=1) <= radius
+            yield first[close], second[close]
+
+
+def _largest_component(node_count, sources, targets):
+    """
+    Номери вершин найбільшої компоненти зв'язності
+
+    Мітки - дерева з вказівниками на меншу вершину (у дусі
+    Шилоаха-Вішкіна): корінь з більшою міткою підвішується до меншої,
+    далі стрибки по вказівниках до кореня. Ребра всередині вже
+    злитих дерев відкидаються, тож ітерацій мало навіть для 10⁶ вершин.
+    """
+    labels = np.arange(node_count)
+    while True:
+        first, second = labels[sources], labels[targets]
+        crossing = first != second
+        if not crossing.any():
+            break
+        sources, targets = sources[crossing], targets[crossing]
+        first, second = first[crossing], second[crossing]
+        labels[np.maximum(first, second)] = np.minimum(first, second)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+    return np.flatnonzero(labels == np.bincount(labels).argmax())
+
+
+def random_geometric_city(n, radius=None, size=None, seed=None):
+    """
+    Випадкове геометричне місто: перехрестя розкидані випадково, дорога
+    з'єднує кожні два ближчі за radius
+
+    Сусіди шукаються у сітці клітинок зі стороною radius, тож побудова
+    займає O(n · середній степінь), а не O(n²). Радіус за замовчуванням
+    дає середній степінь ~ln n (поріг зв'язності); щоб
+    граф був зв'язним, лишається лише найбільша компонента.
+
+    Args:
+        n: кількість точок
+        radius: радіус з'єднання в км
+        size: сторона квадрата міста в км (за замовчуванням ~0.4·√n)
+        seed: зерно генератора випадкових чисел
+
+    Returns:
+        (csr, positions): CSRGraph з вагами в хвилинах та координати вершин
+        у км; вершини перенумеровані 0..m-1 у межах найбільшої компоненти
+    """
+    rng = np.random.default_rng(seed)
+    size = size or 0.4 * math.sqrt(n)
+    radius = radius or size * math.sqrt(math.log(max(n, 2)) / (math.pi * n))
+    positions = rng.uniform(0, size, size=(n, 2))
+
+    sources, targets = [], []
+    for first, second in close_pairs(positions, radius):
+        sources.append(first)
+        targets.append(second)
+
+    sources, targets = np.concatenate(sources), np.concatenate(targets)
+    component = _largest_component(n, sources, targets)
+    remap = np.full(n, -1)
+    remap[component] = np.arange(len(component))
+    inside = remap[sources] >= 0
+    sources, targets = remap[sources[inside]], remap[targets[inside]]
+    positions = positions[component]
+
+    lengths = np.linalg.norm(positions[sources] - positions[targets], axis=1)
+    speeds = rng.uniform(*_STREET_SPEED, size=len(sources))
+
+    return _finish(len(component), sources, targets, _travel_minutes(lengths, speeds)), positions
+
+
+GENERATORS = {
+    'grid': grid_city,
+    'radial': radial_city,
+    'geometric': random_geometric_city,
+}
+
+
+def generate_city(kind, n, seed=None, **options):
+    """
+    Синтетичне місто заданого типу
+
+    Args:
+        kind: 'grid', 'radial' або 'geometric'
+        n: кількість вершин
+        seed: зерно генератора випадкових чисел
+        **options: параметри конкретного генератора
+
+    Returns:
+        (csr, positions)
+    """
+    if kind not in GENERATORS:
+        raise ValueError(f"Невідомий тип міста: {kind} (доступні: {', '.join(GENERATORS)})")
+    return GENERATORS[kind](n, seed=seed, **options)
+
+
+def to_networkx(csr, positions=None):
+    """
+    NetworkX граф з CSRGraph - для порівняння з алгоритмами networkx
+
+    Args:
+        csr: CSRGraph
+        positions: необов'язкові координати вершин (атрибут 'pos')
+
+    Returns:
+        VersionedGraph з вагами ребер в атрибуті 'weight' - пошуки
+        компілюють його в CSR один раз, доки граф не зміниться
+    """
+    from route_cache import VersionedGraph
+
+    G = VersionedGraph()
+    G.add_nodes_from(csr.nodes)
+    names = csr.nodes
+    for u in range(len(csr)):
+        for edge in range(csr.offsets[u], csr.offsets[u + 1]):
+            v = csr.targets[edge]
+            if u < v:
+                G.add_edge(names[u], names[v], weight=csr.weights[edge])
+
+    if positions is not None:
+        nx.set_node_attributes(G, dict(zip(names, map(tuple, positions))), 'pos')
+
+    return G
+
+
+if __name__ == "__main__":
+    import time
+
+    print("\n🏙️ СИНТЕТИЧНІ МІСТА:")
+    for kind in GENERATORS:
+        for n in (100, 10_000, 100_000):
+            started = time.perf_counter()
+            csr, positions = generate_city(kind, n, seed=42)
+            elapsed = time.perf_counter() - started
+            degree = csr.number_of_edges() / len(csr)
+            print(f"  {kind:>9} n={n:>7}: {len(csr)} вершин, {csr.number_of_edges() // 2} доріг, "
+                  f"середній степінь {degree:.1f}, {elapsed * 1000:.0f} мс")
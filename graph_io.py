@@ -0,0 +1,352 @@
+import csv
+import json
+import os
+from array import array
+from collections.abc import Sequence
+from itertools import islice
+
+import numpy as np
+
+from csr_graph import CSRGraph
+
+# Сигнатура файлу знімка та вирівнювання секцій для memmap
+SNAPSHOT_MAGIC = b"CSRSNAP2"
+_ALIGNMENT = 64
+
+# Перші стовпці заголовка, який записує write_edge_list
+EDGE_LIST_HEADER = ("source", "target")
+
+# Поширені назви стовпців кінців ребра - за ними впізнається заголовок
+# файлу без стовпця ваги
+_ENDPOINT_NAMES = {"source", "target", "from", "to", "u", "v", "src", "dst",
+                   "start", "end", "head", "tail", "node", "neighbor"}
+
+
+def _delimiter_for(path):
+    return "\t" if path.endswith((".tsv", ".tab")) else ","
+
+
+def load_edge_list(path, delimiter=None, chunk_size=100_000, header=None, directed=False):
+    """
+    Потоково читає список ребер CSV/TSV у CSRGraph
+
+    Рядки читаються порціями по chunk_size, назви вершин одразу
+    замінюються номерами, а ребра накопичуються в компактних масивах,
+    без побудови nx.Graph. Формат рядка: джерело, ціль[, вага].
+
+    Args:
+        path: шлях до файлу
+        delimiter: роздільник (за замовчуванням - за розширенням файлу)
+        chunk_size: кількість рядків в одній порції
+        header: чи є рядок заголовка (None - визначити автоматично за
+            першими рядками, див. _looks_like_header; для файлу з
+            двома стовпцями і незвичними назвами задайте явно)
+        directed: True - ребра лише в одному напрямку
+
+    Returns:
+        CSRGraph (масиви array.array, як у csr_from_edges)
+    """
+    delimiter = delimiter or _delimiter_for(path)
+    index = {}
+    sources = array('i')
+    targets = array('i')
+    weights = array('d')
+
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        first_chunk = True
+
+        while True:
+            rows = list(islice(reader, chunk_size))
+            if not rows:
+                break
+
+            if first_chunk:
+                first_chunk = False
+                if header is None:
+                    header = _looks_like_header(rows)
+                if header:
+                    rows = rows[1:]
+
+            for row in rows:
+                if not row:
+                    continue
+                source = index.setdefault(row[0], len(index))
+                target = index.setdefault(row[1], len(index))
+                sources.append(source)
+                targets.append(target)
+                weights.append(float(row[2]) if len(row) > 2 else 1.0)
+
+    names = list(index)
+    return csr_from_edges(names, np.frombuffer(sources, dtype=np.int32),
+                          np.frombuffer(targets, dtype=np.int32),
+                          np.frombuffer(weights, dtype=np.float64), directed)
+
+
+def _looks_like_header(rows):
+    """
+    Чи є перший рядок заголовком
+
+    Із стовпцем ваги - якщо вага в першому рядку нечислова. Без нього -
+    якщо обидві назви кінців поширені (source/target, from/to, u/v...)
+    або текстові над числовими вершинами в наступному рядку.
+    """
+    first = rows[0]
+    if len(first) > 2:
+        return not _is_number(first[2])
+
+    ends = first[:2]
+    if all(field.strip().lower() in _ENDPOINT_NAMES for field in ends):
+        return True
+    following = rows[1][:2] if len(rows) > 1 else []
+    return (len(following) == 2 and not any(map(_is_number, ends))
+            and all(map(_is_number, following)))
+
+
+def _is_number(text):
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+def csr_from_edges(names, sources, targets, weights, directed=False):
+    """
+    Будує CSRGraph з масивів ребер
+
+    Args:
+        names: назви вершин (номер у sources/targets - індекс у names)
+        sources, targets: масиви numpy з номерами кінців ребер
+        weights: масив numpy з вагами ребер
+        directed: True - ребра лише в одному напрямку
+
+    Returns:
+        CSRGraph з вершинами, перенумерованими у порядку назв; масиви
+        переведені з numpy в array.array - пошуки індексують їх
+        поелементно, а елементи array є звичайними числами Python
+    """
+    # Номери вершин - у відсортованому порядку назв, як у CSRGraph.from_networkx
+    order = sorted(range(len(names)), key=names.__getitem__)
+    remap = np.empty(len(names), dtype=np.int32)
+    remap[order] = np.arange(len(names), dtype=np.int32)
+    names = [names[i] for i in order]
+
+    sources, targets = remap[sources], remap[targets]
+    if not directed:
+        sources, targets = np.concatenate([sources, targets]), np.concatenate([targets, sources])
+        weights = np.concatenate([weights, weights])
+
+    # Повторні ребра між тими самими вершинами: лишаємо найлегше
+    edge_order = np.lexsort((weights, targets, sources))
+    sources, targets, weights = sources[edge_order], targets[edge_order], weights[edge_order]
+    keep = np.ones(len(sources), dtype=bool)
+    keep[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+    sources, targets, weights = sources[keep], targets[keep], weights[keep]
+
+    offsets = np.zeros(len(names) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=len(names)), out=offsets[1:])
+
+    # Цілі хвилини лишаються цілими, як у CSRGraph.from_networkx
+    integral = len(weights) and np.all(weights == np.round(weights))
+    weights = weights.astype(np.int64 if integral else np.float64)
+
+    return CSRGraph(names, array('q', offsets.tobytes()),
+                    array('i', targets.astype(np.int32).tobytes()),
+                    array('q' if integral else 'd', weights.tobytes()))
+
+
+def save_snapshot(csr, path, options=None):
+    """
+    Записує CSRGraph у бінарний знімок, придатний для memmap
+
+    Формат: сигнатура, довжина заголовка (uint64), JSON-заголовок, далі
+    вирівняні секції - назви вершин (UTF-8 підряд), межі назв у цьому
+    блоці (name_offsets, V + 1 чисел), offsets, targets, weights.
+    Назви зберігаються з довжинами, тож можуть містити будь-які символи.
+
+    Args:
+        csr: CSRGraph
+        path: шлях до файлу знімка
+        options: параметри розбору, з якими отримано граф - load_graph
+            порівнює їх перед повторним використанням знімка
+    """
+    encoded = [str(node).encode("utf-8") for node in csr.nodes]
+    name_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(name) for name in encoded], out=name_offsets[1:])
+    sections = [("names", np.frombuffer(b"".join(encoded), dtype=np.uint8)),
+                ("name_offsets", name_offsets),
+                ("offsets", np.asarray(csr.offsets, dtype=np.int64)),
+                ("targets", np.asarray(csr.targets, dtype=np.int32)),
+                ("weights", np.asarray(csr.weights))]
+
+    header = {"nodes": len(csr.nodes), "options": options, "sections": {}}
+    # Перший прохід рахує зсуви при заголовку фіксованого розміру
+    header_size = 4096
+    position = len(SNAPSHOT_MAGIC) + 8 + header_size
+    for name, values in sections:
+        position = -(-position // _ALIGNMENT) * _ALIGNMENT
+        header["sections"][name] = {"offset": position, "dtype": values.dtype.str,
+                                    "length": len(values)}
+        position += values.nbytes
+
+    header_bytes = json.dumps(header).encode("utf-8").ljust(header_size)
+    if len(header_bytes) > header_size:
+        raise ValueError("Заголовок знімка не вміщується у відведене місце")
+
+    with open(path, "wb") as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(np.uint64(header_size).tobytes())
+        f.write(header_bytes)
+        for name, values in sections:
+            f.seek(header["sections"][name]["offset"])
+            f.write(values.tobytes())
+
+
+def _read_header(path):
+    """JSON-заголовок знімка; ValueError - не знімок або старий формат"""
+    with open(path, "rb") as f:
+        if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} не є знімком графа")
+        header_size = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+        return json.loads(f.read(header_size).decode("utf-8"))
+
+
+class _SnapshotNames(Sequence):
+    """
+    Назви вершин знімка, що декодуються з memmap лише при зверненні
+
+    Відкриття знімка не читає таблицю назв: node_name(i) декодує одну
+    назву, а повний перебір (словник CSRGraph.index) - при першому
+    пошуку вершини за назвою.
+    """
+
+    def __init__(self, blob, bounds):
+        self._blob = blob
+        self._bounds = bounds
+
+    def __len__(self):
+        return max(len(self._bounds) - 1, 0)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("номер вершини поза межами")
+        start, end = int(self._bounds[i]), int(self._bounds[i + 1])
+        return self._blob[start:end].tobytes().decode("utf-8")
+
+    def __iter__(self):
+        blob = self._blob.tobytes()
+        bounds = self._bounds.tolist()
+        for start, end in zip(bounds, bounds[1:]):
+            yield blob[start:end].decode("utf-8")
+
+
+def load_snapshot(path, in_memory=False):
+    """
+    Відкриває знімок графа без розбору тексту
+
+    Масиви відображаються з файлу, а назви вершин декодуються ліниво
+    (_SnapshotNames), тож відкриття не залежить від розміру графа.
+
+    Args:
+        path: шлях до файлу знімка
+        in_memory: скопіювати масиви в array.array - швидший доступ у
+            циклах Python ціною читання всього файлу
+
+    Returns:
+        CSRGraph, масиви якого відображені з файлу (np.memmap)
+    """
+    header = _read_header(path)
+
+    def section(name):
+        info = header["sections"][name]
+        if info["length"] == 0:
+            return np.empty(0, dtype=info["dtype"])
+        return np.memmap(path, dtype=info["dtype"], mode="r",
+                         offset=info["offset"], shape=(info["length"],))
+
+    names = _SnapshotNames(section("names"), section("name_offsets"))
+    offsets, targets, weights = section("offsets"), section("targets"), section("weights")
+
+    if in_memory:
+        offsets = array('q', offsets.tobytes())
+        targets = array('i', targets.tobytes())
+        weights = array('q' if weights.dtype.kind == 'i' else 'd', weights.tobytes())
+
+    return CSRGraph(names, offsets, targets, weights)
+
+
+def load_graph(path, snapshot_path=None, **options):
+    """
+    Завантажує граф зі знімка, якщо він новіший за список ребер, інакше
+    розбирає список ребер і записує знімок для наступних запусків
+
+    Знімок використовується, лише якщо його записано з тими самими
+    параметрами розбору (роздільник, заголовок, directed); інакше
+    список ребер розбирається заново, а знімок перезаписується.
+
+    Args:
+        path: шлях до CSV/TSV списку ребер
+        snapshot_path: шлях до знімка (за замовчуванням - path + '.csr')
+        **options: параметри load_edge_list
+
+    Returns:
+        CSRGraph
+    """
+    snapshot_path = snapshot_path or path + ".csr"
+    # chunk_size не впливає на результат, тож не входить у параметри знімка
+    parse_options = {"delimiter": options.get("delimiter") or _delimiter_for(path),
+                     "header": options.get("header"),
+                     "directed": options.get("directed", False)}
+
+    if os.path.exists(snapshot_path) and os.path.getmtime(snapshot_path) >= os.path.getmtime(path):
+        try:
+            snapshot_options = _read_header(snapshot_path).get("options")
+        except ValueError:
+            snapshot_options = None
+        if snapshot_options == parse_options:
+            return load_snapshot(snapshot_path)
+
+    csr = load_edge_list(path, **options)
+    save_snapshot(csr, snapshot_path, parse_options)
+    return csr
+
+
+def write_edge_list(graph, path, weight='weight', delimiter=None):
+    """Записує NetworkX граф у CSV/TSV список ребер (джерело, ціль, вага)"""
+    delimiter = delimiter or _delimiter_for(path)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        writer.writerow([*EDGE_LIST_HEADER, weight])
+        for u, v, value in graph.edges(data=weight, default=1):
+            writer.writerow([u, v, value])
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    from task3 import create_weighted_city_graph, dijkstra_manual
+
+    G, weighted_routes = create_weighted_city_graph()
+
+    with tempfile.TemporaryDirectory() as directory:
+        edge_list = os.path.join(directory, "city_routes.csv")
+        write_edge_list(G, edge_list)
+
+        started = time.perf_counter()
+        csr = load_graph(edge_list)
+        parsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        csr = load_graph(edge_list)
+        mapped = time.perf_counter() - started
+
+        print(f"\n💽 Розбір CSV: {parsed * 1000:.2f} мс, відкриття знімка: {mapped * 1000:.2f} мс")
+
+        distances, _ = dijkstra_manual(csr, "Центр")
+        print(f"Відстань Центр → Аеропорт зі знімка: {distances['Аеропорт']} хв")
@@ -0,0 +1,197 @@
+import heapq
+
+import numpy as np
+
+from csr_graph import as_csr, graph_fingerprint
+from search_stats import instrumented
+from task3 import create_weighted_city_graph, dijkstra_manual, shortest_route
+
+# Позначка недосяжної вершини в таблицях відстаней (відстані невід'ємні)
+UNREACHABLE = -1.0
+
+
+class LandmarkIndex:
+    """
+    Індекс орієнтирів (landmarks) для A* з евристикою ALT
+
+    Для K вибраних орієнтирів зберігається таблиця відстаней
+    distances[v, k] від орієнтира k до кожної вершини v. За нерівністю
+    трикутника |d(L, t) - d(L, v)| ≤ d(v, t), тому максимум по всіх
+    орієнтирах є допустимою нижньою оцінкою відстані до цілі.
+    """
+
+    def __init__(self, nodes, landmarks, distances, fingerprint):
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.landmarks = list(landmarks)
+        self.distances = distances
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def build(cls, graph, k=8):
+        """
+        Вибирає K орієнтирів і рахує відстані від кожного
+
+        Орієнтири вибираються "найвіддаленішою точкою": кожен наступний -
+        вершина, найдальша від уже вибраних, тож вони розходяться по
+        околицях мережі, де оцінки найточніші.
+
+        Args:
+            graph: NetworkX граф з вагами або CSRGraph
+            k: кількість орієнтирів
+
+        Returns:
+            LandmarkIndex для цієї версії графа
+        """
+        csr = as_csr(graph)
+        k = min(k, len(csr))
+        distances = np.full((len(csr), k), UNREACHABLE)
+
+        # Відстань від кожної вершини до найближчого вибраного орієнтира
+        nearest = np.full(len(csr), np.inf)
+        landmarks = []
+        candidate = 0
+
+        for column in range(k):
+            if landmarks:
+                candidate = int(np.argmax(nearest))
+            else:
+                # Перший орієнтир - найдальша вершина від довільної стартової
+                first, _ = dijkstra_manual(csr, csr.node_name(0))
+                reachable = [(d, i) for i, d in enumerate(first.values()) if d != float('infinity')]
+                candidate = max(reachable)[1]
+
+            landmarks.append(csr.node_name(candidate))
+            landmark_distances, _ = dijkstra_manual(csr, csr.node_name(candidate))
+            row = np.array([landmark_distances[node] for node in csr.nodes], dtype=float)
+
+            nearest = np.minimum(nearest, row)
+            distances[:, column] = np.where(np.isinf(row), UNREACHABLE, row)
+
+        return cls(csr.nodes, landmarks, distances, graph_fingerprint(csr))
+
+    def save(self, path):
+        """Зберігає індекс у файл .npz"""
+        np.savez(path, nodes=np.array(self.nodes), landmarks=np.array(self.landmarks),
+                 distances=self.distances, fingerprint=np.array(self.fingerprint))
+
+    @classmethod
+    def load(cls, path, graph=None):
+        """
+        Завантажує індекс з файлу .npz
+
+        Args:
+            path: шлях до файлу
+            graph: якщо задано - перевіряє, що індекс побудовано для цієї версії графа
+
+        Returns:
+            LandmarkIndex
+        """
+        with np.load(path) as data:
+            index = cls(data['nodes'].tolist(), data['landmarks'].tolist(),
+                        data['distances'], str(data['fingerprint']))
+
+        if graph is not None and graph_fingerprint(graph) != index.fingerprint:
+            raise ValueError("Індекс орієнтирів побудовано для іншої версії графа")
+
+        return index
+
+    def lower_bound(self, node_id, goal_row):
+        """Нижня оцінка відстані від вершини до цілі за всіма орієнтирами"""
+        return float(np.max(np.abs(self.distances[node_id] - goal_row)))
+
+
+@instrumented("alt_route")
+def alt_route(graph, start, goal, index, *, stats=None):
+    """
+    A* з евристикою орієнтирів (ALT) для одного запиту "звідки-куди"
+
+    Args:
+        graph: NetworkX граф з вагами або CSRGraph тієї ж версії, що й index
+        start: початкова вершина
+        goal: цільова вершина
+        index: LandmarkIndex, побудований для цього графа
+        stats: SearchStats для лічильників пошуку (None - без них)
+
+    Returns:
+        (path, minutes): найкоротший шлях та його довжина,
+        або (None, infinity), якщо шляху не існує
+    """
+    csr = as_csr(graph)
+    if len(csr) != len(index.nodes):
+        raise ValueError("Індекс орієнтирів не відповідає графу")
+
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    infinity = float('infinity')
+    start_id, goal_id = csr.node_id(start), csr.node_id(goal)
+
+    goal_row = index.distances[goal_id]
+    # Орієнтир бачить рівно одну з вершин - вони в різних компонентах
+    if np.any((index.distances[start_id] == UNREACHABLE) != (goal_row == UNREACHABLE)):
+        return None, infinity
+
+    scratch = csr.scratch()
+    distances, previous = scratch.distances[0], scratch.previous[0]
+    settled, touched = scratch.settled[0], scratch.touched[0]
+    distances[start_id] = 0
+    touched.append(start_id)
+    heap = [(index.lower_bound(start_id, goal_row), start_id)]
+    if stats is not None:
+        stats.lap("prepare")
+        stats.pushed(1)
+
+    try:
+        while heap:
+            _, current = heapq.heappop(heap)
+            if stats is not None:
+                stats.pops += 1
+            if settled[current]:
+                continue
+            settled[current] = 1
+            if stats is not None:
+                stats.expanded(offsets[current + 1] - offsets[current])
+
+            if current == goal_id:
+                if stats is not None:
+                    stats.lap("search")
+                path = []
+                while current != -1:
+                    path.append(current)
+                    current = previous[current]
+                path.reverse()
+                return [csr.node_name(node_id) for node_id in path], distances[goal_id]
+
+            current_distance = distances[current]
+            for edge in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[edge]
+                new_distance = current_distance + weights[edge]
+
+                old_distance = distances[neighbor]
+                if new_distance < old_distance:
+                    if old_distance == infinity:
+                        touched.append(neighbor)
+                    distances[neighbor] = new_distance
+                    previous[neighbor] = current
+                    estimate = new_distance + index.lower_bound(neighbor, goal_row)
+                    heapq.heappush(heap, (estimate, neighbor))
+                    if stats is not None:
+                        stats.relaxed(len(heap))
+    finally:
+        scratch.release()
+
+    if stats is not None:
+        stats.lap("search")
+    return None, infinity
+
+
+if __name__ == "__main__":
+    G, weighted_routes = create_weighted_city_graph()
+
+    index = LandmarkIndex.build(G, k=3)
+    print(f"\n📍 Орієнтири: {', '.join(index.landmarks)}")
+
+    for start, goal in [("Парк", "Аеропорт"), ("Школа", "Промзона"), ("Ринок", "Стадіон")]:
+        route, minutes = alt_route(G, start, goal, index)
+        _, expected = shortest_route(G, start, goal)
+        status = "✅" if minutes == expected else "❌"
+        print(f"  {start} → {goal}: {' → '.join(route)} ({minutes} хв) {status}")
@@ -0,0 +1,266 @@
+import numpy as np
+
+from csr_graph import as_csr
+from generators import close_pairs
+
+# До цього розміру відштовхування рахується точно для всіх пар (O(V²))
+_EXACT_REPULSION_NODES = 300
+
+# Починаючи з цього розміру розкладка за замовчуванням багаторівнева
+_MULTILEVEL_NODES = 1000
+
+# Найгрубший рівень багаторівневої розкладки
+_COARSEST_NODES = 50
+
+
+def _edge_pairs(csr):
+    """Неорієнтовані ребра CSR як два масиви (u < v)"""
+    offsets = np.asarray(csr.offsets, dtype=np.int64)
+    targets = np.asarray(csr.targets, dtype=np.int64)
+    heads = np.repeat(np.arange(len(csr)), np.diff(offsets))
+    mask = heads < targets
+    return heads[mask], targets[mask]
+
+
+def _repulsion(positions, k):
+    """
+    Відштовхування Фрюхтермана-Рейнгольда k² / d
+
+    Для малих графів - точно для всіх пар (порціями рядків), для великих -
+    наближено через сітку: враховуються лише пари, ближчі за 2k, як у
+    сітковому варіанті алгоритму. Дальнє відштовхування дають грубші
+    рівні багаторівневої розкладки.
+    """
+    n = len(positions)
+    displacement = np.zeros_like(positions)
+
+    if n <= _EXACT_REPULSION_NODES:
+        for begin in range(0, n, 256):
+            delta = positions[begin:begin + 256, None, :] - positions[None, :, :]
+            distance2 = np.maximum((delta ** 2).sum(axis=2), 1e-12)
+            displacement[begin:begin + 256] = (delta * (k * k / distance2)[:, :, None]).sum(axis=1)
+        return displacement
+
+    for first, second in close_pairs(positions, 2 * k):
+        delta = positions[first] - positions[second]
+        distance2 = np.maximum((delta ** 2).sum(axis=1), 1e-12)
+        force = delta * (k * k / distance2)[:, None]
+        for axis in range(2):
+            displacement[:, axis] += np.bincount(first, force[:, axis], minlength=n)
+            displacement[:, axis] -= np.bincount(second, force[:, axis], minlength=n)
+    return displacement
+
+
+def _attraction(positions, sources, targets, k):
+    """Притягування вздовж ребер d² / k"""
+    n = len(positions)
+    delta = positions[sources] - positions[targets]
+    distance = np.sqrt((delta ** 2).sum(axis=1))
+    force = delta * (distance / k)[:, None]
+
+    displacement = np.zeros_like(positions)
+    for axis in range(2):
+        displacement[:, axis] -= np.bincount(sources, force[:, axis], minlength=n)
+        displacement[:, axis] += np.bincount(targets, force[:, axis], minlength=n)
+    return displacement
+
+
+def _refine(positions, sources, targets, iterations, temperature):
+    """
+    Ітерації Фрюхтермана-Рейнгольда з лінійним охолодженням
+
+    Розкладка живе в одиничному квадраті, k = 1/√n - як у nx.spring_layout.
+    Зсув кожної вершини за крок обмежений поточною температурою.
+    """
+    k = 1 / np.sqrt(len(positions))
+    cooling = temperature / (iterations + 1)
+
+    for _ in range(iterations):
+        displacement = _repulsion(positions, k) + _attraction(positions, sources, targets, k)
+        length = np.maximum(np.sqrt((displacement ** 2).sum(axis=1)), 1e-12)
+        positions += displacement * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+
+    return positions
+
+
+def _normalize(positions):
+    """Вписує розкладку в одиничний квадрат, зберігаючи пропорції"""
+    positions = positions - positions.min(axis=0)
+    extent = positions.max()
+    return positions / extent if extent > 0 else positions
+
+
+def _match(node_count, sources, targets, rng):
+    """
+    Випадкове паросполучення "рукостисканням" для згрубіння графа
+
+    Кожна вершина пропонує ребро з найменшим випадковим ключем; пара
+    утворюється, якщо пропозиції взаємні. Повертає номер кластера
+    (вершини грубшого графа) для кожної вершини.
+    """
+    keys = rng.random(len(sources))
+    heads = np.concatenate([sources, targets])
+    tails = np.concatenate([targets, sources])
+    keys = np.concatenate([keys, keys])
+
+    order = np.lexsort((keys, heads))
+    heads, tails = heads[order], tails[order]
+    first = np.ones(len(heads), dtype=bool)
+    first[1:] = heads[1:] != heads[:-1]
+
+    proposal = np.arange(node_count)
+    proposal[heads[first]] = tails[first]
+    mutual = proposal[proposal] == np.arange(node_count)
+
+    # Кластер - менший номер пари, далі стискаємо номери до 0..m-1
+    representative = np.where(mutual, np.minimum(np.arange(node_count), proposal),
+                              np.arange(node_count))
+    _, cluster = np.unique(representative, return_inverse=True)
+    return cluster
+
+
+def _coarsen(node_count, sources, targets, cluster):
+    """Ребра грубшого графа: кластери, з'єднані хоча б одним ребром"""
+    coarse_sources, coarse_targets = cluster[sources], cluster[targets]
+    low = np.minimum(coarse_sources, coarse_targets)
+    high = np.maximum(coarse_sources, coarse_targets)
+    mask = low != high
+    edges = np.unique(low[mask] * node_count + high[mask])
+    return edges // node_count, edges % node_count
+
+
+def _multilevel(node_count, sources, targets, iterations, rng):
+    """
+    Багаторівнева розкладка: граф стискається паросполученнями до
+    кількох десятків вершин, розкладається повністю, а далі кожен
+    рівень починає з позицій своїх кластерів і лише уточнюється
+    """
+    levels = []
+    while node_count > _COARSEST_NODES:
+        cluster = _match(node_count, sources, targets, rng)
+        coarse_count = int(cluster.max()) + 1
+        # Паросполучення майже не стискає граф (зірки, ізольовані вершини)
+        if coarse_count > 0.9 * node_count:
+            break
+        levels.append((node_count, sources, targets, cluster))
+        sources, targets = _coarsen(node_count, sources, targets, cluster)
+        node_count = coarse_count
+
+    positions = rng.random((node_count, 2))
+    positions = _refine(positions, sources, targets, iterations, temperature=0.1)
+
+    for node_count, sources, targets, cluster in reversed(levels):
+        k = 1 / np.sqrt(node_count)
+        positions = _normalize(positions)[cluster] + rng.uniform(-k, k, size=(node_count, 2)) * 0.5
+        positions = _refine(positions, sources, targets, max(5, iterations // 5), temperature=2 * k)
+
+    return positions
+
+
+def force_layout(graph, pos=None, iterations=50, seed=42, multilevel=None, warm_iterations=10):
+    """
+    Силова розкладка (Фрюхтерман-Рейнгольд) для великих мереж
+
+    На відміну від nx.spring_layout (O(V²) за ітерацію), сили рахуються
+    векторно в NumPy: притягування по масивах ребер CSR, відштовхування -
+    через сітку клітинок лише між близькими вершинами, тож ітерація
+    коштує O(V + E). Глобальну форму дає багаторівневий режим.
+
+    Args:
+        graph: NetworkX граф або CSRGraph
+        pos: попередня розкладка {вершина: (x, y)} для теплого старту -
+            після невеликих правок графа достатньо warm_iterations ітерацій;
+            нові вершини ставляться в центр своїх розміщених сусідів
+        iterations: кількість ітерацій (на найгрубшому рівні)
+        seed: зерно для початкових позицій
+        multilevel: багаторівневий режим; None - для графів від
+            _MULTILEVEL_NODES вершин без теплого старту
+        warm_iterations: кількість ітерацій при теплому старті
+
+    Returns:
+        Словник {вершина: np.ndarray([x, y])} з координатами в [-1, 1],
+        як у nx.spring_layout
+    """
+    csr = as_csr(graph)
+    node_count = len(csr)
+    rng = np.random.default_rng(seed)
+    sources, targets = _edge_pairs(csr)
+
+    if node_count == 0:
+        return {}
+
+    if pos is not None:
+        positions, placed = _warm_start(csr, pos, sources, targets, rng)
+        temperature = 0.1 if not placed.any() else 0.02
+        positions = _refine(positions, sources, targets, warm_iterations, temperature)
+    elif multilevel or (multilevel is None and node_count >= _MULTILEVEL_NODES):
+        positions = _multilevel(node_count, sources, targets, iterations, rng)
+    else:
+        positions = _refine(rng.random((node_count, 2)), sources, targets, iterations, temperature=0.1)
+
+    # Центр у нулі, найбільша координата за модулем - 1 (як rescale_layout)
+    positions = positions - positions.mean(axis=0)
+    extent = np.abs(positions).max()
+    if extent > 0:
+        positions /= extent
+
+    return dict(zip(csr.nodes, positions))
+
+
+def _warm_start(csr, pos, sources, targets, rng):
+    """
+    Початкові позиції з попередньої розкладки
+
+    Returns:
+        (positions, placed): позиції в одиничному квадраті та маска
+        вершин, що були в попередній розкладці
+    """
+    node_count = len(csr)
+    positions = rng.random((node_count, 2))
+    placed = np.array([node in pos for node in csr.nodes], dtype=bool)
+    if placed.any():
+        positions[placed] = np.array([pos[node] for node, known in zip(csr.nodes, placed) if known])
+
+    # Нові вершини - у центр розміщених сусідів (кілька проходів для ланцюжків)
+    for _ in range(3):
+        missing = ~placed
+        if not missing.any():
+            break
+        heads = np.concatenate([sources, targets])
+        tails = np.concatenate([targets, sources])
+        useful = missing[heads] & placed[tails]
+        counts = np.bincount(heads[useful], minlength=node_count)
+        reached = counts > 0
+        for axis in range(2):
+            sums = np.bincount(heads[useful], positions[tails[useful], axis], minlength=node_count)
+            positions[reached, axis] = sums[reached] / counts[reached]
+        placed = placed | reached
+
+    return _normalize(positions), placed
+
+
+if __name__ == "__main__":
+    import time
+
+    from generators import generate_city, to_networkx
+    from task3 import create_weighted_city_graph
+
+    G, weighted_routes = create_weighted_city_graph()
+    pos = force_layout(G)
+    print(f"\n🧲 Розкладка міста: {len(pos)} районів, Центр у {np.round(pos['Центр'], 2)}")
+
+    print("\n🗺️ РОЗКЛАДКА ВЕЛИКИХ МЕРЕЖ:")
+    for n in (10_000, 100_000):
+        csr, _ = generate_city('grid', n, seed=42)
+        started = time.perf_counter()
+        pos = force_layout(csr)
+        print(f"  {n} вершин: {time.perf_counter() - started:.1f} с")
+
+    # Невелика правка - нова дорога та новий район; теплий старт з попередньої розкладки
+    city = to_networkx(csr)
+    city.add_edge(0, n - 1, weight=30)
+    city.add_edge(n - 1, "Новий_район", weight=5)
+    started = time.perf_counter()
+    force_layout(city, pos=pos)
+    print(f"  теплий старт після правки: {time.perf_counter() - started:.1f} с")
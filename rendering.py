@@ -0,0 +1,245 @@
+import hashlib
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+import networkx as nx
+import numpy as np
+
+from csr_graph import graph_fingerprint
+from layout import force_layout
+
+# Розкладки в пам'яті процесу: ключ кешу -> {вершина: (x, y)}
+_LAYOUTS = {}
+
+# Остання розкладка кожного графа - для теплого старту після його правок
+_PREVIOUS_LAYOUTS = weakref.WeakKeyDictionary()
+
+# Більші графи розкладаються force_layout замість nx.spring_layout
+_SPRING_LAYOUT_NODES = 500
+
+# Граф і розкладка, передані в процес-обробник один раз при старті
+_worker_graph = None
+
+
+def layout_cache_dir():
+    """Каталог дискового кешу розкладок (змінна середовища LAYOUT_CACHE_DIR)"""
+    return os.environ.get("LAYOUT_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "city_graph_layouts")
+
+
+def cached_layout(graph, seed=42, k=3, iterations=50, cache_dir=None, method=None):
+    """
+    Розкладка вершин, обчислена один раз для кожної версії графа
+
+    Ключ кешу - відбиток графа (вершини, ребра, ваги) та параметри
+    розкладки. Розкладка зберігається в пам'яті процесу і на диску
+    (.npz), тож наступні запуски та процеси-обробники її не
+    перераховують. Будь-яка зміна графа дає новий ключ; для великих
+    графів нова розкладка тоді стартує з попередньої розкладки того
+    самого графа і потребує лише кількох ітерацій.
+
+    Args:
+        graph: NetworkX граф
+        seed, k, iterations: параметри nx.spring_layout
+        cache_dir: каталог кешу (за замовчуванням - layout_cache_dir())
+        method: 'spring' (nx.spring_layout) або 'force' (layout.force_layout);
+            None - 'force' для графів понад _SPRING_LAYOUT_NODES вершин
+
+    Returns:
+        Словник {вершина: np.ndarray([x, y])}, як у nx.spring_layout
+    """
+    if method is None:
+        method = 'force' if graph.number_of_nodes() > _SPRING_LAYOUT_NODES else 'spring'
+    parameters = f"{graph_fingerprint(graph)}:{seed}:{k}:{iterations}"
+    if method != 'spring':
+        parameters += f":{method}"
+    key = hashlib.sha1(parameters.encode("utf-8")).hexdigest()
+    if key in _LAYOUTS:
+        return dict(_LAYOUTS[key])
+
+    nodes = list(graph.nodes())
+    names = np.array([str(node) for node in nodes])
+    cache_dir = cache_dir or layout_cache_dir()
+    path = os.path.join(cache_dir, f"layout-{key}.npz")
+
+    pos = None
+    if os.path.exists(path):
+        with np.load(path) as stored:
+            if np.array_equal(stored["names"], names):
+                pos = dict(zip(nodes, stored["coordinates"]))
+
+    if pos is None:
+        if method == 'spring':
+            pos = nx.spring_layout(graph, seed=seed, k=k, iterations=iterations)
+        else:
+            pos = force_layout(graph, pos=_PREVIOUS_LAYOUTS.get(graph), iterations=iterations, seed=seed)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Запис через тимчасовий файл: паралельні процеси не побачать половину
+        temporary = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(temporary, names=names, coordinates=np.array([pos[node] for node in nodes]))
+        os.replace(temporary, path)
+
+    _LAYOUTS[key] = pos
+    _PREVIOUS_LAYOUTS[graph] = pos
+    return dict(pos)
+
+
+def new_figure(output=None, figsize=(16, 12), rows=2, cols=2):
+    """
+    Фігура з сіткою панелей
+
+    Якщо задано output, фігура створюється без pyplot (Agg), тож
+    малювання не потребує дисплея і не залежить від вибраного бекенда.
+
+    Returns:
+        (fig, axes)
+    """
+    if output is None:
+        import matplotlib.pyplot as plt
+        return plt.subplots(rows, cols, figsize=figsize)
+
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=figsize)
+    return fig, fig.subplots(rows, cols)
+
+
+def finish_figure(fig, output=None, dpi=100):
+    """
+    Показує фігуру у вікні або записує її у файл
+
+    Args:
+        fig: фігура з new_figure
+        output: шлях до файлу (.png, .svg, ...); None - plt.show()
+        dpi: роздільна здатність растрових форматів
+    """
+    fig.tight_layout()
+    if output is None:
+        import matplotlib.pyplot as plt
+        plt.show()
+        return
+
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fig.savefig(output, dpi=dpi)
+
+
+def draw_route(ax, graph, pos, path, color='red', title=None):
+    """Малює мережу сірим і виділяє маршрут path кольором color"""
+    nx.draw(graph, pos, ax=ax, with_labels=True, node_color='lightgray',
+            node_size=800, font_size=8, font_weight='bold', edge_color='lightgray')
+
+    if path:
+        path_edges = list(zip(path, path[1:]))
+        nx.draw_networkx_nodes(graph, pos, nodelist=path, node_color=color, node_size=1000, ax=ax)
+        nx.draw_networkx_edges(graph, pos, edgelist=path_edges, edge_color=color, width=3, ax=ax)
+        nx.draw_networkx_nodes(graph, pos, nodelist=[path[0]], node_color='green', node_size=1200, ax=ax)
+        nx.draw_networkx_nodes(graph, pos, nodelist=[path[-1]], node_color='orange', node_size=1200, ax=ax)
+
+    if title:
+        ax.set_title(title, fontweight='bold')
+
+
+def _init_worker(graph, pos):
+    global _worker_graph
+    matplotlib.use("Agg")
+    _worker_graph = (graph, pos)
+
+
+def _render_route(job):
+    """Одна панель маршруту у файл (виконується в процесі-обробнику)"""
+    graph, pos = _worker_graph
+    path, output, title = job
+    fig, ax = new_figure(output, figsize=(8, 6), rows=1, cols=1)
+    draw_route(ax, graph, pos, path, title=title)
+    finish_figure(fig, output)
+    return output
+
+
+def render_route_panels(graph, paths, directory, fmt="png", pos=None, workers=None):
+    """
+    Пакетно малює по одній картинці на маршрут
+
+    Розкладка обчислюється (або береться з кешу) один раз і разом із
+    графом передається кожному процесу-обробнику при старті, тож
+    процеси лише малюють.
+
+    Args:
+        graph: NetworkX граф
+        paths: список маршрутів (списків вершин; None - маршрут не знайдено)
+        directory: каталог для файлів
+        fmt: формат файлів ('png' або 'svg')
+        pos: готова розкладка (за замовчуванням - cached_layout(graph))
+        workers: кількість процесів (1 - послідовно, None - за кількістю ядер)
+
+    Returns:
+        Список шляхів до створених файлів у порядку маршрутів
+    """
+    pos = pos or cached_layout(graph)
+    jobs = []
+    for number, path in enumerate(paths):
+        title = " → ".join(map(str, path)) if path else "Шлях не знайдено"
+        jobs.append((path, os.path.join(directory, f"route_{number:04d}.{fmt}"), title))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) < 2:
+        global _worker_graph
+        _worker_graph = (graph, pos)
+        return [_render_route(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(graph, pos)) as pool:
+        return list(pool.map(_render_route, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+
+def _render_job(job):
+    function, args, kwargs = job
+    function(*args, **kwargs)
+    return kwargs["output"]
+
+
+def render_batch(jobs, workers=None):
+    """
+    Паралельно виконує кілька функцій візуалізації з параметром output
+
+    Args:
+        jobs: список (функція, args, kwargs); kwargs мають містити output,
+            функції - бути визначені на рівні модуля (для pickle)
+        workers: кількість процесів (None - за кількістю ядер)
+
+    Returns:
+        Список шляхів до створених файлів
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) < 2:
+        return [_render_job(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=matplotlib.use,
+                             initargs=("Agg",)) as pool:
+        return list(pool.map(_render_job, jobs))
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    from batch_routes import batch_routes
+    from task3 import create_weighted_city_graph
+
+    G, weighted_routes = create_weighted_city_graph()
+    districts = list(G.nodes())
+    pairs = [(start, goal) for start in districts for goal in districts if start < goal]
+    paths = [path for path, _ in batch_routes(G, pairs, weight='weight')]
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ.setdefault("LAYOUT_CACHE_DIR", os.path.join(directory, "layouts"))
+
+        started = time.perf_counter()
+        files = render_route_panels(G, paths, directory)
+        elapsed = time.perf_counter() - started
+
+        print(f"\n🖼️ Намальовано {len(files)} маршрутів за {elapsed:.1f} с "
+              f"({elapsed / len(files) * 1000:.0f} мс на картинку)")
+        print(f"  Приклад: {os.path.basename(files[0])}, {os.path.getsize(files[0]) // 1024} КБ")
@@ -0,0 +1,56 @@
+import csv
+import json
+
+# Формати потокового запису звітів
+FORMATS = ("jsonl", "csv")
+
+
+def _csv_value(value):
+    """Списки (шляхи) у CSV записуються одним рядком через стрілки"""
+    if isinstance(value, (list, tuple)):
+        return " → ".join(map(str, value))
+    return value
+
+
+def _json_value(value):
+    """Скаляри numpy (відстані на графі зі знімка memmap) - у числа Python"""
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def write_records(records, handle, fmt="jsonl", fields=None):
+    """
+    Потоково записує записи звіту у відкритий текстовий файл
+
+    Записи беруться з ітератора по одному, тож звіт не збирається
+    в пам'яті повністю.
+
+    Args:
+        records: ітерований набір словників
+        handle: відкритий текстовий файл (для CSV - з newline="")
+        fmt: 'jsonl' - JSON Lines, 'csv' - таблиця із заголовком
+        fields: стовпці CSV (за замовчуванням - ключі першого запису)
+
+    Returns:
+        Кількість записаних записів
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Невідомий формат звіту: {fmt} (очікується {', '.join(FORMATS)})")
+
+    count = 0
+    if fmt == "jsonl":
+        for record in records:
+            handle.write(json.dumps(record, ensure_ascii=False, default=_json_value))
+            handle.write("\n")
+            count += 1
+        return count
+
+    writer = None
+    for record in records:
+        if writer is None:
+            writer = csv.DictWriter(handle, fieldnames=fields or list(record))
+            writer.writeheader()
+        writer.writerow({key: _csv_value(value) for key, value in record.items()})
+        count += 1
+    return count
@@ -0,0 +1,254 @@
+import sys
+from collections import OrderedDict
+from copy import deepcopy
+
+import networkx as nx
+
+from csr_graph import as_csr
+from task3 import create_weighted_city_graph, dijkstra_arrays
+
+
+class _TrackedEdgeData(dict):
+    """Словник атрибутів ребра, що збільшує версію графа при будь-якій зміні"""
+
+    __slots__ = ('_graph',)
+
+    def __init__(self, graph):
+        super().__init__()
+        self._graph = graph
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._graph.version += 1
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._graph.version += 1
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._graph.version += 1
+
+    def pop(self, *args):
+        result = super().pop(*args)
+        self._graph.version += 1
+        return result
+
+    def clear(self):
+        super().clear()
+        self._graph.version += 1
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return super().setdefault(key, default)
+
+    def popitem(self):
+        result = super().popitem()
+        self._graph.version += 1
+        return result
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __reduce__(self):
+        # Відновлення без __setitem__: граф під час розпаковки ще не готовий
+        return _restore_edge_data, (self._graph, dict(self))
+
+    def __deepcopy__(self, memo):
+        data = {deepcopy(key, memo): deepcopy(value, memo) for key, value in self.items()}
+        graph = memo.get(id(self._graph))
+        # Окремо скопійовані атрибути ребра (to_directed) - звичайний словник
+        if graph is None:
+            return data
+        return _restore_edge_data(graph, data)
+
+
+def _restore_edge_data(graph, data):
+    edge_data = _TrackedEdgeData(graph)
+    dict.update(edge_data, data)
+    return edge_data
+
+
+class VersionedGraph(nx.Graph):
+    """
+    nx.Graph з лічильником версій
+
+    Версія збільшується при додаванні чи видаленні вершин і ребер, а
+    також при зміні атрибутів ребра (наприклад, G[u][v]['weight'] = 12),
+    тож кеш маршрутів бачить кожну правку графа.
+    """
+
+    # Версія на рівні класу існує ще до відновлення стану при копіюванні
+    version = 0
+
+    def __init__(self, incoming_graph_data=None, **attr):
+        self.version = 0
+        super().__init__(incoming_graph_data, **attr)
+
+    def edge_attr_dict_factory(self):
+        """Словник атрибутів нового ребра (nx.Graph викликає його як фабрику)"""
+        return _TrackedEdgeData(self)
+
+    def add_node(self, node_for_adding, **attr):
+        super().add_node(node_for_adding, **attr)
+        self.version += 1
+
+    def add_nodes_from(self, nodes_for_adding, **attr):
+        super().add_nodes_from(nodes_for_adding, **attr)
+        self.version += 1
+
+    def remove_node(self, n):
+        super().remove_node(n)
+        self.version += 1
+
+    def remove_nodes_from(self, nodes):
+        super().remove_nodes_from(nodes)
+        self.version += 1
+
+    def add_edge(self, u_of_edge, v_of_edge, **attr):
+        super().add_edge(u_of_edge, v_of_edge, **attr)
+        self.version += 1
+
+    def add_edges_from(self, ebunch_to_add, **attr):
+        super().add_edges_from(ebunch_to_add, **attr)
+        self.version += 1
+
+    def remove_edge(self, u, v):
+        super().remove_edge(u, v)
+        self.version += 1
+
+    def remove_edges_from(self, ebunch):
+        super().remove_edges_from(ebunch)
+        self.version += 1
+
+    def clear(self):
+        super().clear()
+        self.version += 1
+
+    def clear_edges(self):
+        super().clear_edges()
+        self.version += 1
+
+
+def graph_version(graph):
+    """Версія графа за O(1): лічильник VersionedGraph або None, якщо його немає"""
+    return getattr(graph, 'version', None)
+
+
+# Приблизні витрати пам'яті на запис без самого шляху: ключ, кортеж
+# результату та вузол OrderedDict (назви вершин належать графу)
+_ENTRY_BYTES = 320
+
+
+class RouteCache:
+    """
+    LRU-кеш найкоротших маршрутів з ключем (версія графа, джерело, ціль, вага)
+
+    Працює лише з графами, що мають лічильник версій (VersionedGraph):
+    перевірка версії коштує O(1), і щойно вона змінюється, усі записи
+    відкидаються, тож застарілий маршрут ніколи не повертається.
+    Звичайний nx.Graph відхиляється - відбиток такого графа коштує
+    більше, ніж сам маршрут.
+
+    Розмір кешу обмежений бюджетом пам'яті max_bytes: кожен запис
+    оцінюється як sys.getsizeof(шлях) плюс _ENTRY_BYTES, і найстаріші
+    записи витісняються, доки сума не вкладеться в бюджет.
+    """
+
+    def __init__(self, max_bytes=16 * 2**20):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._graph = None
+        self._version = None
+
+    def _sync(self, graph):
+        """Скидає кеш, якщо граф або його версія змінилися"""
+        version = graph_version(graph)
+        if version is None:
+            raise TypeError("RouteCache потребує графа з лічильником версій (VersionedGraph)")
+        if graph is not self._graph or version != self._version:
+            self._entries.clear()
+            self._bytes = 0
+            self._graph = graph
+            self._version = version
+        return version
+
+    def route(self, graph, source, target, weight='weight'):
+        """
+        Найкоротший маршрут з кешу або обчислений Дейкстрою
+
+        Args:
+            graph: VersionedGraph
+            source: початкова вершина
+            target: цільова вершина
+            weight: назва атрибута ваги
+
+        Returns:
+            (path, minutes): шлях (кортеж - спільний для всіх влучань, тож
+            незмінний) та його довжина, або (None, infinity)
+        """
+        version = self._sync(graph)
+        key = (version, source, target, weight)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+        self.misses += 1
+        # CSR кешується в as_csr до наступної зміни версії
+        csr = as_csr(graph, weight=weight)
+        source_id, target_id = csr.node_id(source), csr.node_id(target)
+        distances, previous = dijkstra_arrays(csr, source_id, (target_id,))
+
+        if distances[target_id] == float('infinity'):
+            result = (None, float('infinity'))
+        else:
+            path = [target_id]
+            while previous[path[-1]] != -1:
+                path.append(previous[path[-1]])
+            result = (tuple(csr.node_name(node_id) for node_id in reversed(path)),
+                      distances[target_id])
+
+        size = _ENTRY_BYTES + sys.getsizeof(result[0])
+        self._entries[key] = (result, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+
+        return result
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+        self._graph = None
+        self._version = None
+
+    def stats(self):
+        """Лічильники кешу для метрик"""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries),
+                'bytes': self._bytes, 'max_bytes': self.max_bytes}
+
+
+if __name__ == "__main__":
+    city_graph, weighted_routes = create_weighted_city_graph()
+    G = VersionedGraph(city_graph)
+    cache = RouteCache(max_bytes=64 * 1024)
+
+    print("\n💾 КЕШ МАРШРУТІВ:")
+    for _ in range(3):
+        path, minutes = cache.route(G, "Парк", "Аеропорт")
+    print(f"  Парк → Аеропорт: {' → '.join(path)} ({minutes} хв)")
+
+    # Затор на маршруті Центр - Вокзал: версія графа змінюється, кеш скидається
+    G["Центр"]["Вокзал"]["weight"] = 30
+    path, minutes = cache.route(G, "Парк", "Аеропорт")
+    print(f"  Після затору: {' → '.join(path)} ({minutes} хв)")
+    print(f"  Статистика: {cache.stats()}")
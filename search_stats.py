@@ -0,0 +1,193 @@
+import time
+from functools import wraps
+
+# Лічильники, що накопичуються за всі пошуки
+COUNTERS = ("searches", "expansions", "edges_scanned", "relaxations", "pushes", "pops")
+
+# Прапорець генераторної функції у co_flags (без імпорту inspect)
+_CO_GENERATOR = 0x20
+
+
+class SearchStats:
+    """
+    Лічильники та час роботи алгоритмів пошуку
+
+    Передається в пошук параметром stats=...; один об'єкт можна
+    передавати в багато запитів - лічильники накопичуються, а
+    peak_frontier - найбільший фронт серед усіх запитів. Без stats
+    пошук лише перевіряє `stats is not None` на операціях з фронтом,
+    тож вимкнене інструментування майже нічого не коштує.
+
+    Лічильники:
+        searches: кількість пошуків (вкладені пошуки, як-от у алгоритмі
+            Єна, рахуються як частина зовнішнього)
+        expansions: розгорнуті вершини (вилучені з фронту вперше)
+        edges_scanned: переглянуті ребра розгорнутих вершин
+        relaxations: ребра, що покращили відстань або відкрили вершину
+        pushes, pops: операції з купою, чергою чи стеком
+        peak_frontier: найбільший розмір фронту
+        seconds: загальний час пошуків
+        phases: {етап: секунди} - 'prepare' (CSR і номери вершин),
+            'search' (основний цикл), 'result' (шляхи та словники назв)
+
+    Args:
+        on_search: функція, що після кожного пошуку отримує словник
+            з лічильниками й часом саме цього пошуку - для метрик
+            і пошуку повільних запитів
+    """
+
+    def __init__(self, on_search=None):
+        self.on_search = on_search
+        self.reset()
+
+    def reset(self):
+        """Обнуляє всі лічильники"""
+        for name in COUNTERS:
+            setattr(self, name, 0)
+        self.peak_frontier = 0
+        self.seconds = 0.0
+        self.phases = {}
+        self._depth = 0
+        self._search_peak = 0
+
+    def pushed(self, frontier):
+        """Додавання у фронт; frontier - розмір фронту після додавання"""
+        self.pushes += 1
+        if frontier > self._search_peak:
+            self._search_peak = frontier
+
+    def relaxed(self, frontier):
+        """Ребро покращило відстань (відкрило вершину), і вершина додана у фронт"""
+        self.relaxations += 1
+        self.pushed(frontier)
+
+    def expanded(self, degree):
+        """Розгортання вершини з degree ребрами"""
+        self.expansions += 1
+        self.edges_scanned += degree
+
+    def lap(self, phase):
+        """Відносить час від попередньої позначки до етапу phase"""
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._mark
+        self._mark = now
+
+    def begin(self, algorithm):
+        """Початок пошуку (вкладені виклики лише збільшують глибину)"""
+        self._depth += 1
+        if self._depth > 1:
+            return
+        self._algorithm = algorithm
+        self._counters_before = [getattr(self, name) for name in COUNTERS]
+        self._phases_before = dict(self.phases)
+        self._search_peak = 0
+        self._started = self._mark = time.perf_counter()
+
+    def end(self):
+        """Кінець пошуку: решта часу - етап 'result', звіт у on_search"""
+        self._depth -= 1
+        if self._depth:
+            return
+        self.lap("result")
+        self.searches += 1
+        seconds = self._mark - self._started
+        self.seconds += seconds
+        self.peak_frontier = max(self.peak_frontier, self._search_peak)
+
+        if self.on_search is not None:
+            record = {"algorithm": self._algorithm, "seconds": seconds,
+                      "peak_frontier": self._search_peak}
+            for name, before in zip(COUNTERS[1:], self._counters_before[1:]):
+                record[name] = getattr(self, name) - before
+            for phase, total in self.phases.items():
+                record[f"{phase}_seconds"] = total - self._phases_before.get(phase, 0.0)
+            self.on_search(record)
+
+    def as_dict(self):
+        """Плоский словник накопичених значень для системи метрик"""
+        values = {name: getattr(self, name) for name in COUNTERS}
+        values["peak_frontier"] = self.peak_frontier
+        values["seconds"] = self.seconds
+        for phase, total in self.phases.items():
+            values[f"{phase}_seconds"] = total
+        return values
+
+    def __repr__(self):
+        counters = ", ".join(f"{name}={getattr(self, name)}" for name in COUNTERS)
+        return f"SearchStats({counters}, peak_frontier={self.peak_frontier})"
+
+
+def instrumented(algorithm):
+    """
+    Декоратор пошуку з параметром stats: відмічає початок і кінець пошуку
+
+    Без stats функція викликається напряму. Для генераторів пошук
+    починається з першим next() і закінчується, коли генератор вичерпано
+    або закрито, тож їхній час включає й роботу того, хто перебирає
+    результати; генератор, який так і не запустили, пошуком не вважається.
+    """
+    def decorate(function):
+        if function.__code__.co_flags & _CO_GENERATOR:
+            @wraps(function)
+            def generator_wrapper(*args, **kwargs):
+                stats = kwargs.get("stats")
+                if stats is None:
+                    return function(*args, **kwargs)
+                return _tracked(function(*args, **kwargs), stats, algorithm)
+            return generator_wrapper
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            stats = kwargs.get("stats")
+            if stats is None:
+                return function(*args, **kwargs)
+
+            stats.begin(algorithm)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                stats.end()
+        return wrapper
+    return decorate
+
+
+def _tracked(generator, stats, algorithm):
+    stats.begin(algorithm)
+    try:
+        yield from generator
+    finally:
+        stats.end()
+
+
+if __name__ == "__main__":
+    from generators import generate_city
+    from task2 import bfs_path, bfs_path_bidirectional, dfs_path_single
+    from task3 import dijkstra_manual, shortest_route
+
+    csr, _ = generate_city('grid', 10_000, seed=42)
+    start, goal = csr.node_name(0), csr.node_name(len(csr) - 1)
+
+    print("\n📊 ЛІЧИЛЬНИКИ ПОШУКІВ (решітка 10000 вершин):")
+    searches = [("bfs_path", lambda stats: bfs_path(csr, start, goal, stats=stats)),
+                ("bfs_path_bidirectional", lambda stats: bfs_path_bidirectional(csr, start, goal, stats=stats)),
+                ("dfs_path_single", lambda stats: dfs_path_single(csr, start, goal, stats=stats)),
+                ("dijkstra_manual", lambda stats: dijkstra_manual(csr, start, stats=stats)),
+                ("shortest_route", lambda stats: shortest_route(csr, start, goal, stats=stats))]
+
+    for name, search in searches:
+        stats = SearchStats()
+        search(stats)
+        print(f"  {name:<23} розгорнуто {stats.expansions:>6}, релаксацій {stats.relaxations:>6}, "
+              f"pop {stats.pops:>6}, фронт ≤ {stats.peak_frontier:>5}, "
+              f"{stats.seconds * 1000:7.2f} мс")
+
+    # Вартість інструментування: той самий пошук без stats і з ним
+    for stats in (None, SearchStats()):
+        started = time.perf_counter()
+        for _ in range(5):
+            dijkstra_manual(csr, start, stats=stats)
+        label = "без stats" if stats is None else "зі stats "
+        print(f"  dijkstra_manual {label}: {(time.perf_counter() - started) / 5 * 1000:.2f} мс")
+
+    # Звіт про кожен пошук - наприклад, для журналу повільних запитів
+    shortest_route(csr, start, goal, stats=SearchStats(on_search=print))
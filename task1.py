@@ -1,13 +1,14 @@
-import networkx as nx
-import matplotlib.pyplot as plt
-import numpy as np
+from reports import write_records
+from task2 import bfs_path_bidirectional
 
-print("🚌 ЗАВДАННЯ 1: ТРАНСПОРТНА МЕРЕЖА МІСТА")
-print("=" * 50)
 
 def create_city_transport_graph():
     """Створює граф транспортної мережі міста (автобусні маршрути)"""
-    G = nx.Graph()
+    # networkx завантажується лише при побудові графа, а не під час імпорту;
+    # VersionedGraph компілюється в CSR один раз на версію
+    from route_cache import VersionedGraph
+    
+    G = VersionedGraph()
     
     # Додаємо райони міста як вершини
     districts = [
@@ -63,78 +64,185 @@ def create_city_transport_graph():
     
     return G, districts, routes
 
-def analyze_graph(G, districts, routes):
-    """Аналізує основні характеристики графа"""
-    print("\n📊 АНАЛІЗ ОСНОВНИХ ХАРАКТЕРИСТИК ГРАФА:")
-    print("-" * 40)
+def graph_metrics(G, workers=None, betweenness_epsilon=None):
+    """
+    Обчислює характеристики графа без виводу на екран
     
-    # Основні характеристики
-    num_nodes = G.number_of_nodes()
-    num_edges = G.number_of_edges()
+    Args:
+        G: NetworkX граф
+        workers: кількість процесів для центральності посередництва
+        betweenness_epsilon: якщо задано - наближена центральність
+            посередництва з такою похибкою (вибірка джерел)
     
-    print(f"Кількість вершин (районів): {num_nodes}")
-    print(f"Кількість ребер (маршрутів): {num_edges}")
-    print(f"Граф зв'язний: {'Так' if nx.is_connected(G) else 'Ні'}")
+    Returns:
+        Словник: 'summary' - загальні характеристики (числа), далі
+        словники {район: значення} 'degrees', 'degree_centrality',
+        'betweenness_centrality', 'closeness_centrality'
+    """
+    # Важкі залежності (networkx, numpy) - лише при обчисленні характеристик
+    import networkx as nx
+    import numpy as np
+    from centrality import approximate_betweenness, brandes_centrality
+    from distance_matrix import distance_matrix
     
-    # Ступені вершин
+    num_nodes = G.number_of_nodes()
+    connected = nx.is_connected(G)
     degrees = dict(G.degree())
+    degree_values = list(degrees.values())
+    
+    summary = {
+        "nodes": num_nodes,
+        "edges": G.number_of_edges(),
+        "connected": connected,
+        "density": nx.density(G),
+        "degree_mean": float(np.mean(degree_values)),
+        "degree_max": max(degree_values),
+        "degree_min": min(degree_values),
+        "diameter": None,
+        "radius": None,
+        "average_path_length": None,
+    }
+    
+    # Усі відстані рахуються один раз і кешуються для повторних звітів
+    distances = distance_matrix(G)
+    if connected:
+        summary["diameter"] = distances.diameter()
+        summary["radius"] = distances.radius()
+        summary["average_path_length"] = distances.average_path_length()
+    
+    if betweenness_epsilon is None:
+        betweenness_centrality, _ = brandes_centrality(G, workers=workers)
+        betweenness_samples = num_nodes
+    else:
+        betweenness_centrality, betweenness_samples = approximate_betweenness(
+            G, epsilon=betweenness_epsilon, adaptive=True, workers=workers)
+    summary["betweenness_samples"] = betweenness_samples
+    summary["betweenness_epsilon"] = betweenness_epsilon
+    
+    return {
+        "summary": summary,
+        "degrees": degrees,
+        "degree_centrality": nx.degree_centrality(G),
+        "betweenness_centrality": betweenness_centrality,
+        "closeness_centrality": distances.closeness(),
+    }
+
+def district_rows(metrics):
+    """
+    Рядки звіту по районах - від найбільшої кількості маршрутів
+    
+    Returns:
+        Генератор словників district, degree, degree_centrality,
+        betweenness_centrality, closeness_centrality
+    """
+    degrees = metrics["degrees"]
+    for district in sorted(degrees, key=degrees.get, reverse=True):
+        yield {
+            "district": district,
+            "degree": degrees[district],
+            "degree_centrality": metrics["degree_centrality"][district],
+            "betweenness_centrality": metrics["betweenness_centrality"][district],
+            "closeness_centrality": metrics["closeness_centrality"][district],
+        }
+
+def print_graph_report(metrics, top=3):
+    """Друкує характеристики з graph_metrics у консоль"""
+    summary = metrics["summary"]
+    
+    print("\n📊 АНАЛІЗ ОСНОВНИХ ХАРАКТЕРИСТИК ГРАФА:")
+    print("-" * 40)
+    
+    print(f"Кількість вершин (районів): {summary['nodes']}")
+    print(f"Кількість ребер (маршрутів): {summary['edges']}")
+    print(f"Граф зв'язний: {'Так' if summary['connected'] else 'Ні'}")
+    
     print(f"\n🔢 СТУПЕНІ ВЕРШИН (кількість маршрутів):")
-    for district, degree in sorted(degrees.items(), key=lambda x: x[1], reverse=True):
-        print(f"  {district}: {degree} маршрутів")
+    for row in district_rows(metrics):
+        print(f"  {row['district']}: {row['degree']} маршрутів")
     
-    # Статистика ступенів
-    degree_values = list(degrees.values())
     print(f"\n📈 СТАТИСТИКА СТУПЕНІВ:")
-    print(f"  Середній ступінь: {np.mean(degree_values):.2f}")
-    print(f"  Максимальний ступінь: {max(degree_values)}")
-    print(f"  Мінімальний ступінь: {min(degree_values)}")
+    print(f"  Середній ступінь: {summary['degree_mean']:.2f}")
+    print(f"  Максимальний ступінь: {summary['degree_max']}")
+    print(f"  Мінімальний ступінь: {summary['degree_min']}")
     
-    # Щільність графа
-    density = nx.density(G)
-    print(f"\n🌐 ЩІЛЬНІСТЬ ГРАФА: {density:.3f}")
+    print(f"\n🌐 ЩІЛЬНІСТЬ ГРАФА: {summary['density']:.3f}")
     print(f"  (Відношення існуючих ребер до максимально можливих)")
     
-    # Діаметр та середня довжина шляху
-    if nx.is_connected(G):
-        diameter = nx.diameter(G)
-        avg_path_length = nx.average_shortest_path_length(G)
+    if summary["connected"]:
         print(f"\n📏 ХАРАКТЕРИСТИКИ ВІДСТАНЕЙ:")
-        print(f"  Діаметр графа: {diameter}")
-        print(f"  Середня довжина шляху: {avg_path_length:.2f}")
-    
-    # Центральність
-    degree_centrality = nx.degree_centrality(G)
-    betweenness_centrality = nx.betweenness_centrality(G)
-    closeness_centrality = nx.closeness_centrality(G)
+        print(f"  Діаметр графа: {summary['diameter']}")
+        print(f"  Радіус графа: {summary['radius']}")
+        print(f"  Середня довжина шляху: {summary['average_path_length']:.2f}")
     
-    print(f"\n⭐ ТОП-3 НАЙВАЖЛИВІШІ РАЙОНИ:")
+    print(f"\n⭐ ТОП-{top} НАЙВАЖЛИВІШІ РАЙОНИ:")
     
     print(f"\nЗа кількістю маршрутів (degree centrality):")
-    top_degree = sorted(degree_centrality.items(), key=lambda x: x[1], reverse=True)[:3]
+    top_degree = sorted(metrics["degree_centrality"].items(), key=lambda x: x[1], reverse=True)[:top]
     for i, (district, centrality) in enumerate(top_degree, 1):
         print(f"  {i}. {district}: {centrality:.3f}")
     
     print(f"\nЗа центральністю (betweenness centrality):")
-    top_betweenness = sorted(betweenness_centrality.items(), key=lambda x: x[1], reverse=True)[:3]
+    if summary["betweenness_samples"] < summary["nodes"]:
+        print(f"  (оцінка за {summary['betweenness_samples']} з {summary['nodes']} джерел, "
+              f"похибка ≤ {summary['betweenness_epsilon']})")
+    top_betweenness = sorted(metrics["betweenness_centrality"].items(), key=lambda x: x[1], reverse=True)[:top]
     for i, (district, centrality) in enumerate(top_betweenness, 1):
         print(f"  {i}. {district}: {centrality:.3f}")
     
     print(f"\nЗа близькістю (closeness centrality):")
-    top_closeness = sorted(closeness_centrality.items(), key=lambda x: x[1], reverse=True)[:3]
+    top_closeness = sorted(metrics["closeness_centrality"].items(), key=lambda x: x[1], reverse=True)[:top]
     for i, (district, centrality) in enumerate(top_closeness, 1):
         print(f"  {i}. {district}: {centrality:.3f}")
+
+def analyze_graph(G, districts, routes, workers=None, betweenness_epsilon=None,
+                  output=None, fmt="jsonl", verbose=True):
+    """
+    Аналізує основні характеристики графа
     
-    return degrees, degree_centrality, betweenness_centrality
+    Args:
+        G: NetworkX граф
+        districts: список районів
+        routes: список маршрутів
+        workers: кількість процесів для центральності посередництва
+        betweenness_epsilon: якщо задано - наближена центральність
+            посередництва з такою похибкою (вибірка джерел)
+        output: відкритий текстовий файл для потокового запису рядків
+            по районах (district_rows); None - не записувати
+        fmt: формат запису - 'jsonl' або 'csv'
+        verbose: друкувати звіт у консоль
+    
+    Returns:
+        Словник характеристик, як у graph_metrics
+    """
+    metrics = graph_metrics(G, workers=workers, betweenness_epsilon=betweenness_epsilon)
+    
+    if output is not None:
+        write_records(district_rows(metrics), output, fmt)
+    if verbose:
+        print_graph_report(metrics)
+    
+    return metrics
 
-def visualize_graph(G, degrees, degree_centrality, betweenness_centrality):
-    """Візуалізує граф з різними характеристиками"""
+def visualize_graph(G, degrees, degree_centrality, betweenness_centrality, output=None, pos=None):
+    """
+    Візуалізує граф з різними характеристиками
+    
+    Args:
+        output: шлях до файлу (.png, .svg) - записати без вікна (Agg);
+            None - показати у вікні
+        pos: готова розкладка вершин (за замовчуванням - з кешу розкладок)
+    """
+    # matplotlib та networkx завантажуються лише при малюванні
+    import networkx as nx
+    from rendering import cached_layout, finish_figure, new_figure
+    
     print("\n🎨 СТВОРЕННЯ ВІЗУАЛІЗАЦІЇ:")
     
-    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    fig, axes = new_figure(output, figsize=(16, 12))
     fig.suptitle('Транспортна мережа міста: Аналіз та візуалізація', fontsize=16, fontweight='bold')
     
-    # Позиціонування вершин
-    pos = nx.spring_layout(G, seed=42, k=3, iterations=50)
+    # Позиціонування вершин (один раз на версію графа)
+    pos = pos or cached_layout(G)
     
     # График 1: Базовий граф
     nx.draw(G, pos, ax=axes[0,0], with_labels=True, node_color='lightblue',
@@ -161,8 +269,7 @@ def visualize_graph(G, degrees, degree_centrality, betweenness_centrality):
             font_weight='bold', edge_color='gray', cmap='Blues')
     axes[1,1].set_title('Центральність посередництва\n(синіший = більше з\'єднує)', fontweight='bold')
     
-    plt.tight_layout()
-    plt.show()
+    finish_figure(fig, output)
 
 def create_route_analysis(G):
     """Аналіз конкретних маршрутів"""
@@ -178,8 +285,8 @@ def create_route_analysis(G):
     ]
     
     for start, end in important_routes:
-        if nx.has_path(G, start, end):
-            path = nx.shortest_path(G, start, end)
+        path = bfs_path_bidirectional(G, start, end)
+        if path:
             length = len(path) - 1
             print(f"  {start} → {end}: {' → '.join(path)} (пересадок: {length})")
         else:
@@ -187,17 +294,18 @@ def create_route_analysis(G):
 
 # Основна програма
 if __name__ == "__main__":
+    print("🚌 ЗАВДАННЯ 1: ТРАНСПОРТНА МЕРЕЖА МІСТА")
+    print("=" * 50)
+    
     # Створюємо граф
     G, districts, routes = create_city_transport_graph()
     
     # Аналізуємо граф
-    degrees, degree_centrality, betweenness_centrality = analyze_graph(G, districts, routes)
+    metrics = analyze_graph(G, districts, routes)
     
     # Візуалізуємо граф
-    visualize_graph(G, degrees, degree_centrality, betweenness_centrality)
+    visualize_graph(G, metrics["degrees"], metrics["degree_centrality"],
+                    metrics["betweenness_centrality"])
     
     # Аналізуємо маршрути
-    create_route_analysis(G)
-    
-    # Повертаємо граф для використання в інших завданнях
-    globals()['city_graph'] = G
\ No newline at end of file
+    create_route_analysis(G)
\ No newline at end of file
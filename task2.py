@@ -1,14 +1,17 @@
-import networkx as nx
+import heapq
+from array import array
 from collections import deque
-import matplotlib.pyplot as plt
-
-print("🔍 ЗАВДАННЯ 2: АЛГОРИТМИ DFS ТА BFS")
-print("=" * 50)
+from csr_graph import as_csr
+from search_stats import instrumented
 
 # Використовуємо граф з першого завдання
 def create_city_transport_graph():
     """Відтворює граф з завдання 1"""
-    G = nx.Graph()
+    # networkx потрібен лише для побудови графа, а не для пошуку;
+    # VersionedGraph компілюється в CSR один раз на версію
+    from route_cache import VersionedGraph
+    
+    G = VersionedGraph()
     
     districts = [
         "Центр", "Вокзал", "Університет", "Лікарня", "Ринок", 
@@ -33,69 +36,241 @@ def create_city_transport_graph():
     
     return G
 
-def dfs_paths(graph, start, goal, path=None):
+@instrumented("dfs_paths")
+def dfs_paths(graph, start, goal, cutoff=None, *, stats=None):
     """
     Пошук у глибину (DFS) для знаходження всіх шляхів
     
     Args:
-        graph: NetworkX граф
+        graph: NetworkX граф або CSRGraph
         start: початкова вершина  
         goal: цільова вершина
-        path: поточний шлях (для рекурсії)
+        cutoff: найбільша кількість пересадок у шляху (None - без обмеження)
+        stats: SearchStats для лічильників пошуку (None - без них)
     
     Returns:
-        Генератор всіх можливих шляхів від start до goal
+        Генератор всіх простих шляхів від start до goal (кортежі вершин)
     """
-    if path is None:
-        path = [start]
+    csr = as_csr(graph)
+    names = csr.nodes
+    start_id, goal_id = csr.node_id(start), csr.node_id(goal)
+    if stats is not None:
+        stats.lap("prepare")
     
-    if start == goal:
-        yield path
+    for path in _simple_paths_ids(csr, start_id, goal_id, cutoff, stats):
+        yield tuple(names[node_id] for node_id in path)
+    
+    if stats is not None:
+        stats.lap("search")
+
+@instrumented("count_simple_paths")
+def count_simple_paths(graph, start, goal, *, stats=None):
+    """
+    Кількість простих шляхів від start до goal без побудови самих шляхів
+    
+    Args:
+        graph: NetworkX граф або CSRGraph
+        start: початкова вершина
+        goal: цільова вершина
+        stats: SearchStats для лічильників пошуку (None - без них)
+    
+    Returns:
+        Кількість шляхів
+    """
+    csr = as_csr(graph)
+    start_id, goal_id = csr.node_id(start), csr.node_id(goal)
+    if stats is not None:
+        stats.lap("prepare")
     
-    for neighbor in graph.neighbors(start):
-        if neighbor not in path:  # Уникаємо циклів
-            yield from dfs_paths(graph, neighbor, goal, path + [neighbor])
+    count = sum(1 for _ in _simple_paths_ids(csr, start_id, goal_id, stats=stats))
+    if stats is not None:
+        stats.lap("search")
+    
+    return count
 
-def dfs_path_single(graph, start, goal):
+def _simple_paths_ids(csr, start, goal, cutoff=None, stats=None):
+    """
+    Ітеративний перебір простих шляхів у номерах вершин CSR
+    
+    Замість рекурсії - явний стек позицій у рядках суміжності, один
+    спільний буфер шляху та масив позначок "вершина на шляху" для
+    перевірки циклів за O(1). Кожен знайдений шлях віддається як той
+    самий буфер - копіювати його має той, кому він потрібен.
+    Шляхи довші за cutoff ребер не продовжуються.
+    Для stats кожне продовження шляху - додавання в стек і
+    розгортання вершини, кожне повернення - вилучення.
+    """
+    offsets, targets = csr.offsets, csr.targets
+    
+    if start == goal:
+        yield [start]
+        return
+    
+    on_path = bytearray(len(csr))
+    on_path[start] = 1
+    path = [start]
+    # Для кожної вершини шляху - індекс наступного ребра для перегляду
+    cursors = [offsets[start]]
+    if stats is not None:
+        stats.pushed(1)
+        stats.expanded(offsets[start + 1] - offsets[start])
+    
+    while cursors:
+        node = path[-1]
+        edge = cursors[-1]
+        
+        # Усі сусіди переглянуті - повертаємось назад
+        if edge == offsets[node + 1]:
+            cursors.pop()
+            on_path[path.pop()] = 0
+            if stats is not None:
+                stats.pops += 1
+            continue
+        
+        cursors[-1] = edge + 1
+        neighbor = targets[edge]
+        if on_path[neighbor]:  # Уникаємо циклів
+            continue
+        # Ще одне ребро зробило б шлях довшим за cutoff (і до цілі теж)
+        if cutoff is not None and len(path) > cutoff:
+            continue
+        
+        path.append(neighbor)
+        if neighbor == goal:
+            yield path
+            path.pop()
+        elif cutoff is not None and len(path) > cutoff:
+            path.pop()
+        else:
+            on_path[neighbor] = 1
+            cursors.append(offsets[neighbor])
+            if stats is not None:
+                stats.relaxed(len(path))
+                stats.expanded(offsets[neighbor + 1] - offsets[neighbor])
+
+@instrumented("dfs_path_single")
+def dfs_path_single(graph, start, goal, *, stats=None):
     """
     Пошук у глибину (DFS) для знаходження одного шляху
     
     Args:
-        graph: NetworkX граф
+        graph: NetworkX граф або CSRGraph
         start: початкова вершина
         goal: цільова вершина
+        stats: SearchStats для лічильників пошуку (None - без них)
     
     Returns:
         Перший знайдений шлях або None
     """
-    visited = set()
-    stack = [(start, [start])]
+    csr = as_csr(graph)
+    start_id, goal_id = csr.node_id(start), csr.node_id(goal)
+    
+    visited = bytearray(len(csr))
+    stack = [(start_id, [start_id])]
+    if stats is not None:
+        stats.lap("prepare")
+        stats.pushed(1)
     
     while stack:
         current, path = stack.pop()
+        if stats is not None:
+            stats.pops += 1
         
-        if current == goal:
-            return path
+        if current == goal_id:
+            if stats is not None:
+                stats.lap("search")
+            return [csr.node_name(node_id) for node_id in path]
             
-        if current not in visited:
-            visited.add(current)
+        if not visited[current]:
+            visited[current] = 1
+            neighbors = csr.neighbors(current)
+            if stats is not None:
+                stats.expanded(len(neighbors))
             
             # Додаємо сусідів до стеку (в зворотному порядку для консистентності)
-            neighbors = sorted(graph.neighbors(current), reverse=True)
-            for neighbor in neighbors:
-                if neighbor not in visited:
+            for neighbor in reversed(neighbors):
+                if not visited[neighbor]:
                     stack.append((neighbor, path + [neighbor]))
+                    if stats is not None:
+                        stats.relaxed(len(stack))
     
+    if stats is not None:
+        stats.lap("search")
     return None
 
-def bfs_path(graph, start, goal):
+@instrumented("bfs_parents")
+def bfs_parents(csr, start_id, target_ids=(), *, stats=None):
+    """
+    BFS, що зберігає лише масив батьків
+    
+    Args:
+        csr: CSRGraph
+        start_id: номер початкової вершини
+        target_ids: номери цілей; якщо задано - пошук зупиняється,
+            щойно всі цілі досягнуто
+        stats: SearchStats для лічильників пошуку (None - без них)
+    
+    Returns:
+        parents: array з батьком кожної вершини (-1 - не досягнута,
+        у start_id батьком є вона сама)
+    """
+    offsets, targets = csr.offsets, csr.targets
+    parents = array('i', [-1]) * len(csr)
+    parents[start_id] = start_id
+    
+    remaining = set(target_ids)
+    remaining.discard(start_id)
+    stop_early = bool(target_ids)
+    if stop_early and not remaining:
+        return parents
+    
+    queue = deque([start_id])
+    if stats is not None:
+        stats.pushed(1)
+    while queue:
+        current = queue.popleft()
+        if stats is not None:
+            stats.pops += 1
+            stats.expanded(offsets[current + 1] - offsets[current])
+        
+        # Сусіди в CSR вже впорядковані, сортувати не потрібно
+        for neighbor in targets[offsets[current]:offsets[current + 1]]:
+            if parents[neighbor] < 0:
+                parents[neighbor] = current
+                if stats is not None:
+                    stats.relaxed(len(queue) + 1)
+                
+                if stop_early:
+                    remaining.discard(neighbor)
+                    if not remaining:
+                        return parents
+                
+                queue.append(neighbor)
+    
+    return parents
+
+def _path_from_parents(csr, parents, goal_id):
+    """Відновлює шлях до goal_id за масивом батьків (None - не досягнута)"""
+    if parents[goal_id] < 0:
+        return None
+    
+    path = [goal_id]
+    while parents[path[-1]] != path[-1]:
+        path.append(parents[path[-1]])
+    path.reverse()
+    
+    return [csr.node_name(node_id) for node_id in path]
+
+@instrumented("bfs_path")
+def bfs_path(graph, start, goal, *, stats=None):
     """
     Пошук у ширину (BFS) для знаходження найкоротшого шляху
     
     Args:
-        graph: NetworkX граф  
+        graph: NetworkX граф або CSRGraph
         start: початкова вершина
         goal: цільова вершина
+        stats: SearchStats для лічильників пошуку (None - без них)
     
     Returns:
         Найкоротший шлях або None
@@ -103,26 +278,317 @@ def bfs_path(graph, start, goal):
     if start == goal:
         return [start]
     
-    visited = set([start])
-    queue = deque([(start, [start])])
+    csr = as_csr(graph)
+    start_id, goal_id = csr.node_id(start), csr.node_id(goal)
+    if stats is not None:
+        stats.lap("prepare")
     
-    while queue:
-        current, path = queue.popleft()
-        
-        # Сортуємо сусідів для консистентності результатів
-        neighbors = sorted(graph.neighbors(current))
-        for neighbor in neighbors:
-            if neighbor not in visited:
-                new_path = path + [neighbor]
-                
-                if neighbor == goal:
-                    return new_path
-                
-                visited.add(neighbor)
-                queue.append((neighbor, new_path))
+    parents = bfs_parents(csr, start_id, (goal_id,), stats=stats)
+    if stats is not None:
+        stats.lap("search")
+    
+    return _path_from_parents(csr, parents, goal_id)
+
+@instrumented("bfs_paths")
+def bfs_paths(graph, start, goals, *, stats=None):
+    """
+    Найкоротші шляхи від start до кількох цілей одним обходом BFS
     
+    Args:
+        graph: NetworkX граф або CSRGraph
+        start: початкова вершина
+        goals: цільові вершини
+        stats: SearchStats для лічильників пошуку (None - без них)
+    
+    Returns:
+        Словник {ціль: найкоротший шлях або None}
+    """
+    csr = as_csr(graph)
+    start_id = csr.node_id(start)
+    goal_ids = [csr.node_id(goal) for goal in goals]
+    if stats is not None:
+        stats.lap("prepare")
+    
+    parents = bfs_parents(csr, start_id, goal_ids, stats=stats)
+    if stats is not None:
+        stats.lap("search")
+    
+    return {goal: _path_from_parents(csr, parents, goal_id) for goal, goal_id in zip(goals, goal_ids)}
+
+@instrumented("bfs_tree")
+def bfs_tree(graph, start, *, stats=None):
+    """
+    Повне дерево BFS від start
+    
+    Args:
+        graph: NetworkX граф або CSRGraph
+        start: початкова вершина
+        stats: SearchStats для лічильників пошуку (None - без них)
+    
+    Returns:
+        Словник {вершина: батько} для всіх досяжних вершин
+        (у start батько None) - як previous у алгоритмі Дейкстри
+    """
+    csr = as_csr(graph)
+    start_id = csr.node_id(start)
+    if stats is not None:
+        stats.lap("prepare")
+    
+    parents = bfs_parents(csr, start_id, stats=stats)
+    if stats is not None:
+        stats.lap("search")
+    
+    return {csr.node_name(node_id): (csr.node_name(parent) if node_id != parent else None)
+            for node_id, parent in enumerate(parents) if parent >= 0}
+
+@instrumented("bfs_path_bidirectional")
+def bfs_path_bidirectional(graph, start, goal, *, stats=None):
+    """
+    Двонаправлений BFS для пошуку шляху з найменшою кількістю пересадок
+    
+    Пошук іде рівнями одночасно від start і від goal, щоразу
+    розширюючи менший фронт. Коли фронти зустрічаються, рівень
+    дообробляється до кінця і вибирається зустріч з найменшою сумою
+    глибин. При розгалуженні b та глибині d відвідує порядку 2·b^(d/2)
+    вершин замість b^d.
+    
+    Як і shortest_route, виграє лише на вже скомпільованому графі:
+    CSRGraph або VersionedGraph, а не звичайному nx.Graph.
+    
+    Args:
+        graph: CSRGraph, VersionedGraph або NetworkX граф
+        start: початкова вершина
+        goal: цільова вершина
+        stats: SearchStats для лічильників пошуку (None - без них)
+    
+    Returns:
+        Найкоротший шлях або None
+    """
+    if start == goal:
+        return [start]
+    
+    csr = as_csr(graph)
+    offsets, targets = csr.offsets, csr.targets
+    start_id, goal_id = csr.node_id(start), csr.node_id(goal)
+    
+    # Для кожного напрямку в робочих масивах графа: глибина та батько вершини
+    scratch = csr.scratch()
+    depths, parents, touched = scratch.distances, scratch.previous, scratch.touched
+    depths[0][start_id] = depths[1][goal_id] = 0
+    touched[0].append(start_id)
+    touched[1].append(goal_id)
+    infinity = float('infinity')
+    
+    frontiers = ([start_id], [goal_id])
+    if stats is not None:
+        stats.lap("prepare")
+        stats.pushed(1)
+        stats.pushed(2)
+    
+    try:
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            own, other = depths[side], depths[1 - side]
+            own_parents, reached = parents[side], touched[side]
+            
+            next_frontier = []
+            meeting = None
+            best_length = None
+            
+            for current in frontiers[side]:
+                depth = own[current] + 1
+                if stats is not None:
+                    stats.pops += 1
+                    stats.expanded(offsets[current + 1] - offsets[current])
+                for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                    if own[neighbor] != infinity:
+                        continue
+                    own[neighbor] = depth
+                    own_parents[neighbor] = current
+                    reached.append(neighbor)
+                    next_frontier.append(neighbor)
+                    if stats is not None:
+                        stats.relaxed(len(next_frontier) + len(frontiers[1 - side]))
+                    
+                    if other[neighbor] != infinity:
+                        length = depth + other[neighbor]
+                        if best_length is None or length < best_length:
+                            best_length = length
+                            meeting = neighbor
+            
+            if meeting is not None:
+                if stats is not None:
+                    stats.lap("search")
+                return _join_bidirectional_path(csr, parents, meeting)
+            
+            frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+    finally:
+        scratch.release()
+    
+    if stats is not None:
+        stats.lap("search")
     return None
 
+def _join_bidirectional_path(csr, parents, meeting):
+    """Склеює шлях start → meeting → goal з двох масивів батьків (-1 - корінь)"""
+    forward, backward = parents
+    
+    path = []
+    node_id = meeting
+    while node_id != -1:
+        path.append(node_id)
+        node_id = forward[node_id]
+    path.reverse()
+    
+    node_id = backward[meeting]
+    while node_id != -1:
+        path.append(node_id)
+        node_id = backward[node_id]
+    
+    return [csr.node_name(node_id) for node_id in path]
+
+def _restricted_shortest_path(csr, start_id, goal_id, blocked_nodes, blocked_edges, weighted, stats=None):
+    """
+    Дейкстра від start_id до goal_id в обхід заборонених вершин і ребер
+    
+    Returns:
+        (cost, path): довжина та шлях у номерах вершин, або (None, None)
+    """
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    infinity = float('infinity')
+    scratch = csr.scratch()
+    distances, previous = scratch.distances[0], scratch.previous[0]
+    settled, touched = scratch.settled[0], scratch.touched[0]
+    distances[start_id] = 0
+    touched.append(start_id)
+    heap = [(0, start_id)]
+    if stats is not None:
+        stats.pushed(1)
+    
+    try:
+        while heap:
+            distance, current = heapq.heappop(heap)
+            if stats is not None:
+                stats.pops += 1
+            if settled[current]:
+                continue
+            settled[current] = 1
+            if stats is not None:
+                stats.expanded(offsets[current + 1] - offsets[current])
+            
+            if current == goal_id:
+                path = []
+                while current != -1:
+                    path.append(current)
+                    current = previous[current]
+                return distance, path[::-1]
+            
+            for edge in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[edge]
+                if neighbor in blocked_nodes or (current, neighbor) in blocked_edges:
+                    continue
+                new_distance = distance + (weights[edge] if weighted else 1)
+                old_distance = distances[neighbor]
+                if new_distance < old_distance:
+                    if old_distance == infinity:
+                        touched.append(neighbor)
+                    distances[neighbor] = new_distance
+                    previous[neighbor] = current
+                    heapq.heappush(heap, (new_distance, neighbor))
+                    if stats is not None:
+                        stats.relaxed(len(heap))
+    finally:
+        scratch.release()
+    
+    return None, None
+
+@instrumented("k_shortest_paths")
+def k_shortest_paths(graph, start, goal, k=None, max_hops=None, max_detour=None, weight=None, *,
+                     stats=None):
+    """
+    Найкоротші прості шляхи в порядку зростання довжини (алгоритм Єна)
+    
+    Генератор лінивий: кожен наступний шлях рахується лише тоді, коли
+    його запитали, тож зупинитися після кількох найкращих - дешево.
+    
+    Args:
+        graph: NetworkX граф або CSRGraph
+        start: початкова вершина
+        goal: цільова вершина
+        k: максимальна кількість шляхів (None - без обмеження)
+        max_hops: пропускати шляхи з більшою кількістю пересадок
+        max_detour: зупинитися, коли шлях довший за найкоротший більш
+            ніж у max_detour разів
+        weight: назва атрибута ваги; None - довжина в пересадках
+        stats: SearchStats для лічильників усіх внутрішніх пошуків
+            Дейкстри (None - без них)
+    
+    Returns:
+        Генератор шляхів (списків вершин)
+    """
+    csr = as_csr(graph, weight=weight or 'weight')
+    weighted = weight is not None
+    start_id, goal_id = csr.node_id(start), csr.node_id(goal)
+    if stats is not None:
+        stats.lap("prepare")
+    
+    cost, path = _restricted_shortest_path(csr, start_id, goal_id, set(), set(), weighted, stats)
+    if path is None:
+        return
+    
+    shortest_cost = cost
+    accepted = []
+    candidates = [(cost, tuple(path))]
+    seen = {tuple(path)}
+    emitted = 0
+    
+    while candidates and (k is None or emitted < k):
+        cost, path = heapq.heappop(candidates)
+        
+        if max_detour is not None and cost > shortest_cost * max_detour:
+            return
+        # Без ваг довжина дорівнює кількості пересадок - далі лише довші
+        if max_hops is not None and len(path) - 1 > max_hops and not weighted:
+            return
+        
+        accepted.append(path)
+        if max_hops is None or len(path) - 1 <= max_hops:
+            emitted += 1
+            if stats is not None:
+                stats.lap("search")
+            yield [csr.node_name(node_id) for node_id in path]
+        
+        # Відгалуження від кожної вершини щойно прийнятого шляху
+        for i in range(len(path) - 1):
+            spur = path[i]
+            root = path[:i + 1]
+            root_cost = _path_cost(csr, root, weighted)
+            
+            blocked_edges = {(other[i], other[i + 1]) for other in accepted
+                             if len(other) > i + 1 and other[:i + 1] == root}
+            blocked_nodes = set(root[:-1])
+            
+            spur_cost, spur_path = _restricted_shortest_path(csr, spur, goal_id, blocked_nodes,
+                                                             blocked_edges, weighted, stats)
+            if spur_path is None:
+                continue
+            
+            candidate = root[:-1] + tuple(spur_path)
+            if candidate not in seen:
+                seen.add(candidate)
+                heapq.heappush(candidates, (root_cost + spur_cost, candidate))
+
+def _path_cost(csr, path, weighted):
+    """Довжина шляху в номерах вершин"""
+    if not weighted:
+        return len(path) - 1
+    
+    cost = 0
+    for u, v in zip(path, path[1:]):
+        start, end = csr.offsets[u], csr.offsets[u + 1]
+        cost += min(w for t, w in zip(csr.targets[start:end], csr.weights[start:end]) if t == v)
+    return cost
+
 def compare_algorithms(graph, test_routes):
     """Порівнює результати DFS та BFS для різних маршрутів"""
     print("\n🆚 ПОРІВНЯННЯ АЛГОРИТМІВ DFS ТА BFS:")
@@ -130,18 +596,21 @@ def compare_algorithms(graph, test_routes):
     
     results = []
     
+    # Компілюємо граф один раз для всіх пошуків
+    csr = as_csr(graph)
+    
     for i, (start, goal) in enumerate(test_routes, 1):
         print(f"\n{i}. МАРШРУТ: {start} → {goal}")
         print("-" * 40)
         
         # DFS - знаходимо один шлях
-        dfs_path = dfs_path_single(graph, start, goal)
+        dfs_path = dfs_path_single(csr, start, goal)
         
         # BFS - знаходимо найкоротший шлях
-        bfs_shortest = bfs_path(graph, start, goal)
+        bfs_shortest = bfs_path(csr, start, goal)
         
-        # DFS - знаходимо всі можливі шляхи (обмежуємо кількість)
-        all_dfs_paths = list(dfs_paths(graph, start, goal))
+        # Найкоротші альтернативи - без перебору всіх простих шляхів
+        alternatives = list(k_shortest_paths(csr, start, goal, k=3))
         
         print(f"DFS (перший знайдений): {' → '.join(dfs_path) if dfs_path else 'Шлях не знайдено'}")
         if dfs_path:
@@ -151,13 +620,10 @@ def compare_algorithms(graph, test_routes):
         if bfs_shortest:
             print(f"  Довжина: {len(bfs_shortest)} районів ({len(bfs_shortest)-1} пересадок)")
         
-        print(f"\\nВсього можливих шляхів (DFS): {len(all_dfs_paths)}")
-        if len(all_dfs_paths) > 1:
-            print("Альтернативні шляхи:")
-            for j, path in enumerate(all_dfs_paths[:3], 1):  # Показуємо лише перші 3
+        if len(alternatives) > 1:
+            print("\\nНайкоротші альтернативні шляхи:")
+            for j, path in enumerate(alternatives, 1):
                 print(f"  {j}. {' → '.join(path)} ({len(path)-1} пересадок)")
-            if len(all_dfs_paths) > 3:
-                print(f"  ... та ще {len(all_dfs_paths)-3} шляхів")
         
         # Аналіз різниці
         if dfs_path and bfs_shortest:
@@ -174,7 +640,7 @@ def compare_algorithms(graph, test_routes):
             'route': (start, goal),
             'dfs_path': dfs_path,
             'bfs_path': bfs_shortest,
-            'all_paths_count': len(all_dfs_paths)
+            'alternatives': alternatives
         })
     
     return results
@@ -214,14 +680,25 @@ def explain_differences():
     print(f"  - DFS: Перевірка зв'язності, пошук циклів, топологічне сортування")
     print(f"  - BFS: Найкоротший шлях, рівневий обхід, пошук найближчого")
 
-def visualize_paths(graph, results):
-    """Візуалізує знайдені шляхи"""
+def visualize_paths(graph, results, output=None, pos=None):
+    """
+    Візуалізує знайдені шляхи
+    
+    Args:
+        output: шлях до файлу (.png, .svg) - записати без вікна (Agg);
+            None - показати у вікні
+        pos: готова розкладка вершин (за замовчуванням - з кешу розкладок)
+    """
+    # matplotlib завантажується лише при малюванні
+    import networkx as nx
+    from rendering import cached_layout, finish_figure, new_figure
+    
     print(f"\\n🎨 ВІЗУАЛІЗАЦІЯ ЗНАЙДЕНИХ ШЛЯХІВ:")
     
-    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    fig, axes = new_figure(output, figsize=(16, 12))
     fig.suptitle('Порівняння алгоритмів DFS та BFS: знайдені шляхи', fontsize=16, fontweight='bold')
     
-    pos = nx.spring_layout(graph, seed=42, k=3, iterations=50)
+    pos = pos or cached_layout(graph)
     
     # Вибираємо два найцікавіші маршрути для візуалізації
     for idx, result in enumerate(results[:2]):
@@ -271,11 +748,13 @@ def visualize_paths(graph, results):
         ax_bfs.set_title(f'BFS шлях: {start} → {goal}\\n{" → ".join(bfs_path) if bfs_path else "Шлях не знайдено"}', 
                         fontweight='bold')
     
-    plt.tight_layout()
-    plt.show()
+    finish_figure(fig, output)
 
 # Основна програма
 if __name__ == "__main__":
+    print("🔍 ЗАВДАННЯ 2: АЛГОРИТМИ DFS ТА BFS")
+    print("=" * 50)
+    
     # Створюємо граф
     G = create_city_transport_graph()
     
@@ -296,8 +775,4 @@ if __name__ == "__main__":
     explain_differences()
     
     # Візуалізуємо результати
-    visualize_paths(G, results)
-    
-    # Збереження для завдання 3
-    globals()['city_graph'] = G
-    globals()['test_results'] = results
\ No newline at end of file
+    visualize_paths(G, results)
\ No newline at end of file
@@ -1,15 +1,18 @@
-import networkx as nx
-import matplotlib.pyplot as plt
 import heapq
-import numpy as np
+from array import array
 from collections import defaultdict
-
-print("🛣️ ЗАВДАННЯ 3: АЛГОРИТМ ДЕЙКСТРИ")
-print("=" * 50)
+from statistics import mean
+from csr_graph import as_csr
+from reports import write_records
+from search_stats import instrumented
 
 def create_weighted_city_graph():
     """Створює зважений граф транспортної мережі з часом проїзду"""
-    G = nx.Graph()
+    # networkx потрібен лише для побудови графа, а не для пошуку;
+    # VersionedGraph компілюється в CSR один раз на версію
+    from route_cache import VersionedGraph
+    
+    G = VersionedGraph()
     
     # Додаємо райони
     districts = [
@@ -67,66 +70,161 @@ def create_weighted_city_graph():
     
     return G, weighted_routes
 
-def dijkstra_manual(graph, start):
+@instrumented("dijkstra_manual")
+def dijkstra_manual(graph, start, verbose=False, *, stats=None):
     """
-    Ручна реалізація алгоритму Дейкстри
+    Ручна реалізація алгоритму Дейкстри на бінарній купі
+    
+    Наступна вершина береться з купи (heapq) за O(log V) замість
+    лінійного пошуку мінімуму, застарілі записи купи пропускаються
+    (ліниве видалення). Пошук іде по CSR-масивах, а результат
+    перекладається у словники за назвами вершин лише в кінці.
+    Покроковий вивід вмикається параметром verbose.
     
     Args:
-        graph: NetworkX граф з вагами
+        graph: NetworkX граф з вагами або CSRGraph
         start: початкова вершина
+        verbose: друкувати покроковий хід алгоритму
+        stats: SearchStats для лічильників пошуку (None - без них)
     
     Returns:
         distances: словник відстаней до всіх вершин
         previous: словник попередніх вершин для відновлення шляху
     """
-    # Ініціалізація
-    distances = {node: float('infinity') for node in graph.nodes()}
-    distances[start] = 0
-    previous = {node: None for node in graph.nodes()}
-    unvisited = set(graph.nodes())
+    csr = as_csr(graph)
+    names = csr.nodes
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    infinity = float('infinity')
     
-    print(f"\\n🔄 АЛГОРИТМ ДЕЙКСТРИ: крок за кроком від {start}")
-    print("-" * 60)
+    # Ініціалізація
+    start_id = csr.node_id(start)
+    distances = [infinity] * len(csr)
+    distances[start_id] = 0
+    previous = array('i', [-1]) * len(csr)
+    visited = bytearray(len(csr))
+    heap = [(0, start_id)]
+    if stats is not None:
+        stats.lap("prepare")
+        stats.pushed(1)
+    
+    if verbose:
+        print(f"\\n🔄 АЛГОРИТМ ДЕЙКСТРИ: крок за кроком від {start}")
+        print("-" * 60)
     step = 0
     
-    while unvisited:
-        step += 1
-        
-        # Знаходимо вершину з найменшою відстанню
-        current = min(unvisited, key=lambda node: distances[node])
+    while heap:
+        # Беремо вершину з найменшою відстанню
+        current_distance, current = heapq.heappop(heap)
+        if stats is not None:
+            stats.pops += 1
         
-        # Якщо відстань нескінченна, припиняємо
-        if distances[current] == float('infinity'):
-            break
+        # Застарілий запис - вершину вже оброблено з меншою відстанню
+        if visited[current]:
+            continue
+        visited[current] = 1
+        step += 1
+        if stats is not None:
+            stats.expanded(offsets[current + 1] - offsets[current])
         
-        print(f"\\nКрок {step}: Обробляємо {current} (відстань: {distances[current]} хв)")
+        if verbose:
+            print(f"\\nКрок {step}: Обробляємо {names[current]} (відстань: {current_distance} хв)")
         
         # Оновлюємо відстані до сусідів
-        for neighbor in graph.neighbors(current):
-            if neighbor in unvisited:
-                weight = graph[current][neighbor]['weight']
-                new_distance = distances[current] + weight
-                
-                if new_distance < distances[neighbor]:
-                    old_distance = distances[neighbor] if distances[neighbor] != float('infinity') else "∞"
-                    distances[neighbor] = new_distance
-                    previous[neighbor] = current
-                    print(f"  Оновлено {neighbor}: {old_distance} → {new_distance} хв (через {current})")
-                else:
-                    print(f"  {neighbor}: {new_distance} ≥ {distances[neighbor]} хв (не оновлюємо)")
-        
-        # Видаляємо поточну вершину з непереглянутих
-        unvisited.remove(current)
+        for edge in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[edge]
+            if visited[neighbor]:
+                continue
+            
+            new_distance = current_distance + weights[edge]
+            
+            if new_distance < distances[neighbor]:
+                if verbose:
+                    old_distance = distances[neighbor] if distances[neighbor] != infinity else "∞"
+                    print(f"  Оновлено {names[neighbor]}: {old_distance} → {new_distance} хв (через {names[current]})")
+                distances[neighbor] = new_distance
+                previous[neighbor] = current
+                heapq.heappush(heap, (new_distance, neighbor))
+                if stats is not None:
+                    stats.relaxed(len(heap))
+            elif verbose:
+                print(f"  {names[neighbor]}: {new_distance} ≥ {distances[neighbor]} хв (не оновлюємо)")
         
         # Показуємо поточний стан (тільки для перших кроків)
-        if step <= 3:
+        if verbose and step <= 3:
             print("  Поточні відстані:", end="")
-            for node in sorted(graph.nodes()):
-                dist = distances[node] if distances[node] != float('infinity') else "∞"
-                visited_mark = "✓" if node not in unvisited else ""
+            for node_id, node in enumerate(names):
+                dist = distances[node_id] if distances[node_id] != infinity else "∞"
+                visited_mark = "✓" if visited[node_id] else ""
                 print(f" {node}:{dist}{visited_mark}", end="")
             print()
     
+    if stats is not None:
+        stats.lap("search")
+    
+    # Перекладаємо масиви у словники за назвами вершин
+    distances = dict(zip(names, distances))
+    previous = {node: (names[prev] if prev >= 0 else None) for node, prev in zip(names, previous)}
+    
+    return distances, previous
+
+@instrumented("dijkstra_arrays")
+def dijkstra_arrays(csr, start_id, target_ids=(), *, stats=None):
+    """
+    Дейкстра в номерах вершин CSR без перекладу в назви
+    
+    Args:
+        csr: CSRGraph
+        start_id: номер початкової вершини
+        target_ids: номери цілей; якщо задано - пошук зупиняється,
+            щойно всі цілі оброблено
+        stats: SearchStats для лічильників пошуку (None - без них)
+    
+    Returns:
+        distances: список відстаней (infinity - не досягнута)
+        previous: array('i') попередників (-1 - немає)
+    """
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    infinity = float('infinity')
+    
+    distances = [infinity] * len(csr)
+    distances[start_id] = 0
+    previous = array('i', [-1]) * len(csr)
+    visited = bytearray(len(csr))
+    heap = [(0, start_id)]
+    
+    remaining = set(target_ids)
+    stop_early = bool(remaining)
+    if stats is not None:
+        stats.lap("prepare")
+        stats.pushed(1)
+    
+    while heap:
+        current_distance, current = heapq.heappop(heap)
+        if stats is not None:
+            stats.pops += 1
+        if visited[current]:
+            continue
+        visited[current] = 1
+        
+        if stop_early:
+            remaining.discard(current)
+            if not remaining:
+                break
+        
+        if stats is not None:
+            stats.expanded(offsets[current + 1] - offsets[current])
+        for edge in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[edge]
+            new_distance = current_distance + weights[edge]
+            if new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                previous[neighbor] = current
+                heapq.heappush(heap, (new_distance, neighbor))
+                if stats is not None:
+                    stats.relaxed(len(heap))
+    
+    if stats is not None:
+        stats.lap("search")
     return distances, previous
 
 def reconstruct_path(previous, start, end):
@@ -146,15 +244,129 @@ def reconstruct_path(previous, start, end):
     else:
         return None
 
-def compare_with_networkx(graph, start):
+@instrumented("shortest_route")
+def shortest_route(graph, start, goal, *, stats=None):
+    """
+    Двонаправлений алгоритм Дейкстри для одного запиту "звідки-куди"
+    
+    Пошук іде одночасно від start (вперед) і від goal (назад), щоразу
+    розширюючи фронт з меншою поточною відстанню. Зупиняється, щойно
+    сума мінімумів обох куп не менша за найкращий знайдений шлях,
+    тож зазвичай обробляє лише частину графа. Граф вважається
+    неорієнтованим (як транспортна мережа), тому зворотний пошук
+    використовує ті самі ребра.
+    
+    Ранню зупинку видно лише тоді, коли граф не компілюється заново
+    на кожен запит: передавайте CSRGraph або VersionedGraph (його CSR
+    кешується до наступної зміни), а не звичайний nx.Graph.
+    
+    Args:
+        graph: CSRGraph, VersionedGraph або NetworkX граф з вагами
+        start: початкова вершина
+        goal: цільова вершина
+        stats: SearchStats для лічильників пошуку (None - без них)
+    
+    Returns:
+        (path, minutes): найкоротший шлях та його довжина,
+        або (None, infinity), якщо шляху не існує
+    """
+    if start == goal:
+        return [start], 0
+    
+    csr = as_csr(graph)
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    infinity = float('infinity')
+    start_id, goal_id = csr.node_id(start), csr.node_id(goal)
+    
+    # Стан обох напрямків (0 - від start, 1 - від goal) у робочих масивах графа
+    scratch = csr.scratch()
+    distances, previous, settled, touched = (scratch.distances, scratch.previous,
+                                             scratch.settled, scratch.touched)
+    distances[0][start_id] = distances[1][goal_id] = 0
+    touched[0].append(start_id)
+    touched[1].append(goal_id)
+    heaps = ([(0, start_id)], [(0, goal_id)])
+    
+    best = infinity
+    meeting = None
+    if stats is not None:
+        stats.lap("prepare")
+        stats.pushed(1)
+        stats.pushed(2)
+    
+    try:
+        while heaps[0] and heaps[1]:
+            # Жоден шлях через ще не оброблені вершини не буде коротшим
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+            
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            dist, prev, done, heap = distances[side], previous[side], settled[side], heaps[side]
+            other_dist, reached = distances[1 - side], touched[side]
+            
+            current_distance, current = heapq.heappop(heap)
+            if stats is not None:
+                stats.pops += 1
+            if done[current]:
+                continue
+            done[current] = 1
+            if stats is not None:
+                stats.expanded(offsets[current + 1] - offsets[current])
+            
+            for edge in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[edge]
+                new_distance = current_distance + weights[edge]
+                
+                old_distance = dist[neighbor]
+                if new_distance < old_distance:
+                    if old_distance == infinity:
+                        reached.append(neighbor)
+                    dist[neighbor] = new_distance
+                    prev[neighbor] = current
+                    heapq.heappush(heap, (new_distance, neighbor))
+                    if stats is not None:
+                        stats.relaxed(len(heaps[0]) + len(heaps[1]))
+                
+                # Фронти зустрілися на цьому ребрі (для недосягнутих - infinity)
+                total = new_distance + other_dist[neighbor]
+                if total < best:
+                    best = total
+                    meeting = (current, neighbor) if side == 0 else (neighbor, current)
+        
+        if stats is not None:
+            stats.lap("search")
+        
+        if meeting is None:
+            return None, infinity
+        
+        # Склеюємо шлях: start → ... → forward_node, backward_node → ... → goal
+        forward_node, backward_node = meeting
+        path = []
+        node_id = forward_node
+        while node_id != -1:
+            path.append(node_id)
+            node_id = previous[0][node_id]
+        path.reverse()
+        node_id = backward_node
+        while node_id != -1:
+            path.append(node_id)
+            node_id = previous[1][node_id]
+    finally:
+        scratch.release()
+    
+    return [csr.node_name(node_id) for node_id in path], best
+
+def compare_with_networkx(graph, start, verbose=False):
     """Порівнює власну реалізацію з NetworkX"""
     print(f"\\n🔍 ПОРІВНЯННЯ З NETWORKX:")
     print("-" * 40)
     
     # Власна реалізація
-    manual_distances, manual_previous = dijkstra_manual(graph, start)
+    manual_distances, manual_previous = dijkstra_manual(graph, start, verbose=verbose)
     
     # NetworkX реалізація
+    import networkx as nx
+    
     nx_distances = nx.single_source_dijkstra_path_length(graph, start, weight='weight')
     nx_paths = nx.single_source_dijkstra_path(graph, start, weight='weight')
     
@@ -182,37 +394,96 @@ def compare_with_networkx(graph, start):
     
     return manual_distances, manual_previous, nx_distances, nx_paths
 
-def analyze_shortest_paths(graph, distances, previous, nx_paths, start_node):
-    """Аналізує найкоротші шляхи"""
-    print(f"\\n📊 АНАЛІЗ НАЙКОРОТШИХ ШЛЯХІВ ВІД {start_node}:")
-    print("=" * 60)
+def shortest_path_rows(distances, previous, start_node):
+    """
+    Рядки звіту найкоротших шляхів у порядку зростання часу
     
-    # Сортуємо за відстанню
-    sorted_distances = sorted(distances.items(), key=lambda x: x[1])
+    Шлях кожного рядка відновлюється лише тоді, коли рядок запитали.
     
-    print(f"{'Пункт призначення':<20} {'Час (хв)':<10} {'Найкоротший шлях':<30}")
-    print("-" * 70)
+    Args:
+        distances, previous: результат dijkstra_manual
+        start_node: початкова вершина
     
-    for destination, distance in sorted_distances:
-        if destination != start_node and distance != float('infinity'):
-            # Відновлюємо шлях
-            path = reconstruct_path(previous, start_node, destination)
-            if path:
-                path_str = " → ".join(path)
-                print(f"{destination:<20} {distance:<10} {path_str:<30}")
+    Returns:
+        Генератор словників start, destination, minutes, transfers, path
+    """
+    reachable = [(destination, distance) for destination, distance in distances.items()
+                 if destination != start_node and distance != float('infinity')]
+    reachable.sort(key=lambda x: x[1])
+    
+    for destination, distance in reachable:
+        path = reconstruct_path(previous, start_node, destination)
+        if path:
+            yield {"start": start_node, "destination": destination, "minutes": distance,
+                   "transfers": len(path) - 1, "path": path}
+
+def shortest_path_summary(distances, start_node):
+    """
+    Підсумок найкоротших шляхів: найближчий, найдальший, середній час
     
-    # Найближчі та найдальші пункти
+    Returns:
+        Словник start, reachable, closest, closest_minutes, farthest,
+        farthest_minutes, mean_minutes (None, якщо нічого не досяжно)
+    """
     accessible_destinations = [(dest, dist) for dest, dist in distances.items() 
                               if dest != start_node and dist != float('infinity')]
+    summary = {"start": start_node, "reachable": len(accessible_destinations),
+               "closest": None, "closest_minutes": None,
+               "farthest": None, "farthest_minutes": None, "mean_minutes": None}
     
     if accessible_destinations:
         closest = min(accessible_destinations, key=lambda x: x[1])
         farthest = max(accessible_destinations, key=lambda x: x[1])
-        
+        summary.update(closest=closest[0], closest_minutes=closest[1],
+                       farthest=farthest[0], farthest_minutes=farthest[1],
+                       mean_minutes=mean([dist for _, dist in accessible_destinations]))
+    
+    return summary
+
+def print_shortest_paths(rows, summary):
+    """Друкує рядки shortest_path_rows та підсумок у консоль"""
+    print(f"\\n📊 АНАЛІЗ НАЙКОРОТШИХ ШЛЯХІВ ВІД {summary['start']}:")
+    print("=" * 60)
+    
+    print(f"{'Пункт призначення':<20} {'Час (хв)':<10} {'Найкоротший шлях':<30}")
+    print("-" * 70)
+    
+    for row in rows:
+        path_str = " → ".join(row["path"])
+        print(f"{row['destination']:<20} {row['minutes']:<10} {path_str:<30}")
+    
+    if summary["reachable"]:
         print(f"\\n🎯 СТАТИСТИКА:")
-        print(f"Найближчий пункт: {closest[0]} ({closest[1]} хв)")
-        print(f"Найдальший пункт: {farthest[0]} ({farthest[1]} хв)")
-        print(f"Середній час поїздки: {np.mean([dist for _, dist in accessible_destinations]):.1f} хв")
+        print(f"Найближчий пункт: {summary['closest']} ({summary['closest_minutes']} хв)")
+        print(f"Найдальший пункт: {summary['farthest']} ({summary['farthest_minutes']} хв)")
+        print(f"Середній час поїздки: {summary['mean_minutes']:.1f} хв")
+
+def analyze_shortest_paths(graph, distances, previous, nx_paths, start_node,
+                           output=None, fmt="jsonl", verbose=True):
+    """
+    Аналізує найкоротші шляхи
+    
+    Args:
+        graph: зважений граф
+        distances, previous: результат dijkstra_manual
+        nx_paths: шляхи networkx (для сумісності з compare_with_networkx)
+        start_node: початкова вершина
+        output: відкритий текстовий файл для потокового запису рядків
+            shortest_path_rows; None - не записувати
+        fmt: формат запису - 'jsonl' або 'csv'
+        verbose: друкувати таблицю та підсумок у консоль
+    
+    Returns:
+        Підсумок, як у shortest_path_summary
+    """
+    summary = shortest_path_summary(distances, start_node)
+    
+    if output is not None:
+        write_records(shortest_path_rows(distances, previous, start_node), output, fmt)
+    if verbose:
+        print_shortest_paths(shortest_path_rows(distances, previous, start_node), summary)
+    
+    return summary
 
 def create_shortest_path_tree(graph, start, previous):
     """Створює дерево найкоротших шляхів"""
@@ -221,6 +492,8 @@ def create_shortest_path_tree(graph, start, previous):
         if prev_node is not None:
             tree_edges.append((prev_node, node))
     
+    import networkx as nx
+    
     tree = nx.Graph()
     tree.add_edges_from(tree_edges)
     
@@ -231,14 +504,26 @@ def create_shortest_path_tree(graph, start, previous):
     
     return tree
 
-def visualize_dijkstra_results(graph, start, distances, previous, nx_paths):
-    """Візуалізує результати алгоритму Дейкстри"""
+def visualize_dijkstra_results(graph, start, distances, previous, nx_paths, output=None, pos=None):
+    """
+    Візуалізує результати алгоритму Дейкстри
+    
+    Args:
+        output: шлях до файлу (.png, .svg) - записати без вікна (Agg);
+            None - показати у вікні
+        pos: готова розкладка вершин (за замовчуванням - з кешу розкладок)
+    """
+    # matplotlib завантажується лише при малюванні
+    import matplotlib
+    import networkx as nx
+    from rendering import cached_layout, finish_figure, new_figure
+    
     print(f"\\n🎨 ВІЗУАЛІЗАЦІЯ РЕЗУЛЬТАТІВ:")
     
-    fig, axes = plt.subplots(2, 2, figsize=(18, 14))
+    fig, axes = new_figure(output, figsize=(18, 14))
     fig.suptitle(f'Алгоритм Дейкстри: найкоротші шляхи від {start}', fontsize=16, fontweight='bold')
     
-    pos = nx.spring_layout(graph, seed=42, k=3, iterations=50)
+    pos = pos or cached_layout(graph)
     
     # График 1: Вихідний зважений граф
     nx.draw(graph, pos, ax=axes[0,0], with_labels=True, node_color='lightblue',
@@ -281,7 +566,7 @@ def visualize_dijkstra_results(graph, start, distances, previous, nx_paths):
             # Інвертуємо: чим ближче, тим більше
             normalized_dist = 1 - (distances[node] / max_distance)
             size = 300 + normalized_dist * 1200
-            color = plt.cm.get_cmap('RdYlGn')(normalized_dist)
+            color = matplotlib.colormaps['RdYlGn'](normalized_dist)
         
         node_sizes.append(size)
         node_colors.append(color)
@@ -315,8 +600,7 @@ def visualize_dijkstra_results(graph, start, distances, previous, nx_paths):
     
     axes[1,1].set_title(f'Приклади найкоротших шляхів\\n(різні кольори = різні маршрути)', fontweight='bold')
     
-    plt.tight_layout()
-    plt.show()
+    finish_figure(fig, output)
 
 def practical_applications():
     """Розповідає про практичні застосування"""
@@ -339,6 +623,9 @@ def practical_applications():
 
 # Основна програма
 if __name__ == "__main__":
+    print("🛣️ ЗАВДАННЯ 3: АЛГОРИТМ ДЕЙКСТРИ")
+    print("=" * 50)
+    
     # Створюємо зважений граф
     G, weighted_routes = create_weighted_city_graph()
     
@@ -349,11 +636,15 @@ if __name__ == "__main__":
     start_point = "Центр"
     
     # Реалізуємо алгоритм Дейкстри та порівнюємо з NetworkX
-    distances, previous, nx_distances, nx_paths = compare_with_networkx(G, start_point)
+    distances, previous, nx_distances, nx_paths = compare_with_networkx(G, start_point, verbose=True)
     
     # Аналізуємо результати
     analyze_shortest_paths(G, distances, previous, nx_paths, start_point)
     
+    # Точковий запит двонаправленим пошуком
+    route, minutes = shortest_route(G, "Парк", "Аеропорт")
+    print(f"\n🎯 Точковий запит Парк → Аеропорт: {' → '.join(route)} ({minutes} хв)")
+    
     # Візуалізуємо результати
     visualize_dijkstra_results(G, start_point, distances, previous, nx_paths)
     
@@ -364,5 +655,5 @@ if __name__ == "__main__":
     accessible_count = sum(1 for d in distances.values() if d != float('infinity')) - 1
     print(f"\\n📈 ФІНАЛЬНА СТАТИСТИКА:")
     print(f"• Доступних районів з {start_point}: {accessible_count}")
-    print(f"• Середній час поїздки: {np.mean([d for d in distances.values() if d != float('infinity') and d > 0]):.1f} хв")
+    print(f"• Середній час поїздки: {mean([d for d in distances.values() if d != float('infinity') and d > 0]):.1f} хв")
     print(f"• Найдовший маршрут: {max([d for d in distances.values() if d != float('infinity')]):.0f} хв")
\ No newline at end of file
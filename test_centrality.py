@@ -0,0 +1,49 @@
+import networkx as nx
+import pytest
+
+import centrality
+from centrality import approximate_betweenness, brandes_centrality
+
+
+def _random_graph(seed, directed=False):
+    G = nx.gnp_random_graph(30, 0.12, seed=seed, directed=directed)
+    for index, (u, v) in enumerate(G.edges()):
+        G[u][v]["weight"] = 1 + (index * 5 + seed) % 6
+    return G
+
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("weight", [None, "weight"])
+@pytest.mark.parametrize("seed", range(3))
+def test_brandes_matches_networkx(seed, weight, directed):
+    G = _random_graph(seed, directed)
+    betweenness, closeness = brandes_centrality(G, weight=weight, workers=1)
+    assert betweenness == pytest.approx(nx.betweenness_centrality(G, weight=weight))
+    if not directed:
+        assert closeness == pytest.approx(nx.closeness_centrality(G, distance=weight))
+
+
+def test_approximate_within_epsilon():
+    G = nx.connected_watts_strogatz_graph(300, 6, 0.1, seed=2)
+    exact = nx.betweenness_centrality(G)
+    for adaptive in (False, True):
+        estimate, samples = approximate_betweenness(G, epsilon=0.05, adaptive=adaptive,
+                                                    seed=1, workers=1)
+        assert samples <= len(G)
+        assert max(abs(estimate[node] - exact[node]) for node in G) <= 0.05
+
+
+def test_adaptive_run_uses_one_pool(monkeypatch):
+    pools = []
+
+    class CountingPool(centrality.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            pools.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(centrality, "ProcessPoolExecutor", CountingPool)
+    G = nx.connected_watts_strogatz_graph(centrality._PARALLEL_MIN_NODES, 4, 0.1, seed=3)
+    _, samples = approximate_betweenness(G, epsilon=0.2, adaptive=True, batch_size=16,
+                                         seed=1, workers=2)
+    assert samples > 16
+    assert len(pools) == 1
@@ -0,0 +1,90 @@
+import pickle
+
+import networkx as nx
+import pytest
+
+from csr_graph import as_csr
+from route_cache import VersionedGraph
+
+
+def _weighted_graph(graph_class):
+    G = graph_class()
+    G.add_edge("a", "b", weight=1)
+    G.add_edge("b", "c", weight=1)
+    G.add_edge("a", "c", weight=5)
+    return G
+
+
+def test_versioned_graph_compiled_once_per_version():
+    G = _weighted_graph(VersionedGraph)
+    csr = as_csr(G)
+    assert as_csr(G) is csr
+
+    G["a"]["b"]["weight"] = 100
+    edited = as_csr(G)
+    assert edited is not csr
+    assert dict(edited.edges(edited.node_id("a")))[edited.node_id("b")] == 100
+
+    nx.set_edge_attributes(G, {("b", "c"): 7}, "weight")
+    assert as_csr(G) is not edited
+
+    G.add_edge("c", "d")
+    assert "d" in as_csr(G)
+
+
+def test_cache_is_per_weight_attribute():
+    G = _weighted_graph(VersionedGraph)
+    G["a"]["c"]["time"] = 2
+    by_weight, by_time = as_csr(G), as_csr(G, weight="time")
+    assert by_weight is not by_time
+    assert as_csr(G, weight="time") is by_time
+
+
+def test_plain_graph_compiled_every_call():
+    G = _weighted_graph(nx.Graph)
+    csr = as_csr(G)
+    G["a"]["b"]["weight"] = 100
+    edited = as_csr(G)
+    assert edited is not csr
+    assert dict(edited.edges(edited.node_id("a")))[edited.node_id("b")] == 100
+
+
+def _random_graph(seed, directed=False):
+    G = nx.gnp_random_graph(25, 0.15, seed=seed, directed=directed)
+    for index, (u, v) in enumerate(G.edges()):
+        if index % 5:
+            G[u][v]["weight"] = 1 + (index * 3 + seed) % 8
+    return G
+
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_compiled_adjacency_matches_networkx(seed, directed):
+    G = _random_graph(seed, directed)
+    csr = as_csr(G)
+    assert len(csr) == G.number_of_nodes()
+    assert csr.nodes == sorted(G)
+
+    for node in G:
+        edges = [(csr.node_name(target), weight) for target, weight in csr.edges(csr.node_id(node))]
+        assert [target for target, _ in edges] == sorted(G.adj[node])
+        assert edges == [(target, G.adj[node][target].get("weight", 1)) for target in sorted(G.adj[node])]
+
+
+def test_mixed_node_types_keep_graph_order():
+    G = nx.Graph([(1, "a"), ("a", 2.5)])
+    csr = as_csr(G)
+    assert csr.nodes == list(G)
+    assert csr.node_name(csr.node_id("a")) == "a"
+
+
+def test_scratch_reused_and_not_pickled():
+    csr = as_csr(_random_graph(0))
+    scratch = csr.scratch()
+    assert csr.scratch() is not scratch
+    scratch.distances[0][3] = 5
+    scratch.touched[0].append(3)
+    scratch.release()
+    assert scratch.distances[0][3] == float("infinity")
+    assert csr.scratch() is scratch
+    assert pickle.loads(pickle.dumps(csr))._scratch is None
@@ -0,0 +1,56 @@
+import networkx as nx
+import pytest
+
+import distance_matrix as distance_matrix_module
+from distance_matrix import distance_matrix
+
+
+def _random_graph(seed, directed=False):
+    G = nx.gnp_random_graph(40, 0.08, seed=seed, directed=directed)
+    for index, (u, v) in enumerate(G.edges()):
+        G[u][v]["weight"] = 1 + (index * 7 + seed) % 9
+    return G
+
+
+@pytest.fixture(params=["dense", "per_source"])
+def strategy(request, monkeypatch):
+    # Малі графи рахуються щільно; поріг 0 змушує обходи з кожного джерела
+    if request.param == "per_source":
+        monkeypatch.setattr(distance_matrix_module, "_DENSE_LIMIT", 0)
+    distance_matrix_module._CACHE.clear()
+    return request.param
+
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("weight", [None, "weight"])
+@pytest.mark.parametrize("seed", range(3))
+def test_matches_networkx(strategy, seed, weight, directed):
+    G = _random_graph(seed, directed)
+    matrix = distance_matrix(G, weight=weight)
+    if weight is None:
+        expected = dict(nx.all_pairs_shortest_path_length(G))
+    else:
+        expected = dict(nx.all_pairs_dijkstra_path_length(G, weight=weight))
+
+    for i, u in enumerate(matrix.nodes):
+        for j, v in enumerate(matrix.nodes):
+            assert matrix.matrix[i, j] == expected[u].get(v, float("inf"))
+
+    assert matrix.closeness() == pytest.approx(nx.closeness_centrality(G, distance=weight))
+
+
+def test_derived_metrics_on_connected_graph(strategy):
+    G = nx.connected_watts_strogatz_graph(50, 4, 0.2, seed=1)
+    matrix = distance_matrix(G)
+    assert matrix.diameter() == nx.diameter(G)
+    assert matrix.radius() == nx.radius(G)
+    assert matrix.average_path_length() == pytest.approx(nx.average_shortest_path_length(G))
+
+
+def test_unweighted_matrix_survives_weight_edits():
+    distance_matrix_module._CACHE.clear()
+    G = nx.path_graph(5)
+    matrix = distance_matrix(G)
+    G[0][1]["weight"] = 7
+    assert distance_matrix(G) is matrix
+    assert distance_matrix(nx.relabel_nodes(G, str)) is not matrix
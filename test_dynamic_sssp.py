@@ -0,0 +1,52 @@
+import random
+
+import networkx as nx
+import pytest
+
+from dynamic_sssp import DynamicShortestPaths
+
+
+def _random_city(seed):
+    G = nx.connected_watts_strogatz_graph(40, 4, 0.3, seed=seed)
+    rng = random.Random(seed)
+    for u, v in G.edges():
+        G[u][v]["weight"] = rng.randint(1, 20)
+    return G
+
+
+def _assert_tree_consistent(G, tracker):
+    expected = nx.single_source_dijkstra_path_length(G, tracker.source)
+    for node in G:
+        assert tracker.distances[node] == expected[node]
+        parent = tracker.previous[node]
+        if node == tracker.source:
+            assert parent is None
+        else:
+            assert tracker.distances[parent] + G[parent][node]["weight"] == tracker.distances[node]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_batches_of_updates_match_full_recompute(seed):
+    G = _random_city(seed)
+    tracker = DynamicShortestPaths(G, 0)
+    rng = random.Random(seed)
+    edges = list(G.edges())
+
+    for _ in range(10):
+        before = dict(tracker.distances)
+        changes = [(u, v, rng.randint(1, 30)) for u, v in rng.sample(edges, 4)]
+        changed = tracker.update(changes)
+        _assert_tree_consistent(G, tracker)
+
+        for node, (old, new) in changed.items():
+            assert old == before[node] and new == tracker.distances[node]
+        for node in G:
+            if node not in changed:
+                assert tracker.distances[node] == before[node]
+
+
+def test_unchanged_weights_report_nothing():
+    G = _random_city(0)
+    tracker = DynamicShortestPaths(G, 0)
+    u, v = next(iter(G.edges()))
+    assert tracker.update([(u, v, G[u][v]["weight"])]) == {}
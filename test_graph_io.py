@@ -0,0 +1,73 @@
+import io
+import json
+
+import networkx as nx
+import pytest
+
+from csr_graph import as_csr
+from graph_io import load_edge_list, load_graph, load_snapshot, save_snapshot, write_edge_list
+from task3 import analyze_shortest_paths, create_weighted_city_graph, dijkstra_manual
+
+
+def _jsonl_report(csr, start):
+    distances, previous = dijkstra_manual(csr, start)
+    output = io.StringIO()
+    analyze_shortest_paths(csr, distances, previous, None, start, output=output,
+                           fmt="jsonl", verbose=False)
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def test_loaded_graph_routes_to_jsonl(tmp_path):
+    G, _ = create_weighted_city_graph()
+    path = str(tmp_path / "city.csv")
+    write_edge_list(G, path)
+
+    expected = _jsonl_report(G, "Центр")
+    assert _jsonl_report(load_edge_list(path), "Центр") == expected
+
+    # Перший виклик розбирає CSV, другий відкриває знімок через memmap
+    assert _jsonl_report(load_graph(path), "Центр") == expected
+    assert _jsonl_report(load_graph(path), "Центр") == expected
+
+
+@pytest.mark.parametrize("text, edges", [
+    ("source,target\na,b\nb,c\n", 4),
+    ("from,to\na,b\nb,c\n", 4),
+    ("u,v\na,b\n", 2),
+    ("id_a,id_b\n1,2\n2,3\n", 4),
+    ("a,b\nb,c\n", 4),
+    ("source,target,minutes\na,b,3\n", 2),
+    ("a,b,3\nb,c,4\n", 4),
+])
+def test_header_detection(tmp_path, text, edges):
+    path = tmp_path / "edges.csv"
+    path.write_text(text, encoding="utf-8")
+    csr = load_edge_list(str(path))
+    assert csr.number_of_edges() == edges
+    assert not {"source", "from", "u", "id_a"} & set(csr.nodes)
+
+
+def test_snapshot_round_trip_keeps_odd_names(tmp_path):
+    G = nx.Graph()
+    G.add_edge("перший\nрядок", "b", weight=2)
+    G.add_edge("b", "", weight=3)
+    csr = as_csr(G)
+    path = str(tmp_path / "graph.csr")
+    save_snapshot(csr, path)
+
+    for loaded in (load_snapshot(path), load_snapshot(path, in_memory=True)):
+        assert list(loaded.nodes) == csr.nodes
+        assert list(loaded.offsets) == list(csr.offsets)
+        assert list(loaded.targets) == list(csr.targets)
+        assert list(loaded.weights) == list(csr.weights)
+        assert loaded.node_id("перший\nрядок") == csr.node_id("перший\nрядок")
+
+
+def test_snapshot_reused_only_for_same_options(tmp_path):
+    path = tmp_path / "edges.csv"
+    path.write_text("source,target\na,b\nb,c\n", encoding="utf-8")
+    undirected = load_graph(str(path))
+    directed = load_graph(str(path), directed=True)
+    assert undirected.number_of_edges() == 4
+    assert directed.number_of_edges() == 2
+    assert load_graph(str(path), directed=True).number_of_edges() == 2
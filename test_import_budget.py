@@ -0,0 +1,11 @@
+import pytest
+
+from benchmark import CORE_MODULES, measure_import_time
+
+
+@pytest.mark.parametrize("module", CORE_MODULES)
+def test_core_import_stays_light(module):
+    """Імпорт ядра не тягне важких залежностей і нічого не друкує (час - у benchmark.py --import-budget)"""
+    _, heavy, output = measure_import_time((module,), repeat=1)
+    assert heavy == []
+    assert output == ""
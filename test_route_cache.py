@@ -0,0 +1,99 @@
+import copy
+import pickle
+
+import networkx as nx
+import pytest
+
+from route_cache import RouteCache, VersionedGraph
+
+
+def _triangle():
+    G = VersionedGraph()
+    G.add_edge("a", "b", weight=1, time=1)
+    G.add_edge("b", "c", weight=1, time=1)
+    G.add_edge("a", "c", weight=5, time=5)
+    return G
+
+
+def test_hits_and_matches_networkx():
+    G = VersionedGraph(nx.gnp_random_graph(30, 0.15, seed=3))
+    for index, (u, v) in enumerate(G.edges()):
+        G[u][v]["weight"] = 1 + index % 7
+    cache = RouteCache()
+
+    for target in G:
+        path, minutes = cache.route(G, 0, target)
+        if nx.has_path(G, 0, target):
+            assert minutes == nx.dijkstra_path_length(G, 0, target)
+            assert nx.path_weight(G, list(path), "weight") == minutes
+        else:
+            assert path is None
+    assert cache.route(G, 0, 5) == cache.route(G, 0, 5)
+    assert (cache.hits, cache.misses) == (2, len(G))
+
+
+@pytest.mark.parametrize("edit", [
+    lambda G: G["a"]["b"].__setitem__("time", 100),
+    lambda G: G["a"]["b"].update(time=100),
+    lambda G: G["a"]["b"].pop("time"),
+    lambda G: G["a"]["b"].setdefault("extra", 1),
+    lambda G: G.add_edge("c", "d"),
+    lambda G: nx.set_edge_attributes(G, {("a", "b"): 100}, "time"),
+])
+def test_every_edit_invalidates(edit):
+    G = _triangle()
+    cache = RouteCache()
+    cache.route(G, "a", "c", weight="time")
+    edit(G)
+    cache.route(G, "a", "c", weight="time")
+    assert cache.misses == 2
+
+
+def test_weight_edit_changes_route():
+    G = _triangle()
+    cache = RouteCache()
+    assert cache.route(G, "a", "c", weight="time") == (("a", "b", "c"), 2)
+    edge = G["a"]["b"]
+    edge |= {"time": 100}
+    assert cache.route(G, "a", "c", weight="time") == (("a", "c"), 5)
+
+
+def test_plain_graph_rejected():
+    G = nx.Graph(_triangle())
+    with pytest.raises(TypeError):
+        RouteCache().route(G, "a", "c")
+
+
+def test_cached_path_is_immutable():
+    G = _triangle()
+    cache = RouteCache()
+    path, _ = cache.route(G, "a", "c")
+    assert isinstance(path, tuple)
+    assert cache.route(G, "a", "c")[0] == ("a", "b", "c")
+
+
+def test_memory_budget_evicts_oldest():
+    G = VersionedGraph(nx.path_graph(200))
+    cache = RouteCache(max_bytes=4000)
+    for target in range(1, 200):
+        cache.route(G, 0, target)
+        assert cache.stats()["bytes"] <= 4000
+    assert 0 < cache.stats()["size"] < 199
+    cache.route(G, 0, 199)
+    assert cache.hits == 1
+    cache.route(G, 0, 1)
+    assert cache.misses == 200
+
+
+def test_versioned_graph_copies():
+    G = _triangle()
+    restored = pickle.loads(pickle.dumps(G))
+    copied = copy.deepcopy(G)
+    for other in (restored, copied):
+        version = other.version
+        other["a"]["b"]["weight"] = 9
+        assert other.version > version
+        assert G["a"]["b"]["weight"] == 1
+
+    directed = G.to_directed()
+    assert dict(directed["a"]["b"]) == {"weight": 1, "time": 1}
@@ -0,0 +1,137 @@
+from itertools import islice
+
+import networkx as nx
+import pytest
+
+from batch_routes import batch_routes
+from contraction import ContractionHierarchy
+from csr_graph import as_csr
+from facilities import nearest_facility
+from generators import generate_city, to_networkx
+from landmarks import LandmarkIndex, alt_route
+from search_stats import SearchStats
+from task2 import bfs_path, bfs_path_bidirectional, dfs_path_single, k_shortest_paths
+from task3 import dijkstra_manual, reconstruct_path, shortest_route
+
+
+def _large_city():
+    csr, _ = generate_city('grid', 40_000, seed=7)
+    return to_networkx(csr)
+
+
+def test_point_to_point_queries_stay_local_on_large_graph():
+    G = _large_city()
+    csr = as_csr(G)
+    start, goal = 20_000, 20_006
+
+    stats = SearchStats()
+    path, minutes = shortest_route(G, start, goal, stats=stats)
+    assert as_csr(G) is csr
+    assert minutes == nx.bidirectional_dijkstra(G, start, goal)[0]
+    assert path[0] == start and path[-1] == goal
+    assert stats.expansions < len(csr) // 100
+
+    stats = SearchStats()
+    path = bfs_path_bidirectional(G, start, goal, stats=stats)
+    assert len(path) - 1 == nx.shortest_path_length(G, start, goal)
+    assert stats.expansions < len(csr) // 100
+
+
+def _random_city(seed, nodes=30):
+    G = nx.gnp_random_graph(nodes, 0.12, seed=seed)
+    G.add_node(nodes)  # ізольований район - недосяжна ціль
+    for index, (u, v) in enumerate(G.edges()):
+        G[u][v]["weight"] = 1 + (index * 7 + seed) % 10
+    return G
+
+
+def _assert_valid_path(G, path, start, goal, weight="weight"):
+    assert path[0] == start and path[-1] == goal
+    assert len(set(path)) == len(path)
+    return nx.path_weight(G, path, weight)
+
+
+SEEDS = range(4)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_dijkstra_manual_matches_networkx(seed):
+    G = _random_city(seed)
+    distances, previous = dijkstra_manual(G, 0)
+    expected = nx.single_source_dijkstra_path_length(G, 0)
+    for node in G:
+        assert distances[node] == expected.get(node, float("infinity"))
+        if node in expected:
+            assert _assert_valid_path(G, reconstruct_path(previous, 0, node), 0, node) == expected[node]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_weighted_point_to_point_searches_match_networkx(seed):
+    G = _random_city(seed)
+    landmarks = LandmarkIndex.build(G, k=4)
+    hierarchy = ContractionHierarchy.build(G)
+    expected = nx.single_source_dijkstra_path_length(G, 0)
+
+    for goal in G:
+        for name, (path, minutes) in (("shortest_route", shortest_route(G, 0, goal)),
+                                      ("alt_route", alt_route(G, 0, goal, landmarks)),
+                                      ("ch_route", hierarchy.route(0, goal))):
+            if goal not in expected:
+                assert (path, minutes) == (None, float("infinity")), name
+            else:
+                assert minutes == expected[goal], name
+                assert _assert_valid_path(G, path, 0, goal) == minutes, name
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_hop_searches_match_networkx(seed):
+    G = _random_city(seed)
+    expected = nx.single_source_shortest_path_length(G, 0)
+    for goal in G:
+        for search in (bfs_path, bfs_path_bidirectional, dfs_path_single):
+            path = search(G, 0, goal)
+            if goal not in expected:
+                assert path is None
+                continue
+            _assert_valid_path(G, path, 0, goal)
+            if search is not dfs_path_single:
+                assert len(path) - 1 == expected[goal]
+
+
+@pytest.mark.parametrize("weight", [None, "weight"])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_k_shortest_paths_match_networkx(seed, weight):
+    G = _random_city(seed)
+    goal = max(nx.node_connected_component(G, 0))
+    paths = list(k_shortest_paths(G, 0, goal, k=6, weight=weight))
+    expected = list(islice(nx.shortest_simple_paths(G, 0, goal, weight=weight), 6))
+
+    measure = (lambda path: len(path) - 1) if weight is None else (lambda path: nx.path_weight(G, path, weight))
+    assert [measure(path) for path in paths] == [measure(path) for path in expected]
+    assert len({tuple(path) for path in paths}) == len(paths)
+    for path in paths:
+        _assert_valid_path(G, path, 0, goal)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_batch_routes_match_networkx(seed):
+    G = _random_city(seed)
+    pairs = [(source, target) for source in (0, 1, 2) for target in G]
+    lengths = {source: nx.single_source_dijkstra_path_length(G, source) for source in (0, 1, 2)}
+    for (source, target), (path, minutes) in zip(pairs, batch_routes(G, pairs, weight="weight")):
+        assert minutes == lengths[source].get(target, float("infinity"))
+        if path is not None:
+            assert _assert_valid_path(G, path, source, target) == minutes
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_nearest_facility_matches_networkx(seed):
+    G = _random_city(seed)
+    facilities = [0, 5, 9]
+    nearest, distances, previous = nearest_facility(G, facilities)
+    expected = nx.multi_source_dijkstra_path_length(G, facilities)
+    for node in G:
+        assert distances[node] == expected.get(node, float("infinity"))
+        if node in expected:
+            path = reconstruct_path(previous, nearest[node], node)
+            assert _assert_valid_path(G, path, nearest[node], node) == expected[node]
@@ -0,0 +1,32 @@
+import networkx as nx
+import pytest
+
+from task2 import count_simple_paths, dfs_paths
+
+
+def _random_graph(seed):
+    return nx.gnp_random_graph(12, 0.3, seed=seed)
+
+
+@pytest.mark.parametrize("cutoff", [0, 1, 2, 3, None])
+@pytest.mark.parametrize("seed", range(3))
+def test_dfs_paths_matches_networkx(seed, cutoff):
+    G = _random_graph(seed)
+    for goal in (1, 5, 11):
+        expected = {tuple(path) for path in nx.all_simple_paths(G, 0, goal, cutoff=cutoff)}
+        found = list(dfs_paths(G, 0, goal, cutoff=cutoff))
+        assert len(found) == len(set(found))
+        assert set(found) == expected
+
+
+def test_cutoff_zero_and_one_on_single_edge():
+    G = nx.path_graph(3)
+    assert list(dfs_paths(G, 0, 1, cutoff=0)) == []
+    assert list(dfs_paths(G, 0, 1, cutoff=1)) == [(0, 1)]
+    assert list(dfs_paths(G, 0, 2, cutoff=1)) == []
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_count_matches_networkx(seed):
+    G = _random_graph(seed)
+    assert count_simple_paths(G, 0, 7) == sum(1 for _ in nx.all_simple_paths(G, 0, 7))
@@ -0,0 +1,66 @@
+import numpy as np
+import networkx as nx
+import pytest
+
+from task3 import shortest_route
+from time_dependent import (BUCKET_MINUTES, DAY_MINUTES, TimeDependentGraph, earliest_arrival,
+                            profile_query, rush_hour_pattern)
+
+
+def _random_city(seed):
+    G = nx.connected_watts_strogatz_graph(30, 4, 0.3, seed=seed)
+    for index, (u, v) in enumerate(G.edges()):
+        G[u][v]["weight"] = 2 + (index * 5 + seed) % 12
+    return G
+
+
+def _rush_hour_graph(G):
+    patterns = np.stack([np.ones(DAY_MINUTES // BUCKET_MINUTES, dtype=np.float32), rush_hour_pattern()])
+    return TimeDependentGraph.from_edge_profiles(G, patterns, lambda u, v: (u + v) % 2)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_flat_profile_matches_static_dijkstra(seed):
+    G = _random_city(seed)
+    td_graph = TimeDependentGraph(G, np.ones(DAY_MINUTES // BUCKET_MINUTES))
+    for goal in (5, 17, 29):
+        path, arrival = earliest_arrival(td_graph, 0, goal, 600)
+        assert arrival - 600 == pytest.approx(shortest_route(G, 0, goal)[1])
+        assert nx.path_weight(G, path, "weight") == pytest.approx(arrival - 600)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_profile_is_fifo_and_matches_point_queries(seed):
+    G = _random_city(seed)
+    td_graph = _rush_hour_graph(G)
+    departures, arrivals = profile_query(td_graph, 0, 17)
+
+    # FIFO: виїхавши пізніше, не приїдеш раніше
+    assert np.all(np.diff(arrivals) >= -1e-6)
+    for departure, arrival in list(zip(departures, arrivals))[::24]:
+        path, expected = earliest_arrival(td_graph, 0, 17, departure)
+        assert arrival == pytest.approx(expected, rel=1e-5)
+
+        # Час прибуття вздовж знайденого шляху з вагами на момент проїзду
+        clock = departure
+        csr = td_graph.csr
+        for u, v in zip(path, path[1:]):
+            u_id, v_id = csr.node_id(u), csr.node_id(v)
+            edge = next(edge for edge in range(csr.offsets[u_id], csr.offsets[u_id + 1])
+                        if csr.targets[edge] == v_id)
+            clock += td_graph.travel_time(edge, clock)
+        assert clock == pytest.approx(expected)
+
+
+def test_rush_hour_slows_peak_departures():
+    td_graph = _rush_hour_graph(_random_city(0))
+    _, night = earliest_arrival(td_graph, 0, 17, 3 * 60)
+    _, peak = earliest_arrival(td_graph, 0, 17, 8 * 60)
+    assert peak - 8 * 60 > night - 3 * 60
+
+
+def test_non_fifo_profile_rejected():
+    pattern = np.ones(DAY_MINUTES // BUCKET_MINUTES, dtype=np.float32)
+    pattern[10] = 50
+    with pytest.raises(ValueError):
+        TimeDependentGraph(_random_city(0), pattern)
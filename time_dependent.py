@@ -0,0 +1,258 @@
+import heapq
+import math
+
+import numpy as np
+
+from csr_graph import as_csr
+from search_stats import instrumented
+from task3 import create_weighted_city_graph
+
+# Тривалість доби та крок профілю в хвилинах
+DAY_MINUTES = 1440
+BUCKET_MINUTES = 5
+
+
+def rush_hour_pattern(peak_factor=1.8, peaks=(8 * 60, 18 * 60), width=90, bucket=BUCKET_MINUTES):
+    """
+    Множник часу проїзду протягом доби з ранковою та вечірньою годиною пік
+
+    Args:
+        peak_factor: у скільки разів довше їхати в пік
+        peaks: хвилини доби, на які припадають піки
+        width: ширина піку в хвилинах
+        bucket: крок профілю в хвилинах
+
+    Returns:
+        np.ndarray довжини DAY_MINUTES / bucket з множниками ≥ 1
+    """
+    minutes = np.arange(0, DAY_MINUTES, bucket, dtype=np.float32)
+    pattern = np.ones_like(minutes)
+    for peak in peaks:
+        # Відстань до піку з урахуванням переходу через північ
+        distance = np.abs((minutes - peak + DAY_MINUTES / 2) % DAY_MINUTES - DAY_MINUTES / 2)
+        pattern += (peak_factor - 1) * np.exp(-(distance / width) ** 2)
+    return pattern
+
+
+class TimeDependentGraph:
+    """
+    Граф із часом проїзду, що залежить від моменту відправлення
+
+    Час проїзду ребра e о хвилині t: base[e] * pattern[profile_id[e]](t),
+    де pattern - кусково-лінійна функція з вузлами кожні bucket хвилин,
+    повторювана щодоби. Замість списку точок на кожне ребро зберігаються
+    лише спільна таблиця шаблонів (P × B, float32) і номер шаблону на
+    ребро (int32), тож профілі на добу з кроком 5 хв займають
+    кілька байтів на ребро навіть для великих мереж.
+
+    Для кожного шаблону перевіряється умова FIFO (виїхавши пізніше, не
+    приїдеш раніше): спад функції на кроці не перевищує довжину кроку.
+    """
+
+    def __init__(self, graph, patterns, profile_ids=None, bucket=BUCKET_MINUTES):
+        self.csr = as_csr(graph)
+        self.patterns = np.ascontiguousarray(np.atleast_2d(patterns), dtype=np.float32)
+        self.bucket = bucket
+
+        if profile_ids is None:
+            profile_ids = np.zeros(self.csr.number_of_edges(), dtype=np.int32)
+        self.profile_ids = np.asarray(profile_ids, dtype=np.int32)
+        self.base = np.asarray(self.csr.weights, dtype=np.float64)
+
+        # Найбільший спад множника за крок для кожного шаблону
+        drops = np.maximum(self.patterns - np.roll(self.patterns, -1, axis=1), 0).max(axis=1)
+        if np.any(self.base * drops[self.profile_ids] > bucket):
+            raise ValueError("Профілі часу проїзду порушують умову FIFO")
+
+    @classmethod
+    def from_edge_profiles(cls, graph, patterns, edge_profile, bucket=BUCKET_MINUTES):
+        """
+        Будує граф, призначаючи шаблон кожному ребру
+
+        Args:
+            graph: NetworkX граф з вагами (вага - час проїзду без заторів)
+            patterns: масив шаблонів множників (P × B)
+            edge_profile: функція (u, v) -> номер шаблону
+            bucket: крок профілю в хвилинах
+        """
+        csr = as_csr(graph)
+        profile_ids = np.zeros(csr.number_of_edges(), dtype=np.int32)
+        for u in range(len(csr)):
+            for edge in range(csr.offsets[u], csr.offsets[u + 1]):
+                profile_ids[edge] = edge_profile(csr.node_name(u), csr.node_name(csr.targets[edge]))
+        return cls(csr, patterns, profile_ids, bucket)
+
+    def travel_time(self, edge, departure):
+        """Час проїзду ребра (індекс у CSR) при відправленні о хвилині departure"""
+        pattern = self.patterns[self.profile_ids[edge]]
+        position = (departure % DAY_MINUTES) / self.bucket
+        index = int(position)
+        fraction = position - index
+        factor = pattern[index] * (1 - fraction) + pattern[(index + 1) % len(pattern)] * fraction
+        return self.base[edge] * float(factor)
+
+    def travel_times(self, edge, departures):
+        """Векторизований час проїзду ребра для масиву моментів відправлення"""
+        pattern = self.patterns[self.profile_ids[edge]]
+        position = (departures % DAY_MINUTES) / self.bucket
+        index = np.floor(position).astype(np.int64)
+        fraction = position - index
+        factor = pattern[index % len(pattern)] * (1 - fraction) + pattern[(index + 1) % len(pattern)] * fraction
+        return self.base[edge] * factor
+
+
+@instrumented("earliest_arrival")
+def earliest_arrival(td_graph, start, goal, departure, *, stats=None):
+    """
+    Залежний від часу алгоритм Дейкстри: найраніше прибуття
+
+    Завдяки FIFO достатньо одного прибуття на вершину, як у звичайному
+    Дейкстрі, лише вага ребра береться на момент прибуття до його початку.
+
+    Args:
+        td_graph: TimeDependentGraph
+        start: початкова вершина
+        goal: цільова вершина
+        departure: хвилина доби відправлення
+        stats: SearchStats для лічильників пошуку (None - без них)
+
+    Returns:
+        (path, arrival): шлях та хвилина прибуття, або (None, infinity)
+    """
+    csr = td_graph.csr
+    offsets, targets = csr.offsets, csr.targets
+    infinity = float('infinity')
+    start_id, goal_id = csr.node_id(start), csr.node_id(goal)
+
+    scratch = csr.scratch()
+    arrivals, previous = scratch.distances[0], scratch.previous[0]
+    settled, touched = scratch.settled[0], scratch.touched[0]
+    arrivals[start_id] = departure
+    touched.append(start_id)
+    heap = [(departure, start_id)]
+    if stats is not None:
+        stats.lap("prepare")
+        stats.pushed(1)
+
+    try:
+        while heap:
+            arrival, current = heapq.heappop(heap)
+            if stats is not None:
+                stats.pops += 1
+            if settled[current]:
+                continue
+            settled[current] = 1
+            if stats is not None:
+                stats.expanded(offsets[current + 1] - offsets[current])
+
+            if current == goal_id:
+                if stats is not None:
+                    stats.lap("search")
+                path = []
+                while current != -1:
+                    path.append(current)
+                    current = previous[current]
+                return [csr.node_name(node_id) for node_id in reversed(path)], arrival
+
+            for edge in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[edge]
+                new_arrival = arrival + td_graph.travel_time(edge, arrival)
+                old_arrival = arrivals[neighbor]
+                if new_arrival < old_arrival:
+                    if old_arrival == infinity:
+                        touched.append(neighbor)
+                    arrivals[neighbor] = new_arrival
+                    previous[neighbor] = current
+                    heapq.heappush(heap, (new_arrival, neighbor))
+                    if stats is not None:
+                        stats.relaxed(len(heap))
+    finally:
+        scratch.release()
+
+    if stats is not None:
+        stats.lap("search")
+    return None, infinity
+
+
+def profile_query(td_graph, start, goal, departures=None, corridor=None):
+    """
+    Профільний запит: час прибуття для всіх моментів відправлення одразу
+
+    Кожна вершина має вектор прибуттів (по одному на момент
+    відправлення), ребра релаксуються векторно через numpy, а вершини
+    повертаються в чергу, доки їхній вектор покращується. Обмеження
+    пошуку коридором (набором районів) робить запит дешевим.
+
+    Args:
+        td_graph: TimeDependentGraph
+        start: початкова вершина
+        goal: цільова вершина
+        departures: масив хвилин відправлення (за замовчуванням - кожен крок доби)
+        corridor: необов'язковий набір вершин, якими дозволено їхати
+
+    Returns:
+        (departures, arrivals): масиви моментів відправлення та найранішого прибуття
+    """
+    csr = td_graph.csr
+    offsets, targets = csr.offsets, csr.targets
+    if departures is None:
+        departures = np.arange(0, DAY_MINUTES, td_graph.bucket, dtype=np.float64)
+    departures = np.asarray(departures, dtype=np.float64)
+
+    allowed = None
+    if corridor is not None:
+        allowed = {csr.node_id(node) for node in corridor} | {csr.node_id(start), csr.node_id(goal)}
+
+    start_id, goal_id = csr.node_id(start), csr.node_id(goal)
+    labels = {start_id: departures.copy()}
+    queue = [(0.0, start_id)]
+    queued = {start_id}
+
+    while queue:
+        _, current = heapq.heappop(queue)
+        queued.discard(current)
+        label = labels[current]
+
+        for edge in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[edge]
+            if allowed is not None and neighbor not in allowed:
+                continue
+
+            candidate = label + td_graph.travel_times(edge, label)
+            existing = labels.get(neighbor)
+            if existing is not None and np.all(candidate >= existing):
+                continue
+
+            labels[neighbor] = candidate if existing is None else np.minimum(existing, candidate)
+            if neighbor not in queued:
+                queued.add(neighbor)
+                # Пріоритет - найраніше прибуття серед усіх відправлень
+                heapq.heappush(queue, (float(labels[neighbor].min() - departures.min()), neighbor))
+
+    arrivals = labels.get(goal_id, np.full_like(departures, math.inf))
+    return departures, arrivals
+
+
+def _format_minute(minute):
+    minute = int(round(minute)) % DAY_MINUTES
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+if __name__ == "__main__":
+    G, weighted_routes = create_weighted_city_graph()
+
+    # Шаблон 0 - без заторів, шаблон 1 - години пік для маршрутів через Центр
+    patterns = np.stack([np.ones(DAY_MINUTES // BUCKET_MINUTES, dtype=np.float32), rush_hour_pattern()])
+    td_graph = TimeDependentGraph.from_edge_profiles(
+        G, patterns, lambda u, v: 1 if "Центр" in (u, v) else 0)
+
+    print("\n🕗 МАРШРУТ ПАРК → АЕРОПОРТ У РІЗНИЙ ЧАС:")
+    for departure in (6 * 60, 8 * 60, 12 * 60, 18 * 60):
+        path, arrival = earliest_arrival(td_graph, "Парк", "Аеропорт", departure)
+        print(f"  Виїзд {_format_minute(departure)}: {' → '.join(path)} "
+              f"(прибуття {_format_minute(arrival)}, {arrival - departure:.0f} хв)")
+
+    departures, arrivals = profile_query(td_graph, "Парк", "Аеропорт")
+    durations = arrivals - departures
+    print(f"\n📈 Профіль за добу: від {durations.min():.0f} до {durations.max():.0f} хв, "
+          f"найгірший виїзд о {_format_minute(departures[durations.argmax()])}")